@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+from typing import Literal
+
+import anyio
+from app.api.v1.schemas.admin import QuantileReport, QuantileSeries
+from app.auth.dependencies import require_roles
+from app.core.config import get_settings
+from app.core.profiler import ProfilerGate, sample_threads
+from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _quantile_name(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+@router.get("/metrics/quantiles", response_model=QuantileReport)
+def metric_quantiles(
+    request: Request,
+    metric: str = "http_request_duration_ms",
+    _admin: User = Depends(require_roles("admin")),
+) -> QuantileReport:
+    """
+    Latency quantiles per series from the telemetry sketches (admin only).
+
+    Merged across workers when `METRICS_MULTIPROC_DIR` is set.
+    """
+
+    telemetry = request.app.state.telemetry  # type: ignore[attr-defined]
+    sketches = getattr(telemetry, "sketches", None)
+    if not callable(sketches):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="quantiles require TELEMETRY_MODE=prometheus",
+        )
+
+    settings = get_settings()
+    series: list[QuantileSeries] = []
+    accuracy = settings.METRICS_SKETCH_RELATIVE_ACCURACY
+    for name, labels, sketch in sketches():
+        if name != metric:
+            continue
+        accuracy = sketch.relative_accuracy
+        quantiles: dict[str, float | None] = {}
+        for q in settings.METRICS_QUANTILES:
+            value = sketch.quantile(q)
+            quantiles[_quantile_name(q)] = None if value is None else round(value, 3)
+        series.append(
+            QuantileSeries(
+                metric=name,
+                labels=dict(labels),
+                count=sketch.count,
+                quantiles=quantiles,
+            )
+        )
+    return QuantileReport(relative_accuracy=accuracy, series=series)
+
+
+@router.get("/profile")
+async def profile(
+    request: Request,
+    seconds: float = Query(5.0, gt=0),
+    hz: float | None = Query(None, gt=0),
+    format: Literal["collapsed", "speedscope"] = "collapsed",  # noqa: A002
+    _admin: User = Depends(require_roles("admin")),
+) -> Response:
+    """
+    Sample every thread of this worker for `seconds` at `hz` (admin only).
+
+    Returns collapsed stacks (text) or a speedscope JSON profile. One session
+    at a time per worker, then `PROFILER_COOLDOWN_SECONDS` before the next.
+    """
+
+    gate: ProfilerGate | None = getattr(request.app.state, "profiler_gate", None)  # type: ignore[attr-defined]
+    if gate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="profiler is disabled (PROFILER_ENABLED=false)",
+        )
+
+    settings = get_settings()
+    duration = min(seconds, settings.PROFILER_MAX_SECONDS)
+    frequency = min(hz or settings.PROFILER_DEFAULT_HZ, settings.PROFILER_MAX_HZ)
+
+    wait = gate.try_acquire()
+    if wait is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="profiler is busy or cooling down",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+    try:
+        # Sampling sleeps between ticks; keep it off the event loop.
+        result = await anyio.to_thread.run_sync(sample_threads, duration, frequency)
+    finally:
+        gate.release()
+
+    if format == "speedscope":
+        return JSONResponse(
+            result.speedscope(
+                name=f"{settings.APP_NAME} ({duration:g}s @ {frequency:g}Hz)"
+            ),
+            headers={
+                "Content-Disposition": 'attachment; filename="profile.speedscope.json"'
+            },
+        )
+    return PlainTextResponse(result.collapsed())
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-import json
 import uuid
+import zlib
+from typing import Any
 
-from app.api.v1.schemas.users import UserCreateRequest, UserPublic
-from app.auth.dependencies import get_current_user
+from app.api.v1.schemas.users import (
+    UserBatchGetRequest,
+    UserBatchGetResponse,
+    UserCreateRequest,
+    UserPublic,
+)
+from app.auth.dependencies import get_current_user, get_token_payload
 from app.core.cache.dependency import get_cache
 from app.core.cache.interface import Cache
 from app.core.config import get_settings
+from app.core.http_cache import PRIVATE_REVALIDATE, etag_matches, not_modified
+from app.core.responses import ModelResponse, RawJSONResponse
 from app.core.security import hash_password
 from app.db import get_db
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -27,6 +35,100 @@ def _to_user_public(user: User) -> UserPublic:
     )
 
 
+# Bump when the `UserPublic` representation changes so old ETags stop matching.
+_USER_ETAG_VERSION = "u1"
+
+
+def user_etag(user: User) -> str:
+    """
+    Strong ETag from id + `updated_at` (every column update bumps it).
+
+    A checksum of the public fields is appended because `updated_at` only has
+    second resolution on some backends (SQLite); no serialization involved.
+    """
+
+    updated = user.updated_at.timestamp() if user.updated_at else 0.0
+    fields = f"{user.email}|{user.is_active:d}|{bool(user.is_superuser):d}"
+    return (
+        f'"{_USER_ETAG_VERSION}-{user.id.hex}-{int(updated * 1_000_000):x}'
+        f'-{zlib.crc32(fields.encode("utf-8")):08x}"'
+    )
+
+
+def _cache_key(user_id: uuid.UUID) -> str:
+    return f"users:{user_id}"
+
+
+# Cached user data is short-lived: it also bounds how long the cache-only 304
+# path keeps answering for a deactivated account.
+_CACHE_MAX_TTL_SECONDS = 60
+
+
+def _cache_ttl() -> int:
+    return min(int(get_settings().CACHE_DEFAULT_TTL_SECONDS), _CACHE_MAX_TTL_SECONDS)
+
+
+def _cache_entry(etag: str, body: bytes) -> str:
+    return f"{etag}\n{body.decode('utf-8')}"
+
+
+def _parse_cached(raw: bytes | None) -> tuple[str, bytes] | None:
+    if not raw or not raw.startswith(b'"'):
+        # Missing or not written by this module: fall back to the DB.
+        return None
+    etag, sep, body = raw.partition(b"\n")
+    if not sep or not body.startswith(b"{"):
+        return None
+    return etag.decode("utf-8"), body
+
+
+def _cached_user(cache: Cache, user_id: uuid.UUID) -> tuple[str, bytes] | None:
+    """
+    Cached `(etag, body)`; entries are stored as `<etag>\n<json>`.
+    """
+
+    return _parse_cached(cache.get_bytes(_cache_key(user_id)))
+
+
+def _user_response(
+    user: User, *, request: Request, cache: Cache, cache_enabled: bool
+) -> Response:
+    etag = user_etag(user)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)  # no serialization
+
+    response = ModelResponse(
+        _to_user_public(user),
+        headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE},
+    )
+    if cache_enabled:
+        cache.set(
+            _cache_key(user.id),
+            _cache_entry(etag, response.body),
+            ttl_seconds=_cache_ttl(),
+        )
+    return response
+
+
+def _own_user_not_modified(
+    request: Request, payload: dict[str, Any], cache: Cache, user_id: uuid.UUID
+) -> Response | None:
+    """
+    304 straight from the cache (no DB) for a client revalidating its own user.
+
+    Authorization here is the token alone; staleness (e.g. a just-deactivated
+    account) is bounded by the cache TTL (`_CACHE_MAX_TTL_SECONDS`).
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or payload.get("sub") != str(user_id):
+        return None
+    cached = _cached_user(cache, user_id)
+    if cached is not None and etag_matches(if_none_match, cached[0]):
+        return not_modified(cached[0])
+    return None
+
+
 @router.post("", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
 def create_user(
     payload: UserCreateRequest,
@@ -51,43 +153,125 @@ def create_user(
     return _to_user_public(user)
 
 
+@router.post(":batchGet", response_model=UserBatchGetResponse)
+def batch_get_users(
+    payload: UserBatchGetRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+) -> Response:
+    """
+    Resolve many users in one request: one cache MGET, one `IN` query for the
+    misses. Same permission rule as `GET /users/{id}`, applied to every id.
+    """
+
+    settings = get_settings()
+    # Count before deduping: repeated ids still cost parsing and hashing.
+    if len(payload.ids) > settings.USERS_BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"at most {settings.USERS_BATCH_GET_MAX_IDS} ids per request",
+        )
+    ids = list(dict.fromkeys(payload.ids))  # dedupe, keep request order
+    if not getattr(current_user, "is_superuser", False) and any(
+        user_id != current_user.id for user_id in ids
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    bodies: dict[uuid.UUID, bytes] = {}
+    if settings.CACHE_ENABLED:
+        raw = cache.get_many_bytes([_cache_key(user_id) for user_id in ids])
+        for user_id, value in zip(ids, raw):
+            cached = _parse_cached(value)
+            if cached is not None:
+                bodies[user_id] = cached[1]
+
+    misses = [user_id for user_id in ids if user_id not in bodies]
+    if misses:
+        serializer = UserPublic.__pydantic_serializer__
+        fresh: dict[str, str] = {}
+        for user in UserRepository(db).get_by_ids(misses):
+            body = serializer.to_json(_to_user_public(user))
+            bodies[user.id] = body
+            fresh[_cache_key(user.id)] = _cache_entry(user_etag(user), body)
+        if settings.CACHE_ENABLED and fresh:
+            cache.set_many(fresh, ttl_seconds=_cache_ttl())
+
+    # Assemble the envelope from per-user JSON bytes (cached ones verbatim).
+    not_found = [f'"{user_id}"' for user_id in ids if user_id not in bodies]
+    users = b",".join(bodies[user_id] for user_id in ids if user_id in bodies)
+    return RawJSONResponse(
+        b'{"users":['
+        + users
+        + b'],"not_found":['
+        + ",".join(not_found).encode("ascii")
+        + b"]}"
+    )
+
+
 @router.get("/me", response_model=UserPublic)
-def me(current_user: User = Depends(get_current_user)) -> UserPublic:
-    return _to_user_public(current_user)
+def me(
+    request: Request,
+    payload: dict[str, Any] = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+) -> Response:
+    cache_enabled = get_settings().CACHE_ENABLED
+    if cache_enabled and request.headers.get("if-none-match"):
+        try:
+            own_id = uuid.UUID(str(payload.get("sub")))
+        except ValueError:
+            own_id = None
+        if own_id is not None:
+            fast = _own_user_not_modified(request, payload, cache, own_id)
+            if fast is not None:
+                return fast
+
+    current_user = get_current_user(payload, db)
+    return _user_response(
+        current_user, request=request, cache=cache, cache_enabled=cache_enabled
+    )
 
 
 @router.get("/{user_id}", response_model=UserPublic)
 def get_user(
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    payload: dict[str, Any] = Depends(get_token_payload),
     db: Session = Depends(get_db),
     cache: Cache = Depends(get_cache),
-) -> UserPublic:
+) -> Response:
+    cache_enabled = get_settings().CACHE_ENABLED
+    if cache_enabled:
+        fast = _own_user_not_modified(request, payload, cache, user_id)
+        if fast is not None:
+            return fast
+
+    current_user = get_current_user(payload, db)
     if current_user.id != user_id and not getattr(current_user, "is_superuser", False):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
 
-    settings = get_settings()
-    cache_key = f"users:{user_id}"
-    cached = cache.get(cache_key) if settings.CACHE_ENABLED else None
-    if cached:
-        try:
-            data = json.loads(cached)
-            return UserPublic(**data)
-        except Exception:
-            # Fail open (cache corruption/unexpected value); fall back to DB.
-            pass
+    if cache_enabled:
+        cached = _cached_user(cache, user_id)
+        if cached is not None:
+            etag, body = cached
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag)
+            # Pass the stored bytes through without parsing/re-serializing.
+            return RawJSONResponse(
+                body, headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE}
+            )
 
     repo = UserRepository(db)
     user = repo.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not found")
-    public = _to_user_public(user)
-
-    if settings.CACHE_ENABLED:
-        ttl = min(int(settings.CACHE_DEFAULT_TTL_SECONDS), 60)
-        cache.set(cache_key, public.model_dump_json(), ttl_seconds=ttl)
-
-    return public
+    return _user_response(
+        user, request=request, cache=cache, cache_enabled=cache_enabled
+    )
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class QuantileSeries(BaseModel):
+    metric: str
+    labels: dict[str, str]
+    count: int
+    # e.g. {"p50": 12.3, "p99": 80.1}; values within the sketch's relative accuracy.
+    quantiles: dict[str, float | None]
+
+
+class QuantileReport(BaseModel):
+    relative_accuracy: float
+    series: list[QuantileSeries]
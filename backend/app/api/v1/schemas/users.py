@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UserCreateRequest(BaseModel):
@@ -17,3 +17,16 @@ class UserPublic(BaseModel):
     email: str
     is_active: bool
     is_superuser: bool = False
+
+
+class UserBatchGetRequest(BaseModel):
+    # Upper bound is `USERS_BATCH_GET_MAX_IDS`, duplicates included (checked in
+    # the route).
+    ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class UserBatchGetResponse(BaseModel):
+    # Found users in request order (duplicates collapsed); unknown ids go to
+    # `not_found`.
+    users: list[UserPublic]
+    not_found: list[uuid.UUID]
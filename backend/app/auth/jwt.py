@@ -5,6 +5,7 @@ from typing import Any
 
 import jwt
 from app.core.config import get_settings
+from app.core.logging import timed
 
 _DEFAULT_LEEWAY_SECONDS = 30
 
@@ -68,15 +69,16 @@ def decode_token(token: str) -> dict[str, Any]:
         "verify_aud": bool(settings.JWT_AUDIENCE),
     }
 
-    payload = jwt.decode(
-        token,
-        settings.JWT_SECRET_KEY,
-        algorithms=[settings.JWT_ALGORITHM],
-        issuer=settings.JWT_ISSUER or None,
-        audience=settings.JWT_AUDIENCE or None,
-        options=options,
-        leeway=_DEFAULT_LEEWAY_SECONDS,
-    )
+    with timed("jwt"):
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            issuer=settings.JWT_ISSUER or None,
+            audience=settings.JWT_AUDIENCE or None,
+            options=options,
+            leeway=_DEFAULT_LEEWAY_SECONDS,
+        )
 
     sub = payload.get("sub")
     if not sub or not isinstance(sub, str):
@@ -1,24 +1,36 @@
 from __future__ import annotations
 
-from passlib.context import CryptContext
-from passlib.exc import UnknownHashError
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def _pwd_context() -> CryptContext:
+    # Built on first use: passlib (and `crypt`) stay out of app import time,
+    # and only processes that hash or verify passwords load them.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(plain: str) -> str:
     if plain is None:
         raise ValueError("plain password must not be None")
-    return _pwd_context.hash(plain)
+    return _pwd_context().hash(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
     if plain is None or hashed is None:
         return False
+    from passlib.exc import UnknownHashError
+
     # passlib handles constant-time verification and algorithm upgrades.
     # If the stored hash is from an unknown/legacy scheme, treat it as invalid
     # (don't crash the request path).
     try:
-        return _pwd_context.verify(plain, hashed)
+        return _pwd_context().verify(plain, hashed)
     except (UnknownHashError, ValueError, TypeError):
         return False
@@ -7,6 +7,7 @@ from app.core.cache.interface import Cache
 from app.core.cache.noop import NoopCache
 from app.core.cache.redis_cache import RedisCache
 from app.core.config import Settings
+from app.core.health.breaker import get_breaker
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ def build_cache(settings: Settings) -> Cache:
         return RedisCache(
             settings.REDIS_URL,
             prefix=settings.CACHE_PREFIX or "cache:",
+            breaker=get_breaker("redis"),
         )
 
     if settings.ENV == "test":
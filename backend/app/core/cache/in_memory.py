@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Mapping, Sequence
 
 from app.core.cache.interface import Cache
 
@@ -29,11 +30,24 @@ class InMemoryCache(Cache):
             return None
         return value
 
+    def get_bytes(self, key: str) -> bytes | None:
+        value = self.get(key)
+        return None if value is None else value.encode("utf-8")
+
+    def get_many_bytes(self, keys: Sequence[str]) -> list[bytes | None]:
+        return [self.get_bytes(key) for key in keys]
+
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
         expires_at = None
         if ttl_seconds is not None:
             expires_at = time.time() + int(ttl_seconds)
         self._data[self._k(key)] = (value, expires_at)
 
+    def set_many(
+        self, items: Mapping[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl_seconds=ttl_seconds)
+
     def delete(self, key: str) -> None:
         self._data.pop(self._k(key), None)
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from typing import Protocol
 
 
 class Cache(Protocol):
     def get(self, key: str) -> str | None: ...
 
+    def get_bytes(self, key: str) -> bytes | None:
+        """
+        Raw stored value (UTF-8), for callers that pass it through unchanged
+        (e.g. pre-serialized JSON responses).
+        """
+        ...
+
+    def get_many_bytes(self, keys: Sequence[str]) -> list[bytes | None]:
+        """
+        `get_bytes` for several keys in one round trip, in `keys` order.
+        """
+        ...
+
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None: ...
 
+    def set_many(
+        self, items: Mapping[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        """
+        `set` for several keys in one round trip.
+        """
+        ...
+
     def delete(self, key: str) -> None: ...
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
 from app.core.cache.interface import Cache
 
 
@@ -7,8 +9,19 @@ class NoopCache(Cache):
     def get(self, key: str) -> str | None:
         return None
 
+    def get_bytes(self, key: str) -> bytes | None:
+        return None
+
+    def get_many_bytes(self, keys: Sequence[str]) -> list[bytes | None]:
+        return [None] * len(keys)
+
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
         return None
 
+    def set_many(
+        self, items: Mapping[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        return None
+
     def delete(self, key: str) -> None:
         return None
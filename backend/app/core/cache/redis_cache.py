@@ -1,54 +1,134 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping, Sequence
 
-import redis
 from app.core.cache.interface import Cache
+from app.core.health.breaker import CircuitBreaker
+from app.core.logging import timed
+from app.core.redis_pool import get_redis_client
 
 log = logging.getLogger("app.cache")
 
 
 class RedisCache(Cache):
+    """
+    Redis-backed cache that fails open.
+
+    When a `breaker` is given, calls are skipped instantly while Redis is known
+    to be unhealthy instead of each one waiting out `socket_timeout`.
+    """
+
     def __init__(
         self,
         redis_url: str,
         *,
         prefix: str = "cache:",
         socket_timeout: float = 1.0,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
         self._prefix = prefix
-        self._client = redis.Redis.from_url(
-            redis_url,
-            socket_connect_timeout=socket_timeout,
-            socket_timeout=socket_timeout,
-        )
+        self._client = get_redis_client(redis_url, socket_timeout=socket_timeout)
+        self._breaker = breaker
 
     def _k(self, key: str) -> str:
         return f"{self._prefix}{key}"
 
-    def get(self, key: str) -> str | None:
+    def _allow(self) -> bool:
+        return self._breaker is None or self._breaker.allow()
+
+    def _ok(self) -> None:
+        if self._breaker is not None:
+            self._breaker.record_success()
+
+    def _failed(self) -> None:
+        if self._breaker is not None:
+            self._breaker.record_failure()
+
+    def get_bytes(self, key: str) -> bytes | None:
+        if not self._allow():
+            return None
         try:
-            val = self._client.get(self._k(key))
+            with timed("cache"):
+                val = self._client.get(self._k(key))
         except Exception:
+            self._failed()
             log.exception("cache get failed (fail-open)")
             return None
+        self._ok()
         if val is None:
             return None
         if isinstance(val, bytes):
-            return val.decode("utf-8", errors="replace")
-        return str(val)
+            return val
+        return str(val).encode("utf-8")
+
+    def get_many_bytes(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        if not self._allow():
+            return [None] * len(keys)
+        try:
+            with timed("cache"):
+                values = self._client.mget([self._k(key) for key in keys])
+        except Exception:
+            self._failed()
+            log.exception("cache mget failed (fail-open)")
+            return [None] * len(keys)
+        self._ok()
+        return [
+            v if v is None or isinstance(v, bytes) else str(v).encode("utf-8")
+            for v in values
+        ]
+
+    def get(self, key: str) -> str | None:
+        val = self.get_bytes(key)
+        if val is None:
+            return None
+        return val.decode("utf-8", errors="replace")
 
     def set(self, key: str, value: str, ttl_seconds: int | None = None) -> None:
+        if not self._allow():
+            return None
         try:
-            if ttl_seconds is None:
-                self._client.set(self._k(key), value)
-            else:
-                self._client.setex(self._k(key), int(ttl_seconds), value)
+            with timed("cache"):
+                if ttl_seconds is None:
+                    self._client.set(self._k(key), value)
+                else:
+                    self._client.setex(self._k(key), int(ttl_seconds), value)
         except Exception:
+            self._failed()
             log.exception("cache set failed (fail-open)")
+            return None
+        self._ok()
+
+    def set_many(
+        self, items: Mapping[str, str], ttl_seconds: int | None = None
+    ) -> None:
+        if not items or not self._allow():
+            return None
+        try:
+            with timed("cache"):
+                pipe = self._client.pipeline(transaction=False)
+                for key, value in items.items():
+                    if ttl_seconds is None:
+                        pipe.set(self._k(key), value)
+                    else:
+                        pipe.setex(self._k(key), int(ttl_seconds), value)
+                pipe.execute()
+        except Exception:
+            self._failed()
+            log.exception("cache set_many failed (fail-open)")
+            return None
+        self._ok()
 
     def delete(self, key: str) -> None:
+        if not self._allow():
+            return None
         try:
-            self._client.delete(self._k(key))
+            with timed("cache"):
+                self._client.delete(self._k(key))
         except Exception:
+            self._failed()
             log.exception("cache delete failed (fail-open)")
+            return None
+        self._ok()
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import Settings
+from app.core.logging import record_timing
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Already-compressed or binary payloads aren't worth the CPU.
+_COMPRESSIBLE_PREFIXES = ("text/", "application/json", "application/javascript")
+_COMPRESSIBLE_SUFFIXES = ("+json", "+xml", "/xml")
+_NO_BODY_STATUS = {204, 304}
+# Bodies above this aren't kept in the compressed-body LRU.
+_CACHE_MAX_BODY_BYTES = 1024 * 1024
+
+
+class _Stream:
+    __slots__ = ("_process", "_flush", "_finish")
+
+    def __init__(
+        self,
+        process: Callable[[bytes], bytes],
+        flush: Callable[[], bytes],
+        finish: Callable[[], bytes],
+    ) -> None:
+        self._process = process
+        self._flush = flush
+        self._finish = finish
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flush per chunk so the client sees data as soon as it's produced.
+        return self._process(data) + self._flush()
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class Codec:
+    """
+    One content-coding: whole-body `compress` plus a streaming variant.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        stream: Callable[[], _Stream],
+    ) -> None:
+        self.name = name
+        self.compress = compress
+        self.stream = stream
+
+
+def _gzip(level: int) -> Codec:
+    def compress(data: bytes) -> bytes:
+        c = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return c.compress(data) + c.flush()
+
+    def stream() -> _Stream:
+        c = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return _Stream(c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush)
+
+    return Codec("gzip", compress, stream)
+
+
+def _optional_module(name: str) -> Any:
+    # brotli/zstandard (`pip install .[perf]`) are imported when the middleware
+    # is built, not with this module: apps without compression never load them.
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def _brotli(brotli: Any, quality: int) -> Codec:
+    def compress(data: bytes) -> bytes:
+        return brotli.compress(data, quality=quality)
+
+    def stream() -> _Stream:
+        c = brotli.Compressor(quality=quality)
+        return _Stream(c.process, c.flush, c.finish)
+
+    return Codec("br", compress, stream)
+
+
+def _zstd(zstandard: Any, level: int) -> Codec:
+    compressor = zstandard.ZstdCompressor(level=level)
+
+    def stream() -> _Stream:
+        c = zstandard.ZstdCompressor(level=level).compressobj()
+        return _Stream(
+            c.compress,
+            lambda: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            c.flush,
+        )
+
+    return Codec("zstd", compressor.compress, stream)
+
+
+def build_codecs(settings: Settings) -> dict[str, Codec]:
+    """
+    Available codecs from `COMPRESSION_ALGORITHMS`, in server preference order.
+
+    Codings whose library isn't installed are skipped silently.
+    """
+
+    codecs: dict[str, Codec] = {}
+    for name in settings.COMPRESSION_ALGORITHMS:
+        name = name.strip().lower()
+        if name == "gzip":
+            codecs[name] = _gzip(int(settings.COMPRESSION_GZIP_LEVEL))
+        elif name == "br" and (brotli := _optional_module("brotli")) is not None:
+            codecs[name] = _brotli(brotli, int(settings.COMPRESSION_BROTLI_QUALITY))
+        elif name == "zstd" and (zstd := _optional_module("zstandard")) is not None:
+            codecs[name] = _zstd(zstd, int(settings.COMPRESSION_ZSTD_LEVEL))
+    return codecs
+
+
+def negotiate(accept_encoding: str | None, available: list[str]) -> str | None:
+    """
+    Pick a content-coding from `Accept-Encoding` (RFC 9110 §12.5.3).
+
+    Highest q-value wins; ties go to the server's order in `available`.
+    Returns None when identity is the best (or only) option.
+    """
+
+    if not accept_encoding or not available:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in available:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_PREFIXES) or media_type.endswith(
+        _COMPRESSIBLE_SUFFIXES
+    )
+
+
+class CompressedBodyCache:
+    """
+    Small LRU of compressed bodies keyed by `(resource, strong ETag, coding)`.
+
+    The resource (method, path and query) is part of the key because ETags
+    are only unique per resource: two routes may both emit `"1"`. Repeated
+    hits on an unchanged resource (e.g. cached user reads) skip
+    re-compression.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max = max(0, int(max_entries))
+        self._data: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resource: str, etag: str, coding: str) -> bytes | None:
+        key = (resource, etag, coding)
+        with self._lock:
+            body = self._data.get(key)
+            if body is not None:
+                self._data.move_to_end(key)
+            return body
+
+    def put(self, resource: str, etag: str, coding: str, body: bytes) -> None:
+        if self._max == 0 or len(body) > _CACHE_MAX_BODY_BYTES:
+            return
+        key = (resource, etag, coding)
+        with self._lock:
+            self._data[key] = body
+            self._data.move_to_end(key)
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower() and vary.strip() != "*":
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # The compressed bytes differ from the identity ones, so a strong tag
+    # would be wrong; If-None-Match uses weak comparison and still matches.
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI response compression (gzip; brotli/zstd when installed).
+
+    - Negotiated per request from `Accept-Encoding`.
+    - Bodies with a `Content-Length` below `COMPRESSION_MIN_SIZE` pass through.
+    - Responses without `Content-Length` are streams; they pass through
+      unless `COMPRESSION_STREAMING=true` (then flushed chunk by chunk).
+    - Responses with a strong `ETag` reuse compressed bytes from an LRU.
+    """
+
+    def __init__(self, app: ASGIApp, *, settings: Settings) -> None:
+        self.app = app
+        self.codecs = build_codecs(settings)
+        self._order = list(self.codecs)
+        self.min_size = max(0, int(settings.COMPRESSION_MIN_SIZE))
+        self.streaming = bool(settings.COMPRESSION_STREAMING)
+        self.body_cache = CompressedBodyCache(settings.COMPRESSION_CACHE_ENTRIES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"), self._order)
+        responder = _Responder(self, coding, send, resource=_resource(scope))
+        await self.app(scope, receive, responder.send)
+
+
+def _resource(scope: Scope) -> str:
+    query = scope.get("query_string", b"")
+    path = scope.get("path", "")
+    if query:
+        path = f"{path}?{query.decode('latin-1')}"
+    return f"{scope.get('method', 'GET')} {path}"
+
+
+class _Responder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        coding: str | None,
+        send: Send,
+        *,
+        resource: str,
+    ) -> None:
+        self.mw = middleware
+        self.resource = resource
+        self.codec = middleware.codecs.get(coding) if coding else None
+        self._send = send
+        self.start: Message | None = None
+        self.mode = "passthrough"  # passthrough|buffer|stream
+        self.chunks: list[bytes] = []
+        self.stream: Any = None
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self._on_start(message)
+            if self.mode != "buffer":
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self.mode == "passthrough":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode == "buffer":
+            # BaseHTTPMiddleware layers re-chunk even plain responses.
+            self.chunks.append(body)
+            if not more_body:
+                await self._send_buffered(b"".join(self.chunks))
+            return
+
+        started = time.perf_counter()
+        out = self.stream.chunk(body) if body else b""
+        if not more_body:
+            out += self.stream.finish()
+        record_timing("compress", (time.perf_counter() - started) * 1000.0)
+        await self._send(
+            {"type": "http.response.body", "body": out, "more_body": more_body}
+        )
+
+    def _on_start(self, message: Message) -> None:
+        self.start = message
+        headers = MutableHeaders(scope=message)
+        if (
+            message["status"] in _NO_BODY_STATUS
+            or "content-encoding" in headers
+            or not is_compressible(headers.get("content-type"))
+        ):
+            return
+        length = headers.get("content-length")
+        if length is not None:
+            try:
+                if int(length) < self.mw.min_size:
+                    return
+            except ValueError:
+                return  # malformed upstream header: pass the response through
+            _add_vary(headers)
+            if self.codec is not None:
+                self.mode = "buffer"
+            return
+        if not self.mw.streaming:
+            return
+        _add_vary(headers)
+        if self.codec is not None:
+            self.mode = "stream"
+            self.stream = self.codec.stream()
+            headers["Content-Encoding"] = self.codec.name
+            _weaken_etag(headers)
+
+    async def _send_buffered(self, body: bytes) -> None:
+        assert self.start is not None and self.codec is not None
+        headers = MutableHeaders(scope=self.start)
+        etag = headers.get("etag")
+        cacheable = etag is not None and not etag.startswith("W/")
+
+        cache = self.mw.body_cache
+        compressed = (
+            cache.get(self.resource, etag, self.codec.name) if cacheable else None
+        )
+        if compressed is None:
+            started = time.perf_counter()
+            compressed = self.codec.compress(body)
+            record_timing("compress", (time.perf_counter() - started) * 1000.0)
+            if cacheable:
+                cache.put(self.resource, etag, self.codec.name, compressed)
+
+        headers["Content-Encoding"] = self.codec.name
+        headers["Content-Length"] = str(len(compressed))
+        _weaken_etag(headers)
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
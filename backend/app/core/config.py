@@ -62,6 +62,114 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_JSON: bool = True
     REQUEST_ID_HEADER: str = "X-Request-ID"
+    # JSON logs: `extra=...` fields to emit (whitelist), and constant fields
+    # added to every line (e.g. {"service": "backend"}).
+    LOG_EXTRA_FIELDS: list[str] = [
+        "path",
+        "method",
+        "status_code",
+        "duration_ms",
+        # Telemetry (`LoggingTelemetry`)
+        "metric",
+        "value",
+        "tags",
+        # Dependency health
+        "dependency",
+        "check",
+        # Log sampling
+        "suppressed",
+        # Per-request phase timings (span name -> ms)
+        "timings",
+        # SQL query stats
+        "db_queries",
+        "db_time_ms",
+        "slowest_statement",
+    ]
+    LOG_STATIC_FIELDS: dict[str, str] = {}
+
+    # Log sampling for hot paths (off by default). Errors, 5xx and requests
+    # slower than LOG_SLOW_REQUEST_MS always pass.
+    LOG_SAMPLING_ENABLED: bool = False
+    LOG_SAMPLE_RATES: dict[str, float] = {}  # logger prefix -> rate
+    LOG_SAMPLE_RATES_BY_STATUS: dict[str, float] = {}  # "401" / "4xx" -> rate
+    LOG_SLOW_REQUEST_MS: float = 1000.0
+    # Duplicate suppression: token bucket per identical record (0 disables).
+    LOG_DEDUP_BURST: int = 0
+    LOG_DEDUP_RATE_PER_SECOND: float = 1.0
+
+    # Async logging: format/write on a background thread via a bounded queue.
+    LOG_ASYNC: bool = False
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_FULL_POLICY: str = "drop"  # drop|block
+    LOG_BATCH_SIZE: int = 256
+
+    # Per-request phase timings are always logged (`timings`); this also sends
+    # them to clients as a `Server-Timing` header (exposes internals; opt in).
+    SERVER_TIMING_ENABLED: bool = False
+
+    # SQL query stats per request (opt in): telemetry histograms + a budget.
+    # DB_QUERY_BUDGET=0 disables the budget; mode "raise" is meant for tests.
+    DB_QUERY_STATS_ENABLED: bool = False
+    DB_QUERY_BUDGET: int = 0
+    DB_QUERY_BUDGET_MODE: str = "warn"  # warn|raise
+
+    # In-process sampling profiler (`GET /api/v1/admin/profile`, admin only).
+    # One session at a time, then a cooldown; nothing runs between sessions.
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: float = 30.0
+    PROFILER_DEFAULT_HZ: float = 100.0
+    PROFILER_MAX_HZ: float = 1000.0
+    PROFILER_COOLDOWN_SECONDS: float = 60.0
+
+    # Tracing: W3C traceparent + spans exported in batches (off by default).
+    # Head sampling at TRACING_SAMPLE_RATE; tail sampling also keeps 5xx and
+    # requests slower than TRACING_TAIL_LATENCY_MS.
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "ndjson"  # ndjson
+    TRACING_NDJSON_PATH: str = "traces.ndjson"
+    TRACING_SAMPLE_RATE: float = 0.1
+    TRACING_TAIL_SAMPLING: bool = True
+    TRACING_TAIL_LATENCY_MS: float = 500.0
+    # Let an incoming traceparent's sampled flag decide head sampling. Only
+    # behind a trusted edge: otherwise clients choose what gets exported.
+    TRACING_TRUST_PARENT_SAMPLED: bool = False
+    TRACING_QUEUE_SIZE: int = 2048
+    TRACING_BATCH_SIZE: int = 256
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 2.0
+
+    # Default response renderer: auto (orjson when installed, else stdlib
+    # json) | orjson | json.
+    RESPONSE_JSON_RENDERER: str = "auto"
+
+    # Response compression (pure ASGI; off by default, e.g. when a proxy does it).
+    # gzip always; br/zstd when brotli/zstandard are installed (`.[perf]`).
+    # Streams (no Content-Length) are only compressed with COMPRESSION_STREAMING.
+    COMPRESSION_ENABLED: bool = False
+    COMPRESSION_ALGORITHMS: list[str] = ["zstd", "br", "gzip"]  # preference order
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_STREAMING: bool = False
+    # Compressed bodies kept per worker, keyed by (strong ETag, coding); 0 = off.
+    COMPRESSION_CACHE_ENTRIES: int = 256
+
+    # Process model (`gunicorn -c python:app.core.gunicorn_conf app.main:app`).
+    # SERVER_WORKERS=0 derives the count from the container's CPU quota.
+    SERVER_WORKERS: int = 0
+    SERVER_WORKERS_PER_CPU: float = 1.0
+    SERVER_MAX_WORKERS: int = 16
+    # Recycle a worker after N requests (+ up to JITTER, so workers don't all
+    # restart together) to bound memory growth; 0 = never.
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    # Import the app once in the master and fork workers from it.
+    SERVER_PRELOAD: bool = False
+    SERVER_LOOP: str = "auto"  # auto|uvloop|asyncio
+    SERVER_HTTP: str = "auto"  # auto|httptools|h11
+    SERVER_TIMEOUT_SECONDS: int = 30
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_KEEPALIVE_SECONDS: int = 5
 
     # Keep these empty by default so local unit tests don't attempt to connect.
     # Docker Compose sets them explicitly.
@@ -70,6 +178,22 @@ class Settings(BaseSettings):
 
     CORS_ALLOW_ORIGINS: list[str] = []
 
+    # Readiness probe: per-check timeout and how long a result is reused.
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0
+    READINESS_CACHE_TTL_SECONDS: float = 2.0
+
+    # Dependency health: background pings + circuit breakers for DB/Redis.
+    HEALTH_MONITOR_ENABLED: bool = True
+    HEALTH_MONITOR_INTERVAL_SECONDS: float = 5.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 5.0
+
+    # Startup: how long to wait for DB/Redis, and how many pooled connections
+    # to open up front so the first requests don't pay connect costs.
+    STARTUP_WAIT_TIMEOUT_SECONDS: float = 10.0
+    STARTUP_WARM_DB_CONNECTIONS: int = 2
+    STARTUP_WARM_REDIS_CONNECTIONS: int = 2
+
     # --- Production hardening (optional; off by default) ---
     RATE_LIMIT_ENABLED: bool = False
     RATE_LIMIT_REQUESTS: int = 60
@@ -81,8 +205,37 @@ class Settings(BaseSettings):
     CACHE_DEFAULT_TTL_SECONDS: int = 300
     CACHE_PREFIX: str = "cache:"
 
-    TELEMETRY_MODE: str = "noop"  # noop|log
+    # `POST /api/v1/users:batchGet`: max ids per request.
+    USERS_BATCH_GET_MAX_IDS: int = 100
+
+    TELEMETRY_MODE: str = "noop"  # noop|log|prometheus
     TELEMETRY_SAMPLE_RATE: float = 1.0
+    # prometheus mode: histograms also keep a DDSketch per series; quantiles
+    # are reported by `GET /api/v1/admin/metrics/quantiles`.
+    METRICS_SKETCH_RELATIVE_ACCURACY: float = 0.01
+    METRICS_QUANTILES: list[float] = [0.5, 0.9, 0.95, 0.99]
+    # prometheus mode: with several workers, point this at a shared (tmpfs)
+    # directory so `/metrics` merges every worker's mmap file.
+    METRICS_MULTIPROC_DIR: str = ""
+    # prometheus mode: label sets kept per metric registry (per worker); new
+    # ones beyond it are counted under {overflow="true"}.
+    METRICS_MAX_SERIES: int = 10000
+    # prometheus mode: histogram bucket upper bounds (ms); exposed on `/metrics`.
+    METRICS_HISTOGRAM_BUCKETS: list[float] = [
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        25.0,
+        50.0,
+        100.0,
+        250.0,
+        500.0,
+        1000.0,
+        2500.0,
+        5000.0,
+        10000.0,
+    ]
 
     # --- Auth / JWT ---
     # Default is OK for local dev; must be overridden outside local/test.
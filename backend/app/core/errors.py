@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Callable
+from functools import lru_cache
+from json.encoder import encode_basestring
 from typing import Any
 
 from app.core.logging import get_request_id as _get_request_id
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from pydantic import BaseModel
 
+# `ErrorResponse`/`ErrorBody` document the envelope (see `docs/ERROR_MODEL.md`);
+# responses are rendered by `render_error_body`, which emits the same JSON
+# (same key order, same encoding as `JSONResponse`) without model work.
+
 
 class ErrorBody(BaseModel):
     code: str
@@ -26,6 +34,63 @@ def get_request_id() -> str | None:
     return _get_request_id()
 
 
+@lru_cache(maxsize=512)
+def _error_prefix(code: str, message: str) -> bytes:
+    return (
+        '{"error":{"code":'
+        + encode_basestring(code)
+        + ',"message":'
+        + encode_basestring(message)
+        + ',"request_id":'
+    ).encode("utf-8")
+
+
+def _encode(value: Any) -> str:
+    # Same settings `JSONResponse.render` uses.
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    )
+
+
+def render_error_body(
+    *,
+    code: str,
+    message: str,
+    request_id: str | None,
+    details: Any | None = None,
+) -> bytes:
+    """
+    Serialize the error envelope straight to bytes.
+
+    Key order is fixed (`code`, `message`, `request_id`, `details`); the
+    `{code, message}` prefix is cached, so the common case (no details) only
+    encodes the request id.
+    """
+
+    rid = "null" if request_id is None else encode_basestring(request_id)
+    tail = (
+        ',"details":null}}'
+        if details is None
+        else ',"details":' + _encode(details) + "}}"
+    )
+    return _error_prefix(code, message) + (rid + tail).encode("utf-8")
+
+
+def error_body_renderer(code: str, message: str) -> Callable[[str | None], bytes]:
+    """
+    Precompute an envelope without details; the returned function only fills
+    in the request id. For hot error paths (e.g. 429 under a flood).
+    """
+
+    prefix = _error_prefix(code, message)
+
+    def _render(request_id: str | None) -> bytes:
+        rid = "null" if request_id is None else encode_basestring(request_id)
+        return prefix + rid.encode("utf-8") + b',"details":null}}'
+
+    return _render
+
+
 def error_response(
     *,
     code: str,
@@ -34,19 +99,14 @@ def error_response(
     status_code: int,
     details: Any | None = None,
     headers: dict[str, str] | None = None,
-) -> JSONResponse:
-    payload = ErrorResponse(
-        error=ErrorBody(
-            code=code,
-            message=message,
-            request_id=request_id,
-            details=details,
-        )
-    )
-    return JSONResponse(
+) -> Response:
+    return Response(
+        content=render_error_body(
+            code=code, message=message, request_id=request_id, details=details
+        ),
         status_code=status_code,
-        content=payload.model_dump(),
         headers=headers,
+        media_type="application/json",
     )
 
 
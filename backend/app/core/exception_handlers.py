@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import Any
 
 from app.core.errors import code_for_http_status, error_response, get_request_id
+from app.core.health.breaker import CircuitOpenError
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.requests import Request
@@ -129,6 +131,23 @@ async def integrity_error_handler(request: Request, exc: Exception):
     )
 
 
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    # Dependency known to be down: answer fast and tell clients when to retry.
+    request_id = get_request_id()
+    log.warning(
+        "dependency unavailable",
+        extra={"path": request.url.path, "method": request.method, "status_code": 503},
+    )
+    return error_response(
+        code="service_unavailable",
+        message="Service temporarily unavailable",
+        request_id=request_id,
+        status_code=503,
+        details=None,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
 def register_exception_handlers(app: ASGIApp) -> None:
     """
     Register global exception handlers to standardize error responses.
@@ -141,5 +160,7 @@ def register_exception_handlers(app: ASGIApp) -> None:
     # DB integrity errors -> 409 conflict when SQLAlchemy is in use.
     if IntegrityError is not None:  # pragma: no cover
         app.add_exception_handler(IntegrityError, integrity_error_handler)  # type: ignore[arg-type,attr-defined]
+    # Open circuit breaker -> 503 service_unavailable.
+    app.add_exception_handler(CircuitOpenError, circuit_open_handler)  # type: ignore[arg-type,attr-defined]
     # Catch-all.
     app.add_exception_handler(Exception, unhandled_exception_handler)  # type: ignore[attr-defined]
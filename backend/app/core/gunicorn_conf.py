@@ -0,0 +1,106 @@
+"""
+Gunicorn config: `gunicorn -c python:app.core.gunicorn_conf app.main:app`.
+
+Values come from `Settings` (`SERVER_*`); command-line flags still win.
+Process-wide state that does not survive `fork()` (log listener and span
+exporter threads, DB pools, breaker locks, metrics files) is re-created in
+each worker by `os.register_at_fork` hooks in the owning modules, so
+`SERVER_PRELOAD=true` is safe. Redis pools reset themselves on first use in a
+new process.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.server import gunicorn_options
+from gunicorn.arbiter import Arbiter
+from uvicorn import Config, Server
+
+# Deprecated upstream in favour of the `uvicorn-worker` package, which has the
+# same internals; the supported uvicorn range is pinned in the `server` extra.
+from uvicorn.workers import UvicornWorker as _BaseUvicornWorker
+
+_settings = get_settings()
+_options = gunicorn_options(_settings)
+
+bind = _options["bind"]
+workers = _options["workers"]
+worker_class = _options["worker_class"]
+max_requests = _options["max_requests"]
+max_requests_jitter = _options["max_requests_jitter"]
+preload_app = _options["preload_app"]
+timeout = _options["timeout"]
+graceful_timeout = _options["graceful_timeout"]
+keepalive = _options["keepalive"]
+worker_tmp_dir = _options["worker_tmp_dir"]
+
+
+class _RecyclingServer(Server):
+    """
+    Exits (gracefully) once `max_requests` requests have *started*.
+
+    uvicorn's own `limit_max_requests` counts a request only when its final
+    body message is sent, which never happens when the client hangs up first
+    (e.g. after a Content-Length body followed by an empty closing chunk), so
+    workers could outlive their limit indefinitely.
+    """
+
+    def __init__(self, config: Config, *, max_requests: int) -> None:
+        super().__init__(config)
+        self._max_requests = max_requests
+        self._started = 0
+
+    def counting(self, app: Callable[..., Any]) -> Callable[..., Any]:
+        async def counted(scope, receive, send) -> None:
+            if scope["type"] == "http":
+                self._started += 1
+            await app(scope, receive, send)
+
+        return counted
+
+    async def on_tick(self, counter: int) -> bool:
+        if self._started >= self._max_requests and not self.should_exit:
+            logging.getLogger("uvicorn.error").info(
+                "Maximum request limit of %d reached; recycling worker.",
+                self._max_requests,
+            )
+            return True
+        return await super().on_tick(counter)
+
+
+class UvicornWorker(_BaseUvicornWorker):
+    # auto = uvloop/httptools when installed (`uvicorn[standard]`).
+    CONFIG_KWARGS = {"loop": _settings.SERVER_LOOP, "http": _settings.SERVER_HTTP}
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.config.limit_max_requests = None  # enforced by _RecyclingServer
+
+    async def _serve(self) -> None:
+        # Upstream's `_serve` (uvicorn 0.30), with the request-counting
+        # server; `test_worker_overrides_match_upstream` guards upgrades.
+        server = _RecyclingServer(self.config, max_requests=self.max_requests)
+        self.config.app = server.counting(self.wsgi)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+def when_ready(server) -> None:
+    # The master's own logger: app logging is only configured where the app
+    # is imported (here too with preload, otherwise in each worker).
+    server.log.info(
+        "workers=%s preload=%s max_requests=%s(+%s) loop=%s http=%s",
+        workers,
+        preload_app,
+        max_requests,
+        max_requests_jitter,
+        _settings.SERVER_LOOP,
+        _settings.SERVER_HTTP,
+    )
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from app.core.config import Settings
+from app.core.health.breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+    reset_breakers,
+)
+from app.core.health.monitor import DependencyMonitor
+from app.core.health.readiness import (
+    Check,
+    ReadinessChecker,
+    ReadinessResult,
+    check_db,
+    make_redis_check,
+)
+from app.core.health.startup import (
+    prepare_dependencies,
+    wait_for_dependencies,
+    warm_db_pool,
+    warm_redis_pool,
+)
+
+
+def _not_configured() -> bool:
+    return False
+
+
+def _not_required() -> bool:
+    return True
+
+
+def build_readiness_checks(settings: Settings) -> dict[str, Check]:
+    return {
+        "db": check_db if settings.DATABASE_URL else _not_configured,
+        # Redis is part of the template, but allow readiness to pass if it's
+        # not configured.
+        "redis": (
+            make_redis_check(settings.REDIS_URL)
+            if settings.REDIS_URL
+            else _not_required
+        ),
+    }
+
+
+def build_startup_checks(settings: Settings) -> dict[str, Check]:
+    """
+    Checks for configured dependencies only (nothing to wait for otherwise).
+    """
+
+    checks: dict[str, Check] = {}
+    if settings.DATABASE_URL:
+        checks["db"] = check_db
+    if settings.REDIS_URL:
+        checks["redis"] = make_redis_check(settings.REDIS_URL)
+    return checks
+
+
+def build_readiness_checker(settings: Settings) -> ReadinessChecker:
+    # Only configured dependencies have a breaker worth feeding.
+    breakers = {
+        name: get_breaker(name)
+        for name, url in (("db", settings.DATABASE_URL), ("redis", settings.REDIS_URL))
+        if url
+    }
+    return ReadinessChecker(
+        build_readiness_checks(settings),
+        timeout_seconds=settings.READINESS_CHECK_TIMEOUT_SECONDS,
+        cache_ttl_seconds=settings.READINESS_CACHE_TTL_SECONDS,
+        breakers=breakers,
+    )
+
+
+def build_health_monitor(
+    settings: Settings, checker: ReadinessChecker
+) -> DependencyMonitor | None:
+    if not settings.HEALTH_MONITOR_ENABLED:
+        return None
+    return DependencyMonitor(
+        checker, interval_seconds=settings.HEALTH_MONITOR_INTERVAL_SECONDS
+    )
+
+
+__all__ = [
+    "Check",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DependencyMonitor",
+    "ReadinessChecker",
+    "ReadinessResult",
+    "build_health_monitor",
+    "build_readiness_checker",
+    "build_readiness_checks",
+    "build_startup_checks",
+    "check_db",
+    "get_breaker",
+    "make_redis_check",
+    "prepare_dependencies",
+    "reset_breakers",
+    "wait_for_dependencies",
+    "warm_db_pool",
+    "warm_redis_pool",
+]
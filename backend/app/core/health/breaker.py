@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+log = logging.getLogger("app.health")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a call is short-circuited because its dependency is unhealthy.
+    """
+
+    def __init__(self, name: str, retry_after: float = 0.0) -> None:
+        super().__init__(f"circuit open: {name}")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by every caller of one dependency.
+
+    - closed: calls pass; `failure_threshold` consecutive failures open it
+    - open: calls are rejected instantly until `reset_timeout_seconds` elapse
+    - half_open: a single trial call is let through; success closes the
+      circuit, failure re-opens it
+
+    The closed-state fast path of `allow()` / `record_success()` takes no lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._threshold = max(1, int(failure_threshold))
+        self._reset_timeout = float(reset_timeout_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == OPEN
+                and self._clock() - self._opened_at >= self._reset_timeout
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        if self._state == CLOSED:
+            return True
+
+        with self._lock:
+            now = self._clock()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if now - self._opened_at < self._reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+                self._trial_started = None
+
+            # Half-open: one trial at a time. A trial that never reports back
+            # is considered lost after another reset timeout.
+            if (
+                self._trial_started is not None
+                and now - self._trial_started < self._reset_timeout
+            ):
+                return False
+            self._trial_started = now
+            return True
+
+    def check(self) -> None:
+        """
+        Like `allow()`, but raise `CircuitOpenError` when the call is rejected.
+        """
+
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and self._failures == 0:
+            return
+
+        with self._lock:
+            if self._state != CLOSED:
+                log.info("circuit closed", extra={"dependency": self.name})
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self._threshold:
+                if self._state != OPEN:
+                    log.warning("circuit opened", extra={"dependency": self.name})
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._trial_started = None
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Process-wide breaker for a dependency (`"db"`, `"redis"`, ...).
+
+    Every component talking to the same dependency shares one breaker, so a
+    failure seen by the cache also protects the rate limiter and vice versa.
+    """
+
+    breaker = _registry.get(name)
+    if breaker is not None:
+        return breaker
+
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    with _registry_lock:
+        breaker = _registry.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout_seconds=settings.CIRCUIT_BREAKER_RESET_SECONDS,
+            )
+            _registry[name] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    """
+    Drop all breakers (tests).
+    """
+
+    with _registry_lock:
+        _registry.clear()
+
+
+def _reset_breakers_after_fork() -> None:
+    # Components keep the breaker they were built with, so a forked worker
+    # resets them in place (fresh locks, closed) instead of dropping them.
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for breaker in _registry.values():
+        breaker._lock = threading.Lock()
+        breaker._state = CLOSED
+        breaker._failures = 0
+        breaker._trial_started = None
+
+
+os.register_at_fork(after_in_child=_reset_breakers_after_fork)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from app.core.health.readiness import ReadinessChecker, ReadinessResult
+
+log = logging.getLogger("app.health")
+
+
+class DependencyMonitor:
+    """
+    Background task that refreshes dependency health every `interval_seconds`.
+
+    Each round goes through the shared `ReadinessChecker`, which updates the
+    circuit breakers; `/api/v1/health/ready` reads `latest()` instead of
+    probing on its own while the monitor is running.
+    """
+
+    def __init__(
+        self, checker: ReadinessChecker, *, interval_seconds: float = 5.0
+    ) -> None:
+        self._checker = checker
+        self._interval = max(0.1, float(interval_seconds))
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def latest(self) -> ReadinessResult | None:
+        """
+        Most recent result, or None if the monitor isn't keeping it fresh.
+        """
+
+        if not self.running:
+            return None
+        result = self._checker.latest
+        if result is None:
+            return None
+        # Tolerate one missed round before falling back to an inline probe.
+        if time.monotonic() - result.checked_at > 2 * self._interval:
+            return None
+        return result
+
+    async def _round(self) -> None:
+        try:
+            await self._checker.refresh()
+        except Exception:
+            log.exception("health monitor round failed")
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self._round()
+
+    async def start(self) -> None:
+        """
+        Run a first round (so state is primed before serving), then schedule
+        the background loop.
+        """
+
+        if self.running:
+            return
+        await self._round()
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
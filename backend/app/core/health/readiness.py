@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from app.core.health.breaker import CircuitBreaker
+from app.core.redis_pool import get_redis_client
+from sqlalchemy import text
+
+log = logging.getLogger("app.health")
+
+Check = Callable[[], bool]
+
+
+def check_db() -> bool:
+    """
+    Run `SELECT 1` on a connection borrowed from the app's engine pool.
+    """
+
+    from app.db.session import get_engine
+
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return True
+
+
+def make_redis_check(redis_url: str) -> Check:
+    """
+    Build a check that pings Redis through the shared client pool.
+    """
+
+    def _check_redis() -> bool:
+        return bool(get_redis_client(redis_url).ping())
+
+    return _check_redis
+
+
+@dataclass(frozen=True)
+class ReadinessResult:
+    checks: dict[str, bool]
+    checked_at: float
+
+    @property
+    def ok(self) -> bool:
+        return all(self.checks.values())
+
+
+class ReadinessChecker:
+    """
+    Runs dependency checks concurrently with a per-check timeout.
+
+    Results are memoized for `cache_ttl_seconds` so a burst of probes costs a
+    single round of checks; concurrent callers wait on the in-flight round
+    instead of starting their own.
+
+    Every round also feeds the dependency's circuit breaker (when given), so
+    probes and the background monitor share state with the request path.
+    """
+
+    def __init__(
+        self,
+        checks: Mapping[str, Check],
+        *,
+        timeout_seconds: float = 2.0,
+        cache_ttl_seconds: float = 2.0,
+        breakers: Mapping[str, CircuitBreaker] | None = None,
+    ) -> None:
+        self._checks = dict(checks)
+        self._breakers = dict(breakers or {})
+        self._timeout = float(timeout_seconds)
+        self._ttl = float(cache_ttl_seconds)
+        self._lock = asyncio.Lock()
+        self._last: ReadinessResult | None = None
+
+    @property
+    def latest(self) -> ReadinessResult | None:
+        return self._last
+
+    def _fresh(self, max_age: float) -> ReadinessResult | None:
+        last = self._last
+        if last is not None and time.monotonic() - last.checked_at < max_age:
+            return last
+        return None
+
+    async def _run(self, name: str, check: Check) -> bool:
+        try:
+            return bool(await asyncio.wait_for(asyncio.to_thread(check), self._timeout))
+        except asyncio.TimeoutError:
+            log.warning("readiness check timed out", extra={"check": name})
+            return False
+        except Exception:
+            log.warning("readiness check failed", extra={"check": name})
+            return False
+
+    async def check(self) -> ReadinessResult:
+        """
+        Return the memoized result, or run a round of checks if it is stale.
+        """
+
+        cached = self._fresh(self._ttl)
+        if cached is not None:
+            return cached
+        return await self.refresh(max_age=self._ttl)
+
+    async def refresh(self, *, max_age: float = 0.0) -> ReadinessResult:
+        """
+        Run a round of checks (unless another caller just finished one).
+        """
+
+        async with self._lock:
+            cached = self._fresh(max_age)
+            if cached is not None:
+                return cached
+
+            names = list(self._checks)
+            outcomes = await asyncio.gather(
+                *(self._run(name, self._checks[name]) for name in names)
+            )
+            for name, ok in zip(names, outcomes):
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    continue
+                if ok:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+
+            result = ReadinessResult(
+                checks=dict(zip(names, outcomes)), checked_at=time.monotonic()
+            )
+            self._last = result
+            return result
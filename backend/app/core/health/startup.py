@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+
+from app.core.config import Settings
+from app.core.health.readiness import Check
+from app.core.rate_limit.interface import RateLimiter
+from app.core.redis_pool import get_redis_client
+from sqlalchemy import text
+
+log = logging.getLogger("app.startup")
+
+
+async def _attempt(check: Check, timeout_seconds: float) -> bool:
+    try:
+        return bool(await asyncio.wait_for(asyncio.to_thread(check), timeout_seconds))
+    except Exception:
+        return False
+
+
+async def wait_for_dependencies(
+    checks: Mapping[str, Check],
+    *,
+    timeout_seconds: float = 10.0,
+    attempt_timeout_seconds: float = 2.0,
+    initial_backoff_seconds: float = 0.1,
+    max_backoff_seconds: float = 2.0,
+) -> dict[str, bool]:
+    """
+    Wait (concurrently, with exponential backoff) until each check passes.
+
+    Best effort: gives up after `timeout_seconds` and reports which
+    dependencies never came up, but never raises, so a slow dependency can't
+    crash-loop the process. Checks run in worker threads; the event loop is
+    never blocked.
+    """
+
+    deadline = time.monotonic() + max(0.0, float(timeout_seconds))
+
+    async def _wait_one(name: str, check: Check) -> bool:
+        delay = max(0.01, float(initial_backoff_seconds))
+        while True:
+            if await _attempt(check, attempt_timeout_seconds):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.warning(
+                    "dependency not ready at startup", extra={"dependency": name}
+                )
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, float(max_backoff_seconds))
+
+    names = list(checks)
+    outcomes = await asyncio.gather(*(_wait_one(n, checks[n]) for n in names))
+    return dict(zip(names, outcomes))
+
+
+def warm_db_pool(connections: int) -> int:
+    """
+    Open `connections` pooled DB connections, then return them to the pool.
+    """
+
+    from app.db.session import get_engine
+
+    engine = get_engine()
+    opened = []
+    try:
+        for _ in range(max(0, int(connections))):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+def warm_redis_pool(redis_url: str, connections: int) -> int:
+    """
+    Establish `connections` sockets in the shared Redis pool.
+    """
+
+    pool = get_redis_client(redis_url).connection_pool
+    opened = []
+    try:
+        for _ in range(max(0, int(connections))):
+            conn = pool.get_connection("PING")
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            pool.release(conn)
+    return len(opened)
+
+
+async def prepare_dependencies(
+    settings: Settings,
+    checks: Mapping[str, Check],
+    *,
+    rate_limiter: RateLimiter | None = None,
+) -> None:
+    """
+    Startup phase: wait for dependencies, then pre-warm pools and script cache
+    so the first real requests don't pay cold-connection costs.
+    """
+
+    if not checks:
+        return
+
+    ready = await wait_for_dependencies(
+        checks,
+        timeout_seconds=settings.STARTUP_WAIT_TIMEOUT_SECONDS,
+        attempt_timeout_seconds=settings.READINESS_CHECK_TIMEOUT_SECONDS,
+    )
+
+    warmups = []
+    if ready.get("db"):
+        warmups.append(("db", warm_db_pool, (settings.STARTUP_WARM_DB_CONNECTIONS,)))
+    if ready.get("redis"):
+        warmups.append(
+            (
+                "redis",
+                warm_redis_pool,
+                (settings.REDIS_URL, settings.STARTUP_WARM_REDIS_CONNECTIONS),
+            )
+        )
+        preload = getattr(rate_limiter, "preload_scripts", None)
+        if callable(preload):
+            warmups.append(("redis_scripts", preload, ()))
+
+    async def _warm(name: str, fn, args) -> None:
+        try:
+            await asyncio.to_thread(fn, *args)
+        except Exception:
+            log.warning("startup warm-up failed", extra={"dependency": name})
+
+    await asyncio.gather(*(_warm(name, fn, args) for name, fn, args in warmups))
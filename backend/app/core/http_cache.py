@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi.responses import Response
+
+# Per-user resources: never in shared caches; clients revalidate every time
+# (cheap with `If-None-Match`).
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    `If-None-Match` evaluation (RFC 9110 §13.1.2: weak comparison).
+    """
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(tag) == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, *, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
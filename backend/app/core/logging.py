@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from contextvars import ContextVar
-from datetime import datetime, timezone
 from typing import Any
 
 from app.core.config import Settings
 
+try:
+    # Optional fast JSON encoder (`pip install .[perf]`).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 _request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 
@@ -29,31 +44,519 @@ def get_request_id() -> str | None:
     return _request_id_ctx.get()
 
 
+class RequestTimings:
+    """
+    Per-request phase timings: span name -> (total ms, count).
+
+    One instance is shared by everything handling a request (middleware tasks
+    and threadpool workers see the same object through the contextvar), so
+    spans are aggregated by name rather than kept as a list. An optional
+    `listener(name, duration_ms)` sees every individual span (tracing uses it).
+    """
+
+    __slots__ = ("_spans", "_lock", "listener")
+
+    def __init__(self) -> None:
+        self._spans: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self.listener: Callable[[str, float], None] | None = None
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [duration_ms, 1]
+            else:
+                span[0] += duration_ms
+                span[1] += 1
+        if self.listener is not None:
+            self.listener(name, duration_ms)
+
+    def items(self) -> list[tuple[str, float, int]]:
+        with self._lock:
+            return [(n, total, int(count)) for n, (total, count) in self._spans.items()]
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(total, 2) for name, total, _count in self.items()}
+
+
+_timings_ctx: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> tuple[RequestTimings, Any]:
+    """
+    Start collecting timings for the current request.
+
+    Returns the collector and a token for `reset_request_timings(...)`.
+    """
+    timings = RequestTimings()
+    return timings, _timings_ctx.set(timings)
+
+
+def reset_request_timings(token: Any) -> None:
+    _timings_ctx.reset(token)
+
+
+def get_request_timings() -> RequestTimings | None:
+    return _timings_ctx.get()
+
+
+def record_timing(name: str, duration_ms: float) -> None:
+    timings = _timings_ctx.get()
+    if timings is not None:
+        timings.add(name, duration_ms)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Record the duration of the block as span `name` (no-op outside a request).
+    """
+    timings = _timings_ctx.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - start) * 1000)
+
+
 class RequestIdFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
-        record.request_id = get_request_id()
+        # setdefault: records built by the sampler carry their own (None).
+        record.__dict__.setdefault("request_id", get_request_id())
+        return True
+
+
+# Structured fields emitted when present on a record (passed via `extra=...`).
+DEFAULT_LOG_EXTRA_FIELDS: tuple[str, ...] = tuple(
+    Settings.model_fields["LOG_EXTRA_FIELDS"].default
+)
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    Keep hot-path logging bounded under load.
+
+    - Records at ERROR+, with `status_code >= 500`, or with
+      `duration_ms >= slow_request_ms` always pass.
+    - Otherwise a sample rate applies: the status rate (`"401"` or `"4xx"`)
+      wins over the logger rate (longest matching logger prefix).
+    - Identical records (logger, message template, status, path) share a token
+      bucket; once it's empty they are suppressed, and the next record that
+      gets through carries `suppressed=<N>` with the number skipped since.
+      If none gets through (the storm stopped), a copy of the last suppressed
+      record carrying the count is sent to `sink` once the key has been quiet
+      for a refill interval (checked as other records arrive), when buckets
+      are evicted, and on `flush_suppressed()` (at shutdown).
+    """
+
+    _MAX_KEYS = 10_000
+
+    def __init__(
+        self,
+        *,
+        logger_rates: Mapping[str, float] | None = None,
+        status_rates: Mapping[str, float] | None = None,
+        slow_request_ms: float | None = None,
+        dedup_burst: int = 0,
+        dedup_rate_per_second: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+        sink: Callable[[logging.LogRecord], Any] | None = None,
+    ) -> None:
+        super().__init__()
+        # Longest prefix first so "app.request" beats "app".
+        self._logger_rates = sorted(
+            ((name, float(rate)) for name, rate in (logger_rates or {}).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self._status_rates = {
+            str(k).lower(): float(v) for k, v in (status_rates or {}).items()
+        }
+        self._slow_ms = slow_request_ms
+        self._burst = max(0, int(dedup_burst))
+        self._refill = max(0.0, float(dedup_rate_per_second))
+        self._clock = clock
+        self._rand = rand
+        self._sink = sink
+        # A key with nothing seen for this long has ended its storm.
+        self._quiet = 1.0 / self._refill if self._refill > 0 else 1.0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        # key -> [tokens, last_seen, suppressed, last suppressed record]
+        self._buckets: dict[tuple[Any, ...], list[Any]] = {}
+        self._pending: set[tuple[Any, ...]] = set()  # keys with suppressed > 0
+
+    def _rate_for(self, record: logging.LogRecord, status: Any) -> float:
+        if status is not None and self._status_rates:
+            code = str(status)
+            rate = self._status_rates.get(code)
+            if rate is None:
+                rate = self._status_rates.get(code[:1] + "xx")
+            if rate is not None:
+                return rate
+        name = record.name
+        for prefix, rate in self._logger_rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def _take_token(self, record: logging.LogRecord, status: Any) -> bool:
+        key = (record.name, record.msg, status, record.__dict__.get("path"))
+        now = self._clock()
+        summaries: list[logging.LogRecord] = []
+        suppressed = 0
+        with self._lock:
+            if self._sink is not None and self._pending and now >= self._next_sweep:
+                # This key's own count rides on this record if it passes.
+                self._next_sweep = now + self._quiet
+                summaries = self._take_summaries(now, skip=key)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._MAX_KEYS:
+                    summaries += self._take_summaries(None)
+                    self._buckets.clear()
+                    self._pending.clear()
+                bucket = [float(self._burst), now, 0, None]
+                self._buckets[key] = bucket
+            else:
+                bucket[0] = min(
+                    float(self._burst), bucket[0] + (now - bucket[1]) * self._refill
+                )
+                bucket[1] = now
+
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                bucket[3] = record
+                self._pending.add(key)
+                passed = False
+            else:
+                bucket[0] -= 1.0
+                suppressed, bucket[2], bucket[3] = int(bucket[2]), 0, None
+                self._pending.discard(key)
+                passed = True
+        # Outside the lock: the sink re-enters this filter.
+        self._emit(summaries)
+        if passed and suppressed:
+            record.suppressed = suppressed
+        return passed
+
+    def _take_summaries(
+        self, now: float | None, *, skip: tuple[Any, ...] | None = None
+    ) -> list[logging.LogRecord]:
+        # Under the lock. `now=None` takes every pending key (eviction/flush).
+        summaries = []
+        for key in list(self._pending):
+            if key == skip:
+                continue
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket[2] == 0:
+                self._pending.discard(key)
+                continue
+            if now is not None and now - bucket[1] < self._quiet:
+                continue
+            summary = copy.copy(bucket[3])
+            summary.created = time.time()
+            summary.suppressed = int(bucket[2])
+            summary.sampling_summary = True
+            summary.request_id = None
+            bucket[2], bucket[3] = 0, None
+            self._pending.discard(key)
+            summaries.append(summary)
+        return summaries
+
+    def _emit(self, summaries: list[logging.LogRecord]) -> None:
+        if self._sink is None:
+            return
+        for summary in summaries:
+            self._sink(summary)
+
+    def flush_suppressed(self) -> None:
+        """
+        Report every pending suppressed count now (e.g. at shutdown).
+        """
+
+        with self._lock:
+            summaries = self._take_summaries(None)
+        self._emit(summaries)
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
+        attrs = record.__dict__
+        if attrs.get("sampling_summary"):
+            return True
+        status = attrs.get("status_code")
+
+        if record.levelno >= logging.ERROR:
+            return True
+        if isinstance(status, int) and status >= 500:
+            return True
+        duration = attrs.get("duration_ms")
+        if (
+            self._slow_ms is not None
+            and isinstance(duration, (int, float))
+            and duration >= self._slow_ms
+        ):
+            return True
+
+        rate = self._rate_for(record, status)
+        if rate < 1.0 and (rate <= 0.0 or self._rand() >= rate):
+            return False
+
+        if self._burst:
+            return self._take_token(record, status)
         return True
 
 
+def _json_dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+if orjson is not None:
+
+    def _dumps(payload: dict[str, Any]) -> str:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+
+else:
+    _dumps = _json_dumps
+
+
 class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record, tuned for the hot path:
+
+    - serializes with `orjson` when installed (stdlib `json` otherwise)
+    - caches the encoded static fields per (logger, level) pair
+    - formats timestamps from a per-second cached prefix
+    - emits a whitelist of `extra=...` fields (`LOG_EXTRA_FIELDS`)
+    """
+
+    def __init__(
+        self,
+        *,
+        extra_fields: Iterable[str] = DEFAULT_LOG_EXTRA_FIELDS,
+        static_fields: Mapping[str, Any] | None = None,
+    ) -> None:
+        super().__init__()
+        self._extra_fields = tuple(extra_fields)
+        self._static_fields = dict(static_fields or {})
+        self._prefixes: dict[tuple[str, str], str] = {}
+        self._ts_second = -1
+        self._ts_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Use the record's creation time: with async logging, formatting
+        # happens later on the listener thread.
+        second = int(created)
+        if second != self._ts_second:
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_second = second
+        micros = int((created - second) * 1_000_000)
+        return f"{self._ts_prefix}.{micros:06d}+00:00"
+
+    def _prefix(self, name: str, level: str) -> str:
+        key = (name, level)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            static = {"level": level, "logger": name, **self._static_fields}
+            # '{"level":..,"logger":..}' -> '"level":..,"logger":..,'
+            prefix = _dumps(static)[1:-1] + ","
+            self._prefixes[key] = prefix
+        return prefix
+
     def format(self, record: logging.LogRecord) -> str:
+        attrs = record.__dict__
         payload: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "level": record.levelname,
             "message": record.getMessage(),
-            "logger": record.name,
-            "request_id": getattr(record, "request_id", None),
+            "request_id": attrs.get("request_id"),
         }
 
         # Optional structured fields (middleware can pass these via `extra=...`)
-        for key in ("path", "method", "status_code", "duration_ms"):
-            if hasattr(record, key):
-                payload[key] = getattr(record, key)
+        for key in self._extra_fields:
+            if key in attrs:
+                payload[key] = attrs[key]
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+
+        return (
+            '{"timestamp":"'
+            + self._timestamp(record.created)
+            + '",'
+            + self._prefix(record.name, record.levelname)
+            + _dumps(payload)[1:]
+        )
+
+
+class _AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Request-path half of async logging: snapshot the record and enqueue it.
+
+    The queue is bounded; when full, `policy="drop"` discards the record and
+    counts it, `policy="block"` waits for the listener (backpressure).
+    """
+
+    def __init__(self, q: queue.Queue, *, policy: str = "drop") -> None:
+        super().__init__(q)
+        self._block = policy == "block"
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (args/frames may not outlive
+        # the call), but leave JSON/text formatting to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """
+    Listener-side handler: formats on the background thread and writes in
+    batches (one `write` + `flush` per batch instead of per record).
+    """
+
+    def __init__(self, stream: Any, q: queue.Queue, *, batch_size: int) -> None:
+        super().__init__(stream=stream)
+        self._queue = q
+        self._batch_size = max(1, int(batch_size))
+        self._buffer: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        # Flush when the batch is full or the listener has caught up.
+        if len(self._buffer) >= self._batch_size or self._queue.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._buffer and self.stream:
+                data, self._buffer = "".join(self._buffer), []
+                self.stream.write(data)
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Upstream uses put_nowait, which raises on a full bounded queue;
+        # the listener is draining, so waiting for room is safe.
+        self.queue.put(self._sentinel)
+
+
+_listener: _QueueListener | None = None
+_queue_handler: _AsyncQueueHandler | None = None
+
+
+def get_dropped_log_records() -> int:
+    """
+    Records discarded because the async log queue was full (drop policy).
+    """
 
-        return json.dumps(payload, ensure_ascii=False)
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the async log listener (if any), flushing everything still queued.
+
+    The root logger then writes synchronously through the listener's output
+    handlers: records logged later (other atexit hooks, worker exit) would
+    otherwise sit in a queue nobody reads, or block on it when full.
+    """
+
+    global _listener, _queue_handler
+    for handler in logging.getLogger().handlers:
+        for record_filter in handler.filters:
+            if isinstance(record_filter, LogSamplingFilter):
+                record_filter.flush_suppressed()
+
+    listener, _listener = _listener, None
+    queue_handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+    listener.stop()
+    for output in listener.handlers:
+        output.flush()
+
+    root = logging.getLogger()
+    if queue_handler is None or queue_handler not in root.handlers:
+        return
+    for output in listener.handlers:
+        for record_filter in queue_handler.filters:
+            output.addFilter(record_filter)
+    root.handlers = [h for h in root.handlers if h is not queue_handler] + list(
+        listener.handlers
+    )
+
+
+atexit.register(shutdown_logging)
+
+
+def _restart_listener_after_fork() -> None:
+    # The listener thread does not survive fork() (e.g. gunicorn with
+    # preload): give the child its own queue and thread. Whatever the parent
+    # had queued is the parent's to write.
+    global _listener
+    listener, handler = _listener, _queue_handler
+    if listener is None or handler is None:
+        return
+    q: queue.Queue = queue.Queue(maxsize=handler.queue.maxsize)
+    handler.queue = q
+    handler._dropped = 0
+    handler._dropped_lock = threading.Lock()
+    for output in listener.handlers:
+        if isinstance(output, _BatchingStreamHandler):
+            output._queue = q
+            output._buffer = []
+    _listener = _QueueListener(q, *listener.handlers)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def _build_formatter(settings: Settings) -> logging.Formatter:
+    if settings.LOG_JSON:
+        return JsonFormatter(
+            extra_fields=settings.LOG_EXTRA_FIELDS,
+            static_fields=settings.LOG_STATIC_FIELDS,
+        )
+    return logging.Formatter(
+        fmt=(
+            "%(asctime)s %(levelname)s %(name)s "
+            "request_id=%(request_id)s %(message)s"
+        )
+    )
 
 
 def _configure_root_logger(level: str, handler: logging.Handler) -> None:
@@ -69,22 +572,49 @@ def _configure_root_logger(level: str, handler: logging.Handler) -> None:
 def configure_logging(settings: Settings) -> None:
     """
     Configure root logging once during app creation.
+
+    With `LOG_ASYNC=true`, the root handler only enqueues records; a
+    `QueueListener` thread formats and writes them to stdout in batches.
     """
-    handler = logging.StreamHandler(stream=sys.stdout)
-    handler.addFilter(RequestIdFilter())
+    global _listener, _queue_handler
 
-    if settings.LOG_JSON:
-        handler.setFormatter(JsonFormatter())
+    shutdown_logging()
+    formatter = _build_formatter(settings)
+
+    handler: logging.Handler
+    if settings.LOG_ASYNC:
+        q: queue.Queue = queue.Queue(maxsize=max(1, int(settings.LOG_QUEUE_SIZE)))
+        output = _BatchingStreamHandler(
+            sys.stdout, q, batch_size=settings.LOG_BATCH_SIZE
+        )
+        output.setFormatter(formatter)
+
+        policy = (settings.LOG_QUEUE_FULL_POLICY or "drop").strip().lower()
+        handler = _AsyncQueueHandler(q, policy=policy)
+        _queue_handler = handler
+        _listener = _QueueListener(q, output)
+        _listener.start()
     else:
-        handler.setFormatter(
-            logging.Formatter(
-                fmt=(
-                    "%(asctime)s %(levelname)s %(name)s "
-                    "request_id=%(request_id)s %(message)s"
-                )
+        handler = logging.StreamHandler(stream=sys.stdout)
+        handler.setFormatter(formatter)
+
+    # Sampling runs first so dropped records cost nothing further.
+    if settings.LOG_SAMPLING_ENABLED:
+        handler.addFilter(
+            LogSamplingFilter(
+                logger_rates=settings.LOG_SAMPLE_RATES,
+                status_rates=settings.LOG_SAMPLE_RATES_BY_STATUS,
+                slow_request_ms=settings.LOG_SLOW_REQUEST_MS,
+                dedup_burst=settings.LOG_DEDUP_BURST,
+                dedup_rate_per_second=settings.LOG_DEDUP_RATE_PER_SECOND,
+                sink=handler.handle,
             )
         )
 
+    # request_id lives in a contextvar, so it must be captured on the
+    # producing side (before the record crosses to the listener thread).
+    handler.addFilter(RequestIdFilter())
+
     _configure_root_logger(settings.LOG_LEVEL, handler)
 
     logging.getLogger(__name__).info("logging configured")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from app.core.metrics.exposition import CONTENT_TYPE, render_prometheus
+from app.core.metrics.multiprocess import MultiprocessMetrics
+from app.core.metrics.registry import (
+    DEFAULT_BUCKETS,
+    OVERFLOW_LABELS,
+    InMemoryMetrics,
+    label_key,
+)
+from app.core.metrics.sketch import DDSketch
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DDSketch",
+    "DEFAULT_BUCKETS",
+    "InMemoryMetrics",
+    "MultiprocessMetrics",
+    "OVERFLOW_LABELS",
+    "label_key",
+    "render_prometheus",
+]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from app.core.metrics.registry import LabelKey
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _bound(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}.0"
+
+
+def render_prometheus(
+    *,
+    counters: Iterable[tuple[str, LabelKey, float]],
+    histograms: Iterable[tuple[str, LabelKey, list[int], float, int]],
+    buckets: Sequence[float],
+) -> str:
+    """
+    Render counters and histograms in the Prometheus text exposition format.
+
+    `histograms` rows carry non-cumulative bucket counts (last slot = +Inf);
+    they are accumulated here.
+    """
+
+    lines: list[str] = []
+
+    current = None
+    for name, key, value in counters:
+        if name != current:
+            lines.append(f"# TYPE {name} counter")
+            current = name
+        lines.append(f"{name}{_labels(key)} {_number(value)}")
+
+    les = [_bound(b) for b in buckets] + ["+Inf"]
+    current = None
+    for name, key, counts, total, count in histograms:
+        if name != current:
+            lines.append(f"# TYPE {name} histogram")
+            current = name
+        cumulative = 0
+        for le, c in zip(les, counts):
+            cumulative += c
+            lines.append(f"{name}_bucket{_labels(key, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+        lines.append(f"{name}_count{_labels(key)} {count}")
+
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import weakref
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core.metrics.exposition import render_prometheus
+from app.core.metrics.registry import (
+    DEFAULT_BUCKETS,
+    OVERFLOW_LABELS,
+    LabelKey,
+    label_key,
+)
+from app.core.metrics.sketch import DDSketch
+
+try:  # POSIX only; without it, dead-worker folding is skipped.
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+log = logging.getLogger("app.metrics")
+
+_HEADER = struct.Struct("<q")  # bytes used, including the header
+_LENGTH = struct.Struct("<i")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+_WORKER_FILE = re.compile(r"^metrics_(\d+)\.db$")
+ARCHIVE_FILE = "metrics_archive.db"
+LOCK_FILE = ".lock"
+
+# Entry slots: counters use "value"; histograms use bucket indexes, "sum",
+# "count" and "q:<bin>" for their DDSketch bins.
+_COUNTER = "counter"
+_HISTOGRAM = "histogram"
+
+
+class MmapValues:
+    """
+    Append-only `key -> float64` store in a memory-mapped file.
+
+    Layout: an 8-byte header holding the number of used bytes, then entries of
+    `[int32 key length][utf-8 key, space-padded to 8-byte alignment][float64]`.
+    Only the owning process writes; an entry is fully written before the
+    header is bumped, so concurrent readers never see a torn entry.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._f = open(path, "a+b")
+        if os.fstat(self._f.fileno()).st_size == 0:
+            self._f.truncate(_INITIAL_SIZE)
+        self._capacity = os.fstat(self._f.fileno()).st_size
+        self._m = mmap.mmap(self._f.fileno(), self._capacity)
+        self._used = _HEADER.unpack_from(self._m, 0)[0] or _HEADER.size
+        if self._used == _HEADER.size:
+            _HEADER.pack_into(self._m, 0, self._used)
+        self._positions = {
+            key: pos for key, _value, pos in _iter_entries(self._m, self._used)
+        }
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self._m.close()
+        self._f.truncate(capacity)
+        self._capacity = capacity
+        self._m = mmap.mmap(self._f.fileno(), capacity)
+
+    def position(self, key: str) -> int:
+        pos = self._positions.get(key)
+        if pos is not None:
+            return pos
+        encoded = key.encode("utf-8")
+        padding = -(_LENGTH.size + len(encoded)) % 8
+        entry = _LENGTH.pack(len(encoded)) + encoded + b" " * padding + _VALUE.pack(0.0)
+        end = self._used + len(entry)
+        if end > self._capacity:
+            self._grow(end)
+        self._m[self._used : end] = entry
+        pos = end - _VALUE.size
+        self._used = end
+        _HEADER.pack_into(self._m, 0, self._used)
+        self._positions[key] = pos
+        return pos
+
+    def add_at(self, pos: int, amount: float) -> None:
+        _VALUE.pack_into(self._m, pos, _VALUE.unpack_from(self._m, pos)[0] + amount)
+
+    def add(self, key: str, amount: float) -> None:
+        self.add_at(self.position(key), amount)
+
+    def close(self) -> None:
+        self._m.close()
+        self._f.close()
+
+
+def _iter_entries(buf, used: int) -> Iterator[tuple[str, float, int]]:
+    pos = _HEADER.size
+    while pos < used:
+        (length,) = _LENGTH.unpack_from(buf, pos)
+        pos += _LENGTH.size
+        key = bytes(buf[pos : pos + length]).decode("utf-8")
+        pos += length + (-(_LENGTH.size + length) % 8)
+        (value,) = _VALUE.unpack_from(buf, pos)
+        yield key, value, pos
+        pos += _VALUE.size
+
+
+def read_values(path: Path) -> Iterator[tuple[str, float]]:
+    """
+    Read every `(key, value)` from a metrics file (any process may call this).
+    """
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            used = _HEADER.unpack_from(m, 0)[0]
+            for key, value, _pos in _iter_entries(m, min(used, len(m))):
+                yield key, value
+
+
+def _encode_key(kind: str, name: str, labels: LabelKey, slot: str | int) -> str:
+    return json.dumps([kind, name, [list(p) for p in labels], slot])
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _reset_in_forked_children(metrics: "MultiprocessMetrics") -> None:
+    ref = weakref.WeakMethod(metrics._reset_after_fork)
+
+    def _reset() -> None:
+        method = ref()
+        if method is not None:
+            method()
+
+    os.register_at_fork(after_in_child=_reset)
+
+
+class MultiprocessMetrics:
+    """
+    `Telemetry` implementation for multi-worker deployments.
+
+    Each worker process appends to its own `metrics_<pid>.db` under
+    `directory`; the request path only touches local memory-mapped pages
+    (no IPC, no cross-process locks). `render_prometheus()` merges every
+    worker file at scrape time, so any worker can answer `/metrics`.
+
+    Files of dead workers are folded into `metrics_archive.db` (under an
+    exclusive `flock`) and removed, so counters stay monotonic across worker
+    restarts without the directory growing forever.
+
+    Each worker keeps at most `max_series` label sets; later ones are recorded
+    under `OVERFLOW_LABELS`.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        relative_accuracy: float = 0.01,
+        max_series: int = 10_000,
+    ) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._bounds = tuple(sorted(float(b) for b in buckets))
+        # Only used for its bin mapping; bins live in the mmap file.
+        self._sketch = DDSketch(relative_accuracy=relative_accuracy)
+        self._lock = threading.Lock()
+        self._values: MmapValues | None = None
+        self._positions: dict[tuple[str, str, LabelKey, str | int], int] = {}
+        self._max_series = max(1, int(max_series))
+        self._series: set[tuple[str, str, LabelKey]] = set()
+
+        _reset_in_forked_children(self)
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._bounds
+
+    def _reset_after_fork(self) -> None:
+        # A forked worker must never write into its parent's file.
+        self._lock = threading.Lock()
+        self._values = None
+        self._positions = {}
+        self._series = set()
+
+    def _file(self) -> MmapValues:
+        if self._values is None:
+            self._values = MmapValues(self._dir / f"metrics_{os.getpid()}.db")
+        return self._values
+
+    def _pos(self, kind: str, name: str, labels: LabelKey, slot: str | int) -> int:
+        cache_key = (kind, name, labels, slot)
+        pos = self._positions.get(cache_key)
+        if pos is None:
+            pos = self._file().position(_encode_key(kind, name, labels, slot))
+            self._positions[cache_key] = pos
+        return pos
+
+    def _admit(self, kind: str, name: str, labels: LabelKey) -> LabelKey:
+        # Under the lock.
+        if (kind, name, labels) in self._series:
+            return labels
+        if labels != OVERFLOW_LABELS and len(self._series) >= self._max_series:
+            labels = OVERFLOW_LABELS
+        self._series.add((kind, name, labels))
+        return labels
+
+    # --- Telemetry protocol ---
+
+    def incr_counter(
+        self, name: str, value: int = 1, tags: dict[str, str] | None = None
+    ) -> None:
+        labels = label_key(tags)
+        with self._lock:
+            labels = self._admit(_COUNTER, name, labels)
+            self._file().add_at(self._pos(_COUNTER, name, labels, "value"), value)
+
+    def observe_histogram(
+        self, name: str, value: float, tags: dict[str, str] | None = None
+    ) -> None:
+        labels = label_key(tags)
+        index = bisect_left(self._bounds, value)
+        bin_slot = f"q:{self._sketch.index(value)}"
+        with self._lock:
+            labels = self._admit(_HISTOGRAM, name, labels)
+            values = self._file()
+            values.add_at(self._pos(_HISTOGRAM, name, labels, index), 1)
+            values.add_at(self._pos(_HISTOGRAM, name, labels, "sum"), value)
+            values.add_at(self._pos(_HISTOGRAM, name, labels, "count"), 1)
+            values.add_at(self._pos(_HISTOGRAM, name, labels, bin_slot), 1)
+
+    # --- Read side ---
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        with open(self._dir / LOCK_FILE, "a+b") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _worker_files(self) -> Iterator[tuple[int, Path]]:
+        for path in self._dir.iterdir():
+            match = _WORKER_FILE.match(path.name)
+            if match:
+                yield int(match.group(1)), path
+
+    def collect_dead_workers(self) -> int:
+        """
+        Fold files of exited workers into the archive and delete them.
+
+        Returns the number of files folded. Caller must hold the directory lock.
+        """
+
+        dead = [
+            path
+            for pid, path in self._worker_files()
+            if pid != os.getpid() and not _pid_alive(pid)
+        ]
+        if not dead:
+            return 0
+        archive = MmapValues(self._dir / ARCHIVE_FILE)
+        try:
+            for path in dead:
+                for key, value in read_values(path):
+                    archive.add(key, value)
+                path.unlink()
+        finally:
+            archive.close()
+        log.info("metrics folded dead worker files", extra={"value": len(dead)})
+        return len(dead)
+
+    def merged(self) -> tuple[dict, dict, dict]:
+        """
+        Sum every worker file plus the archive into counters, histograms and
+        sketches.
+        """
+
+        counters: dict[tuple[str, LabelKey], float] = {}
+        histograms: dict[tuple[str, LabelKey], list[float]] = {}
+        sketches: dict[tuple[str, LabelKey], DDSketch] = {}
+        n_buckets = len(self._bounds) + 1
+
+        with self._exclusive():
+            self.collect_dead_workers()
+            paths = [p for _pid, p in self._worker_files()]
+            archive = self._dir / ARCHIVE_FILE
+            if archive.exists():
+                paths.append(archive)
+            for path in paths:
+                try:
+                    entries = list(read_values(path))
+                except FileNotFoundError:
+                    continue
+                for key, value in entries:
+                    kind, name, labels, slot = json.loads(key)
+                    series = (name, tuple(tuple(p) for p in labels))
+                    if kind == _COUNTER:
+                        counters[series] = counters.get(series, 0.0) + value
+                        continue
+                    if isinstance(slot, str) and slot.startswith("q:"):
+                        sketch = sketches.get(series)
+                        if sketch is None:
+                            sketch = sketches[series] = DDSketch(
+                                relative_accuracy=self._sketch.relative_accuracy
+                            )
+                        sketch.merge_bins(((int(slot[2:]), value),))
+                        continue
+                    # Buckets, then sum, then count.
+                    row = histograms.setdefault(series, [0.0] * (n_buckets + 2))
+                    if slot == "sum":
+                        row[n_buckets] += value
+                    elif slot == "count":
+                        row[n_buckets + 1] += value
+                    elif isinstance(slot, int) and 0 <= slot < n_buckets:
+                        row[slot] += value
+        return counters, histograms, sketches
+
+    def sketches(self) -> Iterator[tuple[str, LabelKey, DDSketch]]:
+        _counters, _histograms, sketches = self.merged()
+        for (name, labels), sketch in sorted(sketches.items()):
+            yield name, labels, sketch
+
+    def render_prometheus(self) -> str:
+        counters, histograms, _sketches = self.merged()
+        n_buckets = len(self._bounds) + 1
+        return render_prometheus(
+            counters=(
+                (name, labels, value)
+                for (name, labels), value in sorted(counters.items())
+            ),
+            histograms=(
+                (
+                    name,
+                    labels,
+                    [int(c) for c in row[:n_buckets]],
+                    row[n_buckets],
+                    int(row[n_buckets + 1]),
+                )
+                for (name, labels), row in sorted(histograms.items())
+            ),
+            buckets=self._bounds,
+        )
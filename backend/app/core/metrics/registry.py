@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+
+from app.core.config import Settings
+from app.core.metrics.sketch import DDSketch
+
+# Latency-oriented defaults (milliseconds), shared with settings.
+DEFAULT_BUCKETS: tuple[float, ...] = tuple(
+    Settings.model_fields["METRICS_HISTOGRAM_BUCKETS"].default
+)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+# New series beyond a registry's `max_series` are folded into this label set
+# (per metric name), so a label explosion costs one series, not memory.
+OVERFLOW_LABELS: LabelKey = (("overflow", "true"),)
+
+
+def label_key(tags: dict[str, str] | None) -> LabelKey:
+    if not tags:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in tags.items()))
+
+
+@dataclass
+class CounterSeries:
+    value: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+@dataclass
+class HistogramSeries:
+    # Non-cumulative per-bucket counts; the last slot is the +Inf bucket.
+    counts: list[int]
+    sketch: DDSketch
+    sum: float = 0.0
+    count: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class InMemoryMetrics:
+    """
+    Process-local metrics registry implementing the `Telemetry` protocol.
+
+    Counters and fixed-bucket histograms are keyed by metric name + tags.
+    An observation is a dict lookup, a bisect over the (constant) bucket
+    bounds and a per-series lock; series are only created under the registry
+    lock, so unrelated series never contend. Each histogram series also feeds
+    a `DDSketch` for quantiles. At most `max_series` label sets are kept;
+    later ones are recorded under `OVERFLOW_LABELS`.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        relative_accuracy: float = 0.01,
+        max_series: int = 10_000,
+    ) -> None:
+        self._bounds = tuple(sorted(float(b) for b in buckets))
+        self._relative_accuracy = float(relative_accuracy)
+        self._max_series = max(1, int(max_series))
+        self._series = 0
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, CounterSeries]] = {}
+        self._histograms: dict[str, dict[LabelKey, HistogramSeries]] = {}
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._bounds
+
+    def _admit(self, family: dict[LabelKey, object], key: LabelKey) -> LabelKey:
+        # Under the registry lock, for a key not yet in `family`.
+        if key == OVERFLOW_LABELS or self._series < self._max_series:
+            self._series += 1
+            return key
+        if OVERFLOW_LABELS not in family:
+            self._series += 1
+        return OVERFLOW_LABELS
+
+    def _counter(self, name: str, key: LabelKey) -> CounterSeries:
+        family = self._counters.get(name)
+        series = family.get(key) if family is not None else None
+        if series is not None:
+            return series
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            if key not in family:
+                key = self._admit(family, key)
+            return family.setdefault(key, CounterSeries())
+
+    def _histogram(self, name: str, key: LabelKey) -> HistogramSeries:
+        family = self._histograms.get(name)
+        series = family.get(key) if family is not None else None
+        if series is not None:
+            return series
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            if key not in family:
+                key = self._admit(family, key)
+            return family.setdefault(
+                key,
+                HistogramSeries(
+                    counts=[0] * (len(self._bounds) + 1),
+                    sketch=DDSketch(relative_accuracy=self._relative_accuracy),
+                ),
+            )
+
+    # --- Telemetry protocol ---
+
+    def incr_counter(
+        self, name: str, value: int = 1, tags: dict[str, str] | None = None
+    ) -> None:
+        series = self._counter(name, label_key(tags))
+        with series.lock:
+            series.value += value
+
+    def observe_histogram(
+        self, name: str, value: float, tags: dict[str, str] | None = None
+    ) -> None:
+        series = self._histogram(name, label_key(tags))
+        index = bisect_left(self._bounds, value)
+        with series.lock:
+            series.counts[index] += 1
+            series.sketch.add(value)
+            series.sum += value
+            series.count += 1
+
+    # --- Read side ---
+
+    def counters(self) -> Iterator[tuple[str, LabelKey, float]]:
+        for name, family in sorted(list(self._counters.items())):
+            for key, series in list(family.items()):
+                yield name, key, series.value
+
+    def histograms(
+        self,
+    ) -> Iterator[tuple[str, LabelKey, list[int], float, int]]:
+        for name, family in sorted(list(self._histograms.items())):
+            for key, series in list(family.items()):
+                with series.lock:
+                    counts = list(series.counts)
+                    total, count = series.sum, series.count
+                yield name, key, counts, total, count
+
+    def sketches(self) -> Iterator[tuple[str, LabelKey, DDSketch]]:
+        for name, family in sorted(list(self._histograms.items())):
+            for key, series in list(family.items()):
+                with series.lock:
+                    sketch = series.sketch.copy()
+                yield name, key, sketch
+
+    def render_prometheus(self) -> str:
+        from app.core.metrics.exposition import render_prometheus
+
+        return render_prometheus(
+            counters=self.counters(),
+            histograms=self.histograms(),
+            buckets=self._bounds,
+        )
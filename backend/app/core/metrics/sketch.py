@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    Values map to logarithmic bins `ceil(log_gamma(v))` with
+    `gamma = (1 + a) / (1 - a)`, so every reported quantile is within
+    `relative_accuracy` of the true value. Values are clamped to
+    `[min_value, max_value]`, which bounds the number of bins (and memory) per
+    sketch regardless of traffic. Merging is adding bin counts, so sketches
+    from different workers combine exactly.
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "min_value",
+        "max_value",
+        "bins",
+        "count",
+        "_log_gamma",
+    )
+
+    def __init__(
+        self,
+        *,
+        relative_accuracy: float = 0.01,
+        min_value: float = 0.01,
+        max_value: float = 1e7,
+    ) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = float(relative_accuracy)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self.bins: dict[int, int] = {}
+        self.count = 0
+
+    @property
+    def max_bins(self) -> int:
+        return self.index(self.max_value) - self.index(self.min_value) + 1
+
+    def index(self, value: float) -> int:
+        value = min(max(value, self.min_value), self.max_value)
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def value_at(self, index: int) -> float:
+        # Midpoint (in relative terms) of bin `(gamma^(i-1), gamma^i]`.
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma**index / (gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        i = self.index(value)
+        self.bins[i] = self.bins.get(i, 0) + count
+        self.count += count
+
+    def merge_bins(
+        self, bins: Mapping[int, float] | Iterable[tuple[int, float]]
+    ) -> None:
+        items = bins.items() if isinstance(bins, Mapping) else bins
+        for i, c in items:
+            c = int(c)
+            if c:
+                self.bins[i] = self.bins.get(i, 0) + c
+                self.count += c
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self.merge_bins(other.bins)
+
+    def copy(self) -> "DDSketch":
+        clone = DDSketch(
+            relative_accuracy=self.relative_accuracy,
+            min_value=self.min_value,
+            max_value=self.max_value,
+        )
+        clone.merge_bins(self.bins)
+        return clone
+
+    def quantile(self, q: float) -> float | None:
+        if self.count == 0:
+            return None
+        q = min(max(float(q), 0.0), 1.0)
+        rank = q * (self.count - 1)
+        seen = 0
+        for i in sorted(self.bins):
+            seen += self.bins[i]
+            if seen > rank:
+                return self.value_at(i)
+        return self.value_at(max(self.bins))
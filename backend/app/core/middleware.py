@@ -6,7 +6,13 @@ from typing import Callable
 from uuid import uuid4
 
 from app.core.config import Settings
-from app.core.logging import reset_request_id, set_request_id
+from app.core.logging import (
+    RequestTimings,
+    reset_request_id,
+    reset_request_timings,
+    set_request_id,
+    start_request_timings,
+)
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
@@ -41,12 +47,38 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
         return response
 
 
+def server_timing_header(timings: RequestTimings, total_ms: float) -> str:
+    """
+    Render a `Server-Timing` value: one metric per span, plus `total`.
+    """
+
+    parts = [
+        (
+            f'{name};dur={total:.2f};desc="{count}x"'
+            if count > 1
+            else f"{name};dur={total:.2f}"
+        )
+        for name, total, count in timings.items()
+    ]
+    parts.append(f"total;dur={total_ms:.2f}")
+    return ", ".join(parts)
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     Log a single summary line per request (and exceptions) with request context.
+
+    Also owns the per-request timing context: spans recorded via
+    `app.core.logging.timed(...)` are logged as `timings` and, when
+    `SERVER_TIMING_ENABLED`, returned in a `Server-Timing` header.
     """
 
+    def __init__(self, app: Callable, *, settings: Settings) -> None:
+        super().__init__(app)
+        self._server_timing = bool(settings.SERVER_TIMING_ENABLED)
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        timings, token = start_request_timings()
         start = time.perf_counter()
         try:
             response = await call_next(request)
@@ -59,11 +91,18 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "path": request.url.path,
                     "status_code": 500,
                     "duration_ms": round(duration_ms, 2),
+                    "timings": timings.as_dict(),
                 },
             )
             raise
+        finally:
+            reset_request_timings(token)
 
         duration_ms = (time.perf_counter() - start) * 1000
+        if self._server_timing:
+            response.headers["Server-Timing"] = server_timing_header(
+                timings, duration_ms
+            )
         logger.info(
             "request complete",
             extra={
@@ -71,6 +110,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "path": request.url.path,
                 "status_code": response.status_code,
                 "duration_ms": round(duration_ms, 2),
+                "timings": timings.as_dict(),
             },
         )
         return response
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any
+
+# A frame as reported: (function, file, first line of the function).
+Frame = tuple[str, str, int]
+
+
+def _short_filename(path: str) -> str:
+    parts = path.replace("\\", "/").rsplit("/", 3)
+    return "/".join(parts[-3:])
+
+
+def _stack(frame: FrameType | None) -> tuple[Frame, ...]:
+    # Root first, leaf last.
+    frames: list[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            (code.co_name, _short_filename(code.co_filename), code.co_firstlineno)
+        )
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+@dataclass
+class Profile:
+    """
+    Aggregated samples: (thread name, stack) -> number of samples.
+    """
+
+    duration_seconds: float
+    interval_seconds: float
+    samples: Counter[tuple[str, tuple[Frame, ...]]] = field(default_factory=Counter)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope, ...).
+        """
+
+        lines = []
+        for (thread, stack), count in sorted(self.samples.items()):
+            names = [thread] + [f"{name} ({file}:{line})" for name, file, line in stack]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self, *, name: str = "profile") -> dict[str, Any]:
+        """
+        Speedscope's JSON file format: one sampled profile per thread.
+        """
+
+        frames: list[dict[str, Any]] = []
+        index: dict[Frame, int] = {}
+        by_thread: dict[str, list[tuple[list[int], int]]] = {}
+        for (thread, stack), count in sorted(self.samples.items()):
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append(
+                        {"name": frame[0], "file": frame[1], "line": frame[2]}
+                    )
+                ids.append(index[frame])
+            by_thread.setdefault(thread, []).append((ids, count))
+
+        profiles = []
+        for thread, rows in by_thread.items():
+            weights = [count * self.interval_seconds for _ids, count in rows]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 6),
+                    "samples": [ids for ids, _count in rows],
+                    "weights": weights,
+                }
+            )
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+def sample_threads(duration_seconds: float, frequency_hz: float) -> Profile:
+    """
+    Sample the stacks of every other thread in this process for a while.
+
+    Blocking: call from a worker thread. Uses `sys._current_frames()`, so
+    nothing runs (and nothing costs anything) outside a profiling session.
+    """
+
+    interval = 1.0 / max(1.0, float(frequency_hz))
+    profile = Profile(
+        duration_seconds=float(duration_seconds), interval_seconds=interval
+    )
+    own = threading.get_ident()
+    deadline = time.monotonic() + float(duration_seconds)
+    next_tick = time.monotonic()
+
+    while True:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            profile.samples[(names.get(ident, str(ident)), _stack(frame))] += 1
+        frame = None  # don't keep the last frame (and its locals) alive
+
+        next_tick += interval
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        time.sleep(max(0.0, min(next_tick, deadline) - now))
+
+    return profile
+
+
+class ProfilerGate:
+    """
+    Allows one profiling session at a time, at most once per `cooldown_seconds`.
+    """
+
+    def __init__(self, *, cooldown_seconds: float) -> None:
+        self._cooldown = max(0.0, float(cooldown_seconds))
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_finished = float("-inf")
+
+    def try_acquire(self) -> float | None:
+        """
+        Start a session. Returns None on success, else seconds to wait.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if self._running:
+                return max(1.0, self._cooldown)
+            wait = self._last_finished + self._cooldown - now
+            if wait > 0:
+                return wait
+            self._running = True
+            return None
+
+    def release(self) -> None:
+        with self._lock:
+            self._running = False
+            self._last_finished = time.monotonic()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from app.core.config import Settings
+from app.core.telemetry import Telemetry
+from app.core.telemetry_middleware import route_template
+from app.db.instrumentation import QueryBudgetExceeded, track_queries
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+log = logging.getLogger("app.db")
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Per-request SQL statistics (opt-in via `DB_QUERY_STATS_ENABLED`).
+
+    Counts statements on instrumented engines, exports query count and DB time
+    as telemetry histograms, and enforces `DB_QUERY_BUDGET`: over budget is a
+    warning (with the slowest statement template) or, in `raise` mode, an
+    error — meant for tests, so N+1 regressions fail loudly.
+    """
+
+    def __init__(self, app: Callable, *, settings: Settings) -> None:
+        super().__init__(app)
+        self._budget = max(0, int(settings.DB_QUERY_BUDGET))
+        self._raise = (
+            settings.DB_QUERY_BUDGET_MODE or "warn"
+        ).strip().lower() == "raise"
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        if stats.count == 0:
+            return response
+
+        path = route_template(request)
+        tags = {"method": request.method, "path": path}
+        telemetry: Telemetry = request.app.state.telemetry  # type: ignore[attr-defined]
+        telemetry.observe_histogram("db_queries_per_request", stats.count, tags=tags)
+        telemetry.observe_histogram(
+            "db_time_per_request_ms", round(stats.total_ms, 2), tags=tags
+        )
+
+        if self._budget and stats.count > self._budget:
+            log.warning(
+                "query budget exceeded",
+                extra={
+                    "method": request.method,
+                    "path": path,
+                    "db_queries": stats.count,
+                    "db_time_ms": round(stats.total_ms, 2),
+                    "slowest_statement": stats.slowest_statement,
+                },
+            )
+            if self._raise:
+                raise QueryBudgetExceeded(path, stats.count, self._budget)
+        return response
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 
 from app.core.config import Settings
+from app.core.health.breaker import get_breaker
 from app.core.rate_limit.in_memory import InMemoryRateLimiter
 from app.core.rate_limit.interface import RateLimiter
 from app.core.rate_limit.redis_backend import RedisRateLimiter
@@ -15,7 +16,7 @@ def build_rate_limiter(settings: Settings) -> RateLimiter | None:
         return None
 
     if settings.REDIS_URL:
-        return RedisRateLimiter(settings.REDIS_URL)
+        return RedisRateLimiter(settings.REDIS_URL, breaker=get_breaker("redis"))
 
     # Redis is the intended backend, but keep the template test-friendly.
     if settings.ENV == "test":
@@ -6,7 +6,9 @@ from typing import Callable
 import anyio
 from app.auth.jwt import decode_token
 from app.core.config import Settings
-from app.core.errors import error_response, get_request_id
+from app.core.errors import error_body_renderer, get_request_id
+from app.core.health.breaker import CircuitOpenError
+from app.core.logging import timed
 from app.core.rate_limit.interface import RateLimiter
 from app.core.rate_limit.redis_backend import RedisRateLimiter
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -15,6 +17,9 @@ from starlette.responses import Response
 
 log = logging.getLogger("app.rate_limit")
 
+# Under a flood most responses are 429s: only the request id varies.
+_render_rate_limited = error_body_renderer("rate_limited", "Too many requests")
+
 _EXEMPT_PATHS = {
     "/health",
     "/api/v1/health/live",
@@ -88,12 +93,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         key = f"{self._prefix}{strategy}:{identifier}:global"
 
         try:
-            if isinstance(limiter, RedisRateLimiter):
-                allowed, remaining, reset = await anyio.to_thread.run_sync(
-                    limiter.hit, key, self._limit, self._window
-                )
-            else:
-                allowed, remaining, reset = limiter.hit(key, self._limit, self._window)
+            with timed("rate_limit"):
+                if isinstance(limiter, RedisRateLimiter):
+                    allowed, remaining, reset = await anyio.to_thread.run_sync(
+                        limiter.hit, key, self._limit, self._window
+                    )
+                else:
+                    allowed, remaining, reset = limiter.hit(
+                        key, self._limit, self._window
+                    )
+        except CircuitOpenError:
+            # Backend known to be down: fail open without the log noise.
+            return await call_next(request)
         except Exception:
             # Fail open for safety; rate limiting is an optional guardrail.
             log.exception(
@@ -106,19 +117,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
             return await call_next(request)
 
-        if allowed:
-            response = await call_next(request)
-        else:
-            request_id = get_request_id()
-            response = error_response(
-                code="rate_limited",
-                message="Too many requests",
-                request_id=request_id,
+        headers = {
+            "X-RateLimit-Limit": str(self._limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+        if not allowed:
+            return Response(
+                content=_render_rate_limited(get_request_id()),
                 status_code=429,
-                details=None,
+                headers=headers,
+                media_type="application/json",
             )
 
-        response.headers["X-RateLimit-Limit"] = str(self._limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset)
+        response = await call_next(request)
+        response.headers.update(headers)
         return response
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import time
 
-import redis
+from app.core.health.breaker import CircuitBreaker
 from app.core.rate_limit.interface import RateLimiter
+from app.core.redis_pool import get_redis_client
 
 _HIT_LUA = """
 local current = redis.call('INCR', KEYS[1])
@@ -17,15 +18,29 @@ return current
 class RedisRateLimiter(RateLimiter):
     """
     Fixed-window rate limiter using Redis INCR + EXPIRE via Lua for atomicity.
+
+    With a `breaker`, `hit()` raises `CircuitOpenError` immediately while Redis
+    is unhealthy so the middleware can fail open without waiting on a socket.
     """
 
-    def __init__(self, redis_url: str, *, socket_timeout: float = 1.0) -> None:
-        self._client = redis.Redis.from_url(
-            redis_url,
-            socket_connect_timeout=socket_timeout,
-            socket_timeout=socket_timeout,
-        )
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        socket_timeout: float = 1.0,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self._client = get_redis_client(redis_url, socket_timeout=socket_timeout)
         self._hit = self._client.register_script(_HIT_LUA)
+        self._breaker = breaker
+
+    def preload_scripts(self) -> None:
+        """
+        Load the Lua script into Redis' script cache ahead of the first hit,
+        so the first EVALSHA doesn't bounce with NOSCRIPT.
+        """
+
+        self._client.script_load(_HIT_LUA)
 
     def hit(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int, int]:
         now = int(time.time())
@@ -33,7 +48,16 @@ class RedisRateLimiter(RateLimiter):
         reset = window_start + int(window_seconds)
 
         window_key = f"{key}:{window_start}"
-        current = int(self._hit(keys=[window_key], args=[int(window_seconds)]))
+        if self._breaker is None:
+            current = int(self._hit(keys=[window_key], args=[int(window_seconds)]))
+        else:
+            self._breaker.check()
+            try:
+                current = int(self._hit(keys=[window_key], args=[int(window_seconds)]))
+            except Exception:
+                self._breaker.record_failure()
+                raise
+            self._breaker.record_success()
 
         allowed = current <= int(limit)
         remaining = max(0, int(limit) - current)
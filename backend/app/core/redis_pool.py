@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # imported on first use: deployments without Redis never pay for it
+    import redis
+
+
+@lru_cache
+def get_redis_client(redis_url: str, *, socket_timeout: float = 1.0) -> redis.Redis:
+    """
+    Process-wide Redis client (and connection pool) for a given URL.
+
+    Cache, rate limiting and health checks share the same pool instead of each
+    opening their own connections. Clients are created lazily; no connection is
+    made until the first command.
+    """
+
+    import redis
+
+    return redis.Redis.from_url(
+        redis_url,
+        socket_connect_timeout=socket_timeout,
+        socket_timeout=socket_timeout,
+    )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from app.core.config import Settings
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    # Optional fast JSON encoder (`pip install .[perf]`).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+log = logging.getLogger(__name__)
+
+
+class ModelResponse(Response):
+    """
+    Render a Pydantic model with its compiled serializer straight to bytes.
+
+    Return it from a route to bypass FastAPI's validate + `jsonable_encoder`
+    round trip when the model instance is already trusted.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            # Cached per model class by Pydantic (`__pydantic_serializer__`).
+            return type(content).__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+class RawJSONResponse(Response):
+    """
+    Already-serialized JSON bytes (e.g. straight from the cache).
+    """
+
+    media_type = "application/json"
+
+
+def default_response_class(settings: Settings) -> type[JSONResponse]:
+    mode = (settings.RESPONSE_JSON_RENDERER or "auto").strip().lower()
+    if mode in {"auto", "orjson"} and orjson is not None:
+        return ORJSONResponse
+    if mode == "orjson":
+        log.warning(
+            "RESPONSE_JSON_RENDERER=orjson but orjson is not installed; using json"
+        )
+    return JSONResponse
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import Any
+
+from app.core.config import Settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> float | None:
+    """
+    CPUs granted by the container's CFS quota (e.g. `--cpus=2.5` -> 2.5), or
+    None when unlimited or not in a cgroup. cgroup v2 first, then v1.
+    """
+
+    v2 = _read(root / "cpu.max")  # "<quota> <period>" or "max <period>"
+    if v2 is not None:
+        quota, _, period = v2.partition(" ")
+        if quota == "max":
+            return None
+        try:
+            return int(quota) / int(period or "100000")
+        except (ValueError, ZeroDivisionError):
+            return None
+
+    for cpu_dir in (root / "cpu", root / "cpu,cpuacct"):
+        quota_us = _read(cpu_dir / "cpu.cfs_quota_us")
+        period_us = _read(cpu_dir / "cpu.cfs_period_us")
+        if quota_us is None or period_us is None:
+            continue
+        try:
+            quota, period = int(quota_us), int(period_us)
+        except ValueError:
+            return None
+        if quota <= 0 or period <= 0:  # -1 = unlimited
+            return None
+        return quota / period
+    return None
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> float:
+    """
+    CPUs this process can actually use: the scheduler affinity mask (cpusets),
+    capped by the cgroup quota. `os.cpu_count()` reports the host's cores.
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        cpus: float = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover - macOS/Windows
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return cpus
+
+
+def worker_count(settings: Settings, *, cpus: float | None = None) -> int:
+    """
+    `SERVER_WORKERS` when set, else CPUs x `SERVER_WORKERS_PER_CPU` (rounded
+    up, so a 1.5-CPU quota gets 2), capped by `SERVER_MAX_WORKERS`.
+    """
+
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    if cpus is None:
+        cpus = available_cpus()
+    derived = math.ceil(cpus * max(0.0, settings.SERVER_WORKERS_PER_CPU))
+    return max(1, min(max(1, settings.SERVER_MAX_WORKERS), derived))
+
+
+def gunicorn_options(
+    settings: Settings, *, cpus: float | None = None
+) -> dict[str, Any]:
+    """
+    Gunicorn settings derived from app settings (see `app.core.gunicorn_conf`).
+    """
+
+    max_requests = max(0, settings.SERVER_MAX_REQUESTS)
+    return {
+        "bind": [f"0.0.0.0:{os.environ.get('APP_PORT', '8000')}"],
+        "workers": worker_count(settings, cpus=cpus),
+        "worker_class": "app.core.gunicorn_conf.UvicornWorker",
+        "max_requests": max_requests,
+        "max_requests_jitter": (
+            max(0, settings.SERVER_MAX_REQUESTS_JITTER) if max_requests else 0
+        ),
+        "preload_app": settings.SERVER_PRELOAD,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        # Worker heartbeat files on tmpfs: a slow overlay disk can't stall them.
+        "worker_tmp_dir": "/dev/shm" if os.path.isdir("/dev/shm") else None,
+    }
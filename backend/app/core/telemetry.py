@@ -59,4 +59,19 @@ def build_telemetry(settings: Settings) -> Telemetry:
     mode = (settings.TELEMETRY_MODE or "noop").strip().lower()
     if mode == "log":
         return LoggingTelemetry()
+    if mode == "prometheus":
+        from app.core.metrics import InMemoryMetrics, MultiprocessMetrics
+
+        if settings.METRICS_MULTIPROC_DIR:
+            return MultiprocessMetrics(
+                settings.METRICS_MULTIPROC_DIR,
+                buckets=settings.METRICS_HISTOGRAM_BUCKETS,
+                relative_accuracy=settings.METRICS_SKETCH_RELATIVE_ACCURACY,
+                max_series=settings.METRICS_MAX_SERIES,
+            )
+        return InMemoryMetrics(
+            buckets=settings.METRICS_HISTOGRAM_BUCKETS,
+            relative_accuracy=settings.METRICS_SKETCH_RELATIVE_ACCURACY,
+            max_series=settings.METRICS_MAX_SERIES,
+        )
     return NoopTelemetry()
@@ -10,13 +10,17 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+# Label for requests no route matched (404/405): raw paths would let any
+# scanner create unbounded metric series.
+UNMATCHED_ROUTE = "<unmatched>"
 
-def _route_template(request: Request) -> str:
+
+def route_template(request: Request) -> str:
     route = request.scope.get("route")
     path_format = getattr(route, "path_format", None)
     if isinstance(path_format, str) and path_format:
         return path_format
-    return request.url.path
+    return UNMATCHED_ROUTE
 
 
 class TelemetryMiddleware(BaseHTTPMiddleware):
@@ -36,7 +40,7 @@ class TelemetryMiddleware(BaseHTTPMiddleware):
         telemetry: Telemetry = request.app.state.telemetry  # type: ignore[attr-defined]
         tags = {
             "method": request.method,
-            "path": _route_template(request),
+            "path": route_template(request),
             "status_code": str(response.status_code),
         }
         telemetry.incr_counter("http_requests_total", 1, tags=tags)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+
+from app.core.config import Settings
+from app.core.tracing.context import TraceContext, format_traceparent, parse_traceparent
+from app.core.tracing.exporters import (
+    InMemorySpanExporter,
+    NDJSONFileExporter,
+    Span,
+    SpanExporter,
+)
+from app.core.tracing.processor import BatchSpanProcessor
+from app.core.tracing.tracer import Trace, Tracer, get_current_trace
+
+log = logging.getLogger(__name__)
+
+
+def build_span_exporter(settings: Settings) -> SpanExporter | None:
+    kind = (settings.TRACING_EXPORTER or "ndjson").strip().lower()
+    if kind == "ndjson":
+        return NDJSONFileExporter(settings.TRACING_NDJSON_PATH)
+    log.warning("unknown TRACING_EXPORTER; tracing disabled")
+    return None
+
+
+def build_tracer(settings: Settings) -> Tracer | None:
+    if not settings.TRACING_ENABLED:
+        return None
+    exporter = build_span_exporter(settings)
+    if exporter is None:
+        return None
+    processor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.TRACING_QUEUE_SIZE,
+        max_batch_size=settings.TRACING_BATCH_SIZE,
+        schedule_delay_seconds=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+    )
+    return Tracer(
+        processor,
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        tail_sampling=settings.TRACING_TAIL_SAMPLING,
+        tail_latency_ms=settings.TRACING_TAIL_LATENCY_MS,
+        trust_parent_sampled=settings.TRACING_TRUST_PARENT_SAMPLED,
+    )
+
+
+__all__ = [
+    "BatchSpanProcessor",
+    "InMemorySpanExporter",
+    "NDJSONFileExporter",
+    "Span",
+    "SpanExporter",
+    "Trace",
+    "TraceContext",
+    "Tracer",
+    "build_span_exporter",
+    "build_tracer",
+    "format_traceparent",
+    "get_current_trace",
+    "parse_traceparent",
+]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+try:
+    # Optional fast JSON encoder (`pip install .[perf]`).
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    name: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"  # ok|error
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class SpanExporter(Protocol):
+    """
+    Sends finished spans somewhere. Called from the batch processor thread,
+    never from the request path.
+    """
+
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class NDJSONFileExporter:
+    """
+    Appends one JSON object per span to a local file; needs no collector.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self._path, "ab")
+
+    def _reset_after_fork(self) -> None:
+        # Called by the processor in a forked child: the parent may have held
+        # the lock mid-export. Both processes then append to the same file
+        # (O_APPEND; one flushed write per batch).
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if orjson is not None:
+            data = b"".join(orjson.dumps(s.to_dict()) + b"\n" for s in spans)
+        else:
+            data = "".join(
+                json.dumps(s.to_dict(), separators=(",", ":")) + "\n" for s in spans
+            ).encode("utf-8")
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class InMemorySpanExporter:
+    """
+    Keeps exported spans in a list (tests, debugging).
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        return None
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from app.core.logging import get_request_id, get_request_timings
+from app.core.telemetry_middleware import route_template
+from app.core.tracing.tracer import Tracer, reset_current_trace, set_current_trace
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """
+    One trace per request, continued from an incoming W3C `traceparent`.
+
+    The per-request timing spans (`app.core.logging.timed`: rate limit, JWT,
+    DB statements, cache calls, ...) become child spans of the request span.
+    The response carries `traceresponse` so clients can look the trace up.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        tracer: Tracer | None = getattr(request.app.state, "tracer", None)  # type: ignore[attr-defined]
+        if tracer is None:
+            return await call_next(request)
+
+        trace = tracer.start_trace(request.headers.get("traceparent"))
+        timings = get_request_timings()
+        if timings is not None and trace.recording:
+            timings.listener = trace.record
+        token = set_current_trace(trace)
+
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            reset_current_trace(token)
+            if timings is not None:
+                timings.listener = None
+            tracer.end_trace(
+                trace,
+                name=f"{request.method} {route_template(request)}",
+                status_code=status_code,
+                attributes={
+                    "http.method": request.method,
+                    "http.route": route_template(request),
+                    "request_id": get_request_id(),
+                },
+            )
+
+        response.headers["traceresponse"] = trace.traceparent
+        return response
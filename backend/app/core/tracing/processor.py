@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import weakref
+from collections.abc import Sequence
+
+from app.core.tracing.exporters import Span, SpanExporter
+
+log = logging.getLogger("app.tracing")
+
+
+def _restart_in_forked_children(processor: "BatchSpanProcessor") -> None:
+    ref = weakref.WeakMethod(processor._restart_after_fork)
+
+    def _restart() -> None:
+        method = ref()
+        if method is not None:
+            method()
+
+    os.register_at_fork(after_in_child=_restart)
+
+
+class BatchSpanProcessor:
+    """
+    Hands finished traces to a background thread that exports in batches.
+
+    The request path only does a non-blocking `put` on a bounded queue; when
+    the queue is full, spans are dropped and counted rather than slowing
+    requests down.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        schedule_delay_seconds: float = 2.0,
+    ) -> None:
+        self._exporter = exporter
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self._batch_size = max(1, int(max_batch_size))
+        self._delay = max(0.01, float(schedule_delay_seconds))
+        self._dropped = 0
+        self._stopped = threading.Event()
+        self._start_thread()
+        _restart_in_forked_children(self)
+
+    def _start_thread(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def _restart_after_fork(self) -> None:
+        # Threads don't survive fork() (gunicorn preload): the child gets its
+        # own queue and export thread; the parent exports what it had queued.
+        if self._stopped.is_set():
+            return
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._dropped = 0
+        reset = getattr(self._exporter, "_reset_after_fork", None)
+        if reset is not None:
+            reset()
+        self._start_thread()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def on_end(self, spans: Sequence[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self._dropped += 1
+
+    def _export(self, batch: list[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self._exporter.export(batch)
+        except Exception:
+            log.exception("span export failed", extra={"value": len(batch)})
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self._delay)
+            except queue.Empty:
+                self._export(batch)
+                batch = []
+                if self._stopped.is_set():
+                    return
+                continue
+            if isinstance(item, threading.Event):  # flush marker
+                self._export(batch)
+                batch = []
+                item.set()
+                if self._stopped.is_set():
+                    return
+                continue
+            batch.append(item)
+            if len(batch) >= self._batch_size:
+                self._export(batch)
+                batch = []
+
+    def force_flush(self, timeout_seconds: float = 5.0) -> bool:
+        """
+        Export everything queued so far; returns False on timeout.
+        """
+
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout_seconds)
+
+    def shutdown(self, timeout_seconds: float = 5.0) -> None:
+        """
+        Export everything queued so far, then stop the thread and exporter.
+        """
+
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self.force_flush(timeout_seconds)
+        self._thread.join(timeout_seconds)
+        self._exporter.shutdown()
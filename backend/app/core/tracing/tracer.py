@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from app.core.tracing.context import (
+    format_traceparent,
+    new_span_id,
+    new_trace_id,
+    parse_traceparent,
+)
+from app.core.tracing.exporters import Span
+from app.core.tracing.processor import BatchSpanProcessor
+
+
+class Trace:
+    """
+    Spans of one request (a root span plus children recorded under it).
+
+    Children are buffered in memory until the request ends; only then does
+    the tracer decide (tail sampling) whether the trace is exported.
+    """
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "head_sampled",
+        "recording",
+        "start_time_unix_nano",
+        "_children",
+        "_lock",
+    )
+
+    def __init__(
+        self,
+        *,
+        trace_id: str,
+        parent_span_id: str | None,
+        head_sampled: bool,
+        recording: bool,
+    ) -> None:
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_span_id = parent_span_id
+        self.head_sampled = head_sampled
+        self.recording = recording
+        self.start_time_unix_nano = time.time_ns()
+        self._children: list[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.trace_id, self.span_id, self.head_sampled)
+
+    def record(
+        self, name: str, duration_ms: float, attributes: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Add a finished child span that ended now and lasted `duration_ms`.
+        """
+
+        if not self.recording:
+            return
+        end = time.time_ns()
+        span = Span(
+            trace_id=self.trace_id,
+            span_id=new_span_id(),
+            parent_span_id=self.span_id,
+            name=name,
+            start_time_unix_nano=end - int(duration_ms * 1e6),
+            end_time_unix_nano=end,
+            attributes=attributes or {},
+        )
+        with self._lock:
+            self._children.append(span)
+
+    def children(self) -> list[Span]:
+        with self._lock:
+            return list(self._children)
+
+
+_trace_ctx: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+def get_current_trace() -> Trace | None:
+    return _trace_ctx.get()
+
+
+def set_current_trace(trace: Trace | None) -> Any:
+    return _trace_ctx.set(trace)
+
+
+def reset_current_trace(token: Any) -> None:
+    _trace_ctx.reset(token)
+
+
+class Tracer:
+    """
+    Starts/ends request traces and applies sampling.
+
+    - Head sampling: each trace is sampled with probability `sample_rate`.
+      The incoming `traceparent`'s sampled flag decides instead only with
+      `trust_parent_sampled` (callers behind a trusted edge): otherwise any
+      client could force every request it sends through the exporter. The
+      trace id is continued either way.
+    - Tail sampling (optional): traces not head-sampled are still buffered
+      and exported if the request failed (5xx) or took at least
+      `tail_latency_ms`.
+
+    Only sampled traces reach the exporter, so export cost scales with the
+    sample rate plus the (rare) slow/failed requests, not with QPS.
+    """
+
+    def __init__(
+        self,
+        processor: BatchSpanProcessor,
+        *,
+        sample_rate: float = 0.1,
+        tail_sampling: bool = True,
+        tail_latency_ms: float = 500.0,
+        trust_parent_sampled: bool = False,
+    ) -> None:
+        self._processor = processor
+        self._sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self._trust_parent = bool(trust_parent_sampled)
+        self._tail = bool(tail_sampling)
+        self._tail_latency_ms = float(tail_latency_ms)
+
+    @property
+    def processor(self) -> BatchSpanProcessor:
+        return self._processor
+
+    def start_trace(self, traceparent: str | None = None) -> Trace:
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_span_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_span_id = new_trace_id(), None
+        if parent is not None and self._trust_parent:
+            head = parent.sampled
+        else:
+            head = self._sample_rate >= 1.0 or random.random() < self._sample_rate
+        return Trace(
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            head_sampled=head,
+            recording=head or self._tail,
+        )
+
+    def end_trace(
+        self,
+        trace: Trace,
+        *,
+        name: str,
+        status_code: int,
+        attributes: dict[str, Any] | None = None,
+    ) -> bool:
+        """
+        Close the root span; export the trace if sampled. Returns whether it was.
+        """
+
+        if not trace.recording:
+            return False
+        end = time.time_ns()
+        duration_ms = (end - trace.start_time_unix_nano) / 1e6
+        keep = trace.head_sampled or (
+            self._tail and (status_code >= 500 or duration_ms >= self._tail_latency_ms)
+        )
+        if not keep:
+            return False
+
+        root = Span(
+            trace_id=trace.trace_id,
+            span_id=trace.span_id,
+            parent_span_id=trace.parent_span_id,
+            name=name,
+            start_time_unix_nano=trace.start_time_unix_nano,
+            end_time_unix_nano=end,
+            attributes={**(attributes or {}), "http.status_code": status_code},
+            status="error" if status_code >= 500 else "ok",
+        )
+        self._processor.on_end([root, *trace.children()])
+        return True
+
+    def shutdown(self) -> None:
+        self._processor.shutdown()
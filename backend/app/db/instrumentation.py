@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from app.core.logging import record_timing
+from sqlalchemy import Engine, event
+
+_START_KEY = "query_start_times"
+_WHITESPACE = re.compile(r"\s+")
+_MAX_STATEMENT_CHARS = 300
+
+
+def statement_template(statement: str) -> str:
+    # SQLAlchemy statements are already parameterized; collapse whitespace so
+    # the same query always yields the same template.
+    return _WHITESPACE.sub(" ", statement).strip()[:_MAX_STATEMENT_CHARS]
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """
+    Raised (in `DB_QUERY_BUDGET_MODE=raise`) when a request runs more
+    statements than `DB_QUERY_BUDGET`.
+    """
+
+    def __init__(self, path: str, count: int, budget: int) -> None:
+        super().__init__(f"{path} ran {count} queries (budget: {budget})")
+        self.path = path
+        self.count = count
+        self.budget = budget
+
+
+class QueryStats:
+    """
+    Queries executed within one `track_queries()` scope (usually a request).
+    """
+
+    __slots__ = ("count", "total_ms", "slowest_ms", "_slowest", "_lock")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self._slowest: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def slowest_statement(self) -> str | None:
+        return statement_template(self._slowest) if self._slowest else None
+
+    def add(self, statement: str, duration_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            if duration_ms >= self.slowest_ms:
+                # Keep the raw statement; only the slowest is ever normalized.
+                self.slowest_ms = duration_ms
+                self._slowest = statement
+
+
+_query_stats_ctx: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count statements executed on instrumented engines within the block.
+
+    Usable directly in tests, e.g. `with track_queries() as q: ...; assert
+    q.count <= 2`.
+    """
+
+    stats = QueryStats()
+    token = _query_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats_ctx.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    record_timing("db", duration_ms)
+    stats = _query_stats_ctx.get()
+    if stats is not None:
+        stats.add(statement, duration_ms)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Attach cursor-execute listeners that record each statement as a `db` span
+    on the current request's timings and in the active `track_queries()`
+    stats (both no-ops outside a request). Idempotent.
+    """
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import os
+import time
+import weakref
 from functools import lru_cache
 
 from app.core.config import Settings, get_settings
+from app.core.health.breaker import CircuitOpenError, get_breaker
+from app.core.logging import record_timing
+from app.db.instrumentation import instrument_engine
 from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
 
@@ -24,21 +31,47 @@ def create_engine_from_settings(settings: Settings) -> Engine:
         # Needed for SQLite when using FastAPI/TestClient across threads.
         connect_args["check_same_thread"] = False
 
-    return create_engine(
+    engine = create_engine(
         url,
         pool_pre_ping=True,
         connect_args=connect_args,
     )
+    return instrument_engine(engine)
+
+
+# Every engine handed out, so forked workers can drop inherited connections.
+_engines: weakref.WeakSet[Engine] = weakref.WeakSet()
 
 
 @lru_cache
+def _engine_for_url(database_url: str) -> Engine:
+    # Keyed by URL so a changed DATABASE_URL (tests, scripts) gets its own pool
+    # instead of silently reusing one bound to another database.
+    settings = get_settings()
+    if settings.DATABASE_URL != database_url:
+        settings = settings.model_copy(update={"DATABASE_URL": database_url})
+    engine = create_engine_from_settings(settings)
+    _engines.add(engine)
+    return engine
+
+
+def _dispose_pools_after_fork() -> None:
+    # A connection must never be shared across processes: give each forked
+    # worker an empty pool. close=False leaves the parent's sockets alone.
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_pools_after_fork)
+
+
 def _get_engine() -> Engine:
     settings = get_settings()
     if not settings.DATABASE_URL:
         raise RuntimeError(
             "DATABASE_URL is not configured. Set DATABASE_URL in the environment."
         )
-    return create_engine_from_settings(settings)
+    return _engine_for_url(settings.DATABASE_URL)
 
 
 SessionLocal = sessionmaker(
@@ -49,17 +82,41 @@ SessionLocal = sessionmaker(
 )
 
 
+def _is_connectivity_error(exc: BaseException) -> bool:
+    if isinstance(exc, (OperationalError, InterfaceError)):
+        return True
+    return isinstance(exc, DBAPIError) and bool(exc.connection_invalidated)
+
+
 def get_db() -> Session:
     """
     FastAPI dependency that provides a SQLAlchemy session per request.
+
+    Guarded by the `"db"` circuit breaker: while the database is known to be
+    down, this raises `CircuitOpenError` (503) instead of waiting on a connect.
+    The session's lifetime is recorded as the `db_session` timing span.
     """
 
+    breaker = get_breaker("db")
+    if not breaker.allow():
+        raise CircuitOpenError("db", breaker.retry_after())
+
     # Bind lazily so importing app code doesn't require a configured DB.
     db = SessionLocal(bind=_get_engine())
+    start = time.perf_counter()
     try:
         yield db
+    except Exception as exc:
+        if _is_connectivity_error(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    else:
+        breaker.record_success()
     finally:
         db.close()
+        record_timing("db_session", (time.perf_counter() - start) * 1000)
 
 
 def get_engine() -> Engine:
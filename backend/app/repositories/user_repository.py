@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Collection
 
 from app.models.user import User
 from app.repositories.base import BaseRepository
@@ -12,6 +13,16 @@ class UserRepository(BaseRepository):
         stmt: Select[tuple[User]] = select(User).where(User.id == user_id)
         return self.db.scalar(stmt)
 
+    def get_by_ids(self, user_ids: Collection[uuid.UUID]) -> list[User]:
+        """
+        Users with the given ids (one `IN` query); order is unspecified.
+        """
+
+        if not user_ids:
+            return []
+        stmt: Select[tuple[User]] = select(User).where(User.id.in_(user_ids))
+        return list(self.db.scalars(stmt).all())
+
     def get_by_email(self, email: str) -> User | None:
         stmt: Select[tuple[User]] = select(User).where(User.email == email)
         return self.db.scalar(stmt)
@@ -32,3 +32,24 @@ def auth_headers(client: TestClient, test_user) -> dict[str, str]:
     assert res.status_code == 200
     token = res.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def admin_headers(client: TestClient, db_session: Session) -> dict[str, str]:
+    """
+    Create a superuser (role "admin") and return its Authorization headers.
+    """
+    admin = UserRepository(db_session).create(
+        email="admin@example.com",
+        hashed_password=hash_password("admin123"),
+        is_active=True,
+        is_superuser=True,
+    )
+    res = client.post(
+        "/api/v1/auth/login",
+        data={"username": admin.email, "password": "admin123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    token = res.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
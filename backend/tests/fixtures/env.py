@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 from app.core.config import get_settings
+from app.core.health import reset_breakers
 
 
 @pytest.fixture(autouse=True)
@@ -10,7 +11,7 @@ def isolate_test_env(monkeypatch: pytest.MonkeyPatch):
     Keep tests hermetic and consistent:
     - Do not depend on a developer's local `.env`
     - Do not require DB/Redis unless a specific test opts in
-    - Avoid cross-test contamination from cached settings
+    - Avoid cross-test contamination from cached settings and circuit breakers
 
     Tests that need DB/Redis should opt-in (via fixtures or per-test env vars).
     """
@@ -21,5 +22,7 @@ def isolate_test_env(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("REDIS_URL", "")
 
     get_settings.cache_clear()
+    reset_breakers()
     yield
     get_settings.cache_clear()
+    reset_breakers()
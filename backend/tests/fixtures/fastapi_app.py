@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import os
+from collections.abc import Callable
 
 import pytest
 from app.core.config import get_settings
@@ -12,21 +12,40 @@ from sqlalchemy.orm import Session
 
 
 @pytest.fixture()
-def app(db_session: Session, database_url: str) -> FastAPI:
+def make_app(
+    db_session: Session, database_url: str, monkeypatch: pytest.MonkeyPatch
+) -> Callable[..., FastAPI]:
     """
-    FastAPI app wired to the per-test `db_session`.
+    Factory for apps wired to the per-test `db_session`.
+
+    Keyword arguments are settings env vars for this app only, e.g.
+    `make_app(CACHE_ENABLED="true")`; they are undone after the test.
     """
-    # Opt into DB for endpoints (like readiness) that look at settings.DATABASE_URL.
-    os.environ["DATABASE_URL"] = database_url
-    get_settings.cache_clear()
 
-    application = create_app()
+    def _make(**env: str) -> FastAPI:
+        # Opt into DB for endpoints (like readiness) that look at settings.DATABASE_URL.
+        monkeypatch.setenv("DATABASE_URL", database_url)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        get_settings.cache_clear()
+
+        application = create_app()
+
+        def override_get_db():
+            yield db_session
+
+        application.dependency_overrides[get_db] = override_get_db
+        return application
 
-    def override_get_db():
-        yield db_session
+    return _make
 
-    application.dependency_overrides[get_db] = override_get_db
-    return application
+
+@pytest.fixture()
+def app(make_app: Callable[..., FastAPI]) -> FastAPI:
+    """
+    FastAPI app wired to the per-test `db_session`, with default settings.
+    """
+    return make_app()
 
 
 @pytest.fixture()
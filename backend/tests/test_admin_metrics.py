@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.core.config import get_settings
+from app.main import create_app
+from fastapi.testclient import TestClient
+
+
+def test_quantiles_endpoint_reports_latency_per_route(
+    client: TestClient, admin_headers: dict[str, str], monkeypatch
+) -> None:
+    monkeypatch.setenv("TELEMETRY_MODE", "prometheus")
+    get_settings.cache_clear()
+    client.app.state.telemetry = create_app().state.telemetry
+
+    for _ in range(5):
+        client.get("/health")
+
+    res = client.get("/api/v1/admin/metrics/quantiles", headers=admin_headers)
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["relative_accuracy"] == 0.01
+    health = [s for s in body["series"] if s["labels"]["path"] == "/health"]
+    assert health and health[0]["count"] == 5
+    assert set(health[0]["quantiles"]) == {"p50", "p90", "p95", "p99"}
+    assert health[0]["quantiles"]["p99"] > 0
+
+
+def test_quantiles_endpoint_requires_admin(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    res = client.get("/api/v1/admin/metrics/quantiles", headers=auth_headers)
+    assert res.status_code == 403
+
+
+def test_profile_endpoint_returns_collapsed_stacks_and_cools_down(
+    client: TestClient, admin_headers: dict[str, str]
+) -> None:
+    from app.core.profiler import ProfilerGate
+
+    client.app.state.profiler_gate = ProfilerGate(cooldown_seconds=60)
+
+    res = client.get("/api/v1/admin/profile?seconds=0.1&hz=100", headers=admin_headers)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert res.text.strip()
+
+    again = client.get(
+        "/api/v1/admin/profile?seconds=0.1&format=speedscope", headers=admin_headers
+    )
+    assert again.status_code == 429
+    assert again.json()["error"]["code"] == "rate_limited"
+    assert int(again.headers["Retry-After"]) > 0
+
+
+def test_profile_endpoint_is_disabled_by_default(
+    client: TestClient, admin_headers: dict[str, str]
+) -> None:
+    res = client.get("/api/v1/admin/profile?seconds=0.1", headers=admin_headers)
+    assert res.status_code == 404
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from app.core.cache.redis_cache import RedisCache
+from app.core.health import (
+    CircuitOpenError,
+    DependencyMonitor,
+    ReadinessChecker,
+    get_breaker,
+)
+from app.core.rate_limit.redis_backend import RedisRateLimiter
+from app.main import create_app
+from fastapi.testclient import TestClient
+
+
+class _ExplodingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get(self, *_args, **_kwargs):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+
+def test_redis_cache_short_circuits_while_breaker_open() -> None:
+    breaker = get_breaker("redis")
+    cache = RedisCache("redis://127.0.0.1:1/0", breaker=breaker)
+    client = _ExplodingClient()
+    cache._client = client  # noqa: SLF001 (test-only)
+
+    for _ in range(10):
+        assert cache.get("k") is None
+
+    # Threshold (default 3) failures open the circuit; the rest never hit Redis.
+    assert client.calls == 3
+    assert breaker.state == "open"
+
+
+def test_redis_rate_limiter_raises_circuit_open_without_calling_redis() -> None:
+    breaker = get_breaker("redis")
+    for _ in range(3):
+        breaker.record_failure()
+
+    limiter = RedisRateLimiter("redis://127.0.0.1:1/0", breaker=breaker)
+
+    def _boom(**_kwargs):
+        raise AssertionError("should not be called while open")
+
+    limiter._hit = _boom  # noqa: SLF001 (test-only)
+    with pytest.raises(CircuitOpenError):
+        limiter.hit("k", 10, 60)
+
+
+def test_get_db_returns_503_while_db_breaker_open(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+    app = create_app()
+    for _ in range(3):
+        get_breaker("db").record_failure()
+
+    client = TestClient(app)
+    res = client.post(
+        "/api/v1/users", json={"email": "a@example.com", "password": "pass123"}
+    )
+    assert res.status_code == 503
+    assert res.json()["error"]["code"] == "service_unavailable"
+    assert int(res.headers["Retry-After"]) >= 1
+
+
+def test_readiness_rounds_feed_breakers() -> None:
+    breaker = get_breaker("redis")
+    checker = ReadinessChecker(
+        {"redis": lambda: False}, cache_ttl_seconds=0, breakers={"redis": breaker}
+    )
+
+    async def _rounds() -> None:
+        for _ in range(3):
+            await checker.refresh()
+
+    asyncio.run(_rounds())
+    assert breaker.state == "open"
+
+
+def test_ready_reads_monitor_state_instead_of_probing() -> None:
+    calls: list[int] = []
+
+    def _check() -> bool:
+        calls.append(1)
+        return True
+
+    app = create_app()
+    checker = ReadinessChecker({"db": _check}, cache_ttl_seconds=0)
+    app.state.readiness = checker
+    app.state.health_monitor = DependencyMonitor(checker, interval_seconds=60)
+
+    with TestClient(app) as client:
+        for _ in range(5):
+            res = client.get("/api/v1/health/ready")
+            assert res.status_code == 200
+            assert res.json()["checks"] == {"db": "ok"}
+
+    # Only the monitor's first round ran the check.
+    assert len(calls) == 1
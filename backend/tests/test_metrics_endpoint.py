@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.main import create_app
+from fastapi.testclient import TestClient
+
+
+def test_metrics_endpoint_exposes_request_metrics(monkeypatch) -> None:
+    monkeypatch.setenv("TELEMETRY_MODE", "prometheus")
+    client = TestClient(create_app())
+
+    assert client.get("/health").status_code == 200
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_requests_total counter" in res.text
+    assert 'path="/health"' in res.text
+    assert "http_request_duration_ms_bucket{" in res.text
+
+
+def test_unmatched_paths_share_one_series(monkeypatch) -> None:
+    monkeypatch.setenv("TELEMETRY_MODE", "prometheus")
+    client = TestClient(create_app())
+    metrics = client.app.state.telemetry
+
+    def series() -> int:
+        return len(list(metrics.counters())) + len(list(metrics.histograms()))
+
+    assert client.get("/scan/0").status_code == 404
+    before = series()
+    for i in range(1, 20):
+        assert client.get(f"/scan/{i}?q={i}").status_code == 404
+
+    assert series() == before
+    text = client.get("/metrics").text
+    assert "/scan/" not in text
+    assert 'path="<unmatched>",status_code="404"} 20' in text
+
+
+def test_metrics_endpoint_absent_without_prometheus_mode() -> None:
+    client = TestClient(create_app())
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_multiproc_dir_selects_multiprocess_registry(
+    monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setenv("TELEMETRY_MODE", "prometheus")
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", str(tmp_path))
+    client = TestClient(create_app())
+
+    client.get("/health")
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert (
+        'http_requests_total{method="GET",path="/health",status_code="200"} 1'
+        in res.text
+    )
+    assert list(tmp_path.glob("metrics_*.db"))
@@ -64,3 +64,10 @@ def test_cache_enabled_caches_get_user_by_id(
         headers={"Authorization": f"Bearer {token}"},
     )
     assert r2.status_code == 200
+
+    # Cache hits return the stored JSON bytes verbatim (entry: `<etag>\n<json>`).
+    etag, _, body = cache.get_bytes(f"users:{user_id}").partition(b"\n")
+    assert r2.content == body
+    assert r2.headers["etag"] == r1.headers["etag"] == etag.decode()
+    assert r2.headers["content-type"] == "application/json"
+    assert r2.json() == r1.json()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+from app.db.instrumentation import QueryBudgetExceeded, instrument_engine, track_queries
+from app.repositories.user_repository import UserRepository
+from fastapi.testclient import TestClient
+
+
+class _FakeTelemetry:
+    def __init__(self) -> None:
+        self.histograms: list[tuple[str, float, dict[str, str]]] = []
+
+    def incr_counter(
+        self, name: str, value: int = 1, tags: dict[str, str] | None = None
+    ) -> None:
+        return None
+
+    def observe_histogram(
+        self, name: str, value: float, tags: dict[str, str] | None = None
+    ) -> None:
+        self.histograms.append((name, value, tags or {}))
+
+
+def _client(make_app, db_engine, **env: str) -> TestClient:
+    instrument_engine(db_engine)
+    return TestClient(make_app(DB_QUERY_STATS_ENABLED="true", **env))
+
+
+def _token(client: TestClient, email: str) -> str:
+    res = client.post(
+        "/api/v1/auth/login", data={"username": email, "password": "pass123"}
+    )
+    return res.json()["access_token"]
+
+
+def test_query_stats_are_exported_as_histograms(make_app, db_engine, test_user) -> None:
+    client = _client(make_app, db_engine)
+    fake = _FakeTelemetry()
+    client.app.state.telemetry = fake
+
+    token = _token(client, test_user.email)
+    res = client.get(
+        f"/api/v1/users/{test_user.id}", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert res.status_code == 200
+    observed = {
+        name: value
+        for name, value, tags in fake.histograms
+        if tags.get("path") == "/api/v1/users/{user_id}"
+    }
+    assert observed["db_queries_per_request"] >= 2  # current user + lookup
+    assert "db_time_per_request_ms" in observed
+
+
+def test_query_budget_raise_mode_fails_the_request(
+    make_app, db_engine, test_user
+) -> None:
+    client = _client(
+        make_app, db_engine, DB_QUERY_BUDGET="1", DB_QUERY_BUDGET_MODE="raise"
+    )
+    token = _token(client, test_user.email)
+
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        client.get(
+            f"/api/v1/users/{test_user.id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert exc_info.value.path == "/api/v1/users/{user_id}"
+    assert exc_info.value.count > 1
+
+
+def test_track_queries_records_slowest_statement_template(
+    db_engine, db_session, test_user
+) -> None:
+    instrument_engine(db_engine)
+
+    with track_queries() as stats:
+        UserRepository(db_session).get_by_email(test_user.email)
+        UserRepository(db_session).get_by_id(test_user.id)
+
+    assert stats.count == 2
+    assert stats.total_ms >= stats.slowest_ms > 0
+    assert stats.slowest_statement.startswith("SELECT users.")
+    assert "\n" not in stats.slowest_statement
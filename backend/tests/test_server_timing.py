@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from app.core.logging import reset_request_timings, start_request_timings, timed
+from app.core.middleware import server_timing_header
+from app.db.instrumentation import instrument_engine
+from fastapi.testclient import TestClient
+
+
+def _parse(header: str) -> dict[str, float]:
+    spans = {}
+    for part in header.split(","):
+        name, *params = part.strip().split(";")
+        dur = next(p for p in params if p.startswith("dur="))
+        spans[name] = float(dur[4:])
+    return spans
+
+
+def test_server_timing_header_breaks_down_request_phases(
+    make_app, db_engine, test_user
+) -> None:
+    instrument_engine(db_engine)
+    client = TestClient(make_app(SERVER_TIMING_ENABLED="true"))
+
+    login = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user.email, "password": "pass123"},
+    )
+    token = login.json()["access_token"]
+
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append  # type: ignore[method-assign]
+    logging.getLogger("app.request").addHandler(handler)
+    try:
+        res = client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+    finally:
+        logging.getLogger("app.request").removeHandler(handler)
+
+    assert res.status_code == 200
+    spans = _parse(res.headers["Server-Timing"])
+    assert {"jwt", "db", "total"} <= set(spans)
+    assert spans["total"] >= spans["db"]
+
+    [record] = [r for r in records if r.getMessage() == "request complete"]
+    assert set(record.timings) >= {"jwt", "db"}
+
+
+def test_server_timing_header_is_opt_in(client) -> None:
+    res = client.get("/health")
+    assert "server-timing" not in res.headers
+
+
+@pytest.mark.unit
+def test_timed_aggregates_spans_by_name() -> None:
+    with timed("outside"):
+        pass  # no active request: no-op
+
+    timings, token = start_request_timings()
+    try:
+        with timed("db"):
+            pass
+        with timed("db"):
+            pass
+        with timed("cache"):
+            pass
+    finally:
+        reset_request_timings(token)
+
+    header = server_timing_header(timings, 5.0)
+    assert header.startswith("db;dur=")
+    assert 'desc="2x"' in header
+    assert header.endswith("total;dur=5.00")
+    assert "outside" not in header
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from app.core.health import wait_for_dependencies, warm_db_pool
+from app.db import get_engine
+
+
+def test_wait_for_dependencies_retries_with_backoff_and_gives_up() -> None:
+    attempts: list[float] = []
+
+    def _flaky() -> bool:
+        attempts.append(time.monotonic())
+        return len(attempts) >= 3
+
+    def _down() -> bool:
+        raise ConnectionError("refused")
+
+    result = asyncio.run(
+        wait_for_dependencies(
+            {"db": _flaky, "redis": _down},
+            timeout_seconds=0.5,
+            initial_backoff_seconds=0.01,
+        )
+    )
+
+    assert result == {"db": True, "redis": False}
+    assert len(attempts) == 3
+
+
+def test_wait_for_dependencies_does_not_block_the_event_loop() -> None:
+    def _slow_down() -> bool:
+        time.sleep(0.05)
+        return False
+
+    async def _main() -> int:
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(_ticker())
+        await wait_for_dependencies(
+            {"db": _slow_down}, timeout_seconds=0.3, initial_backoff_seconds=0.01
+        )
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(_main()) >= 10
+
+
+def test_warm_db_pool_returns_connections_to_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    assert warm_db_pool(2) == 2
+
+    pool = get_engine().pool
+    assert pool.checkedout() == 0
+    assert pool.checkedin() == 2
+
+
+def test_importing_the_app_leaves_optional_dependencies_unloaded(tmp_path) -> None:
+    # A fresh interpreter: this test session has long since imported them.
+    # Stub modules shadow the real ones so an eager import is caught whether
+    # or not the package (e.g. the `perf` extra) is installed here.
+    lazy = ["redis", "passlib", "psycopg", "brotli", "zstandard"]
+    for name in lazy:
+        (tmp_path / f"{name}.py").write_text("")
+    code = (
+        "import json, sys, app.main; "
+        f"print(json.dumps([m for m in {lazy!r} if m in sys.modules]))"
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(tmp_path), os.environ.get("PYTHONPATH")])
+        ),
+        "APP_ENV": "test",
+        "LOG_JSON": "true",
+        "LOG_ASYNC": "false",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    lines = proc.stdout.splitlines()
+    assert json.loads(lines[-1]) == []
+
+    created = next(json.loads(line) for line in lines if '"app created"' in line)
+    assert created["duration_ms"] > 0
+    assert {"logging", "fastapi", "routers"} <= set(created["timings"])
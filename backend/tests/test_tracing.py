@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+
+from app.db.instrumentation import instrument_engine
+from fastapi.testclient import TestClient
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def test_request_spans_are_exported_to_ndjson(
+    make_app, tmp_path, db_engine, test_user
+) -> None:
+    path = tmp_path / "traces.ndjson"
+    instrument_engine(db_engine)
+    app = make_app(
+        TRACING_ENABLED="true",
+        TRACING_NDJSON_PATH=str(path),
+        TRACING_SAMPLE_RATE="0",
+        TRACING_TAIL_SAMPLING="false",
+        # The test client stands in for a trusted upstream that sampled.
+        TRACING_TRUST_PARENT_SAMPLED="true",
+    )
+    client = TestClient(app)
+
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user.email, "password": "pass123"},
+    ).json()["access_token"]
+
+    res = client.get(
+        "/api/v1/users/me",
+        headers={
+            "Authorization": f"Bearer {token}",
+            "traceparent": f"00-{_TRACE_ID}-00f067aa0ba902b7-01",
+        },
+    )
+    assert res.status_code == 200
+    assert res.headers["traceresponse"].startswith(f"00-{_TRACE_ID}-")
+
+    app.state.tracer.shutdown()
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+
+    # The unsampled login request was not exported; only the traced one.
+    assert {s["trace_id"] for s in spans} == {_TRACE_ID}
+    [root] = [s for s in spans if s["name"] == "GET /api/v1/users/me"]
+    assert root["parent_span_id"] == "00f067aa0ba902b7"
+    children = {s["name"] for s in spans if s["parent_span_id"] == root["span_id"]}
+    assert {"jwt", "db"} <= children
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import app.core.cache.in_memory as in_memory
+import pytest
+from app.api.v1.routes.users import _CACHE_MAX_TTL_SECONDS
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture()
+def etag_client(make_app, db_engine, test_user):
+    client = TestClient(
+        make_app(CACHE_ENABLED="true", CACHE_DEFAULT_TTL_SECONDS="3600")
+    )
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user.email, "password": "pass123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ).json()["access_token"]
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", _count)
+    try:
+        yield client, statements, {"Authorization": f"Bearer {token}"}
+    finally:
+        event.remove(db_engine, "before_cursor_execute", _count)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/users/me", "/api/v1/users/{id}"])
+def test_user_etag_and_conditional_get(etag_client, test_user, path: str) -> None:
+    client, statements, auth = etag_client
+    url = path.format(id=test_user.id)
+
+    r1 = client.get(url, headers=auth)
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert r1.headers["cache-control"] == "private, no-cache"
+
+    # Revalidation is answered from the cache: no SQL at all.
+    statements.clear()
+    r2 = client.get(url, headers={**auth, "If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    assert r2.headers["etag"] == etag
+    assert statements == []
+
+    # Weak comparison and lists per RFC 9110.
+    r3 = client.get(url, headers={**auth, "If-None-Match": f'"other", W/{etag}'})
+    assert r3.status_code == 304
+
+    r4 = client.get(url, headers={**auth, "If-None-Match": '"stale"'})
+    assert r4.status_code == 200
+    assert r4.headers["etag"] == etag
+
+
+def test_user_etag_changes_when_user_changes(
+    etag_client, test_user, db_session
+) -> None:
+    client, _statements, auth = etag_client
+    etag = client.get("/api/v1/users/me", headers=auth).headers["etag"]
+
+    test_user.is_superuser = True
+    db_session.commit()
+    client.app.state.cache.delete(f"users:{test_user.id}")
+
+    r = client.get("/api/v1/users/me", headers={**auth, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()["is_superuser"] is True
+
+
+def test_deactivated_user_gets_304s_only_until_the_cache_ttl(
+    etag_client, test_user, db_session, monkeypatch
+) -> None:
+    # The cache-only 304 path skips the DB, so a deactivation made without
+    # invalidating the cache is seen late, but never later than the TTL cap
+    # (CACHE_DEFAULT_TTL_SECONDS=3600 here).
+    client, _statements, auth = etag_client
+    etag = client.get("/api/v1/users/me", headers=auth).headers["etag"]
+    revalidate = {**auth, "If-None-Match": etag}
+
+    test_user.is_active = False
+    db_session.commit()
+
+    assert _CACHE_MAX_TTL_SECONDS <= 60
+    now = time.time()
+    clock = SimpleNamespace(time=lambda: now + _CACHE_MAX_TTL_SECONDS - 1)
+    monkeypatch.setattr(in_memory, "time", clock)
+    assert client.get("/api/v1/users/me", headers=revalidate).status_code == 304
+
+    clock.time = lambda: now + _CACHE_MAX_TTL_SECONDS + 1
+    assert client.get("/api/v1/users/me", headers=revalidate).status_code == 401
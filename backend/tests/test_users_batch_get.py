@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import uuid
+
+from app.auth.password import hash_password
+from app.core.cache.in_memory import InMemoryCache
+from app.core.config import get_settings
+from app.repositories.user_repository import UserRepository
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def _make_users(db_session: Session, n: int) -> list[str]:
+    repo = UserRepository(db_session)
+    return [
+        str(
+            repo.create(
+                email=f"u{i}@example.com", hashed_password=hash_password("x")
+            ).id
+        )
+        for i in range(n)
+    ]
+
+
+def test_batch_get_returns_users_in_request_order(
+    client: TestClient, db_session: Session, admin_headers: dict[str, str]
+) -> None:
+    ids = _make_users(db_session, 3)
+    missing = str(uuid.uuid4())
+    requested = [ids[2], missing, ids[0], ids[2], ids[1]]
+
+    res = client.post(
+        "/api/v1/users:batchGet", json={"ids": requested}, headers=admin_headers
+    )
+
+    assert res.status_code == 200
+    body = res.json()
+    assert [u["id"] for u in body["users"]] == [ids[2], ids[0], ids[1]]
+    assert body["users"][0]["email"] == "u2@example.com"
+    assert body["not_found"] == [missing]
+
+
+def test_batch_get_keeps_permission_rules(
+    client: TestClient, test_user, auth_headers: dict[str, str], db_session: Session
+) -> None:
+    (other,) = _make_users(db_session, 1)
+
+    own = client.post(
+        "/api/v1/users:batchGet",
+        json={"ids": [str(test_user.id)]},
+        headers=auth_headers,
+    )
+    assert own.status_code == 200
+    assert own.json()["users"][0]["id"] == str(test_user.id)
+
+    res = client.post(
+        "/api/v1/users:batchGet",
+        json={"ids": [str(test_user.id), other]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 403
+
+    assert (
+        client.post("/api/v1/users:batchGet", json={"ids": [other]}).status_code == 401
+    )
+
+
+def test_batch_get_validates_id_count(
+    client: TestClient, admin_headers: dict[str, str], monkeypatch
+) -> None:
+    monkeypatch.setenv("USERS_BATCH_GET_MAX_IDS", "2")
+    get_settings.cache_clear()
+    url = "/api/v1/users:batchGet"
+
+    too_many = [str(uuid.uuid4()) for _ in range(3)]
+    assert (
+        client.post(url, json={"ids": too_many}, headers=admin_headers).status_code
+        == 422
+    )
+    assert client.post(url, json={"ids": []}, headers=admin_headers).status_code == 422
+    # Duplicates count towards the limit too.
+    repeated = [str(uuid.uuid4())] * 3
+    assert (
+        client.post(url, json={"ids": repeated}, headers=admin_headers).status_code
+        == 422
+    )
+
+
+def test_batch_get_uses_one_query_for_misses_then_the_cache(
+    client: TestClient,
+    db_session: Session,
+    admin_headers: dict[str, str],
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    get_settings.cache_clear()
+    client.app.state.cache = InMemoryCache()
+    ids = _make_users(db_session, 5)
+
+    statements: list[str] = []
+    engine = db_session.get_bind()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        first = client.post(
+            "/api/v1/users:batchGet", json={"ids": ids}, headers=admin_headers
+        )
+        # One query loads the admin (auth), one `IN` query loads all five users.
+        user_queries = [s for s in statements if "FROM users" in s]
+        assert len(user_queries) == 2
+
+        statements.clear()
+        second = client.post(
+            "/api/v1/users:batchGet", json={"ids": ids}, headers=admin_headers
+        )
+        # All hits: only the auth lookup remains.
+        assert len([s for s in statements if "FROM users" in s]) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert [u["id"] for u in second.json()["users"]] == ids
+
+    # Entries are shared with `GET /users/{id}`.
+    single = client.get(f"/api/v1/users/{ids[0]}", headers=admin_headers)
+    assert single.json() == first.json()["users"][0]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+import time
 
 from app.core.config import get_settings
+from app.core.health import ReadinessChecker
 from app.main import create_app
 from fastapi.testclient import TestClient
 
@@ -58,3 +60,46 @@ def test_v1_health_ready_returns_503_when_redis_unreachable(tmp_path) -> None:
     assert body["status"] == "error"
     assert body["checks"]["db"] == "ok"
     assert body["checks"]["redis"] == "error"
+
+
+def test_v1_health_ready_memoizes_results_between_probes() -> None:
+    calls: list[str] = []
+
+    def _check() -> bool:
+        calls.append("db")
+        return True
+
+    app = create_app()
+    app.state.readiness = ReadinessChecker({"db": _check}, cache_ttl_seconds=60)
+    client = TestClient(app)
+
+    for _ in range(3):
+        res = client.get("/api/v1/health/ready")
+        assert res.status_code == 200
+        assert res.json()["checks"] == {"db": "ok"}
+
+    assert calls == ["db"]
+
+
+def test_v1_health_ready_times_out_slow_checks() -> None:
+    def _slow() -> bool:
+        time.sleep(1.0)
+        return True
+
+    app = create_app()
+    app.state.readiness = ReadinessChecker(
+        {"db": lambda: True, "redis": _slow},
+        timeout_seconds=0.05,
+        cache_ttl_seconds=0,
+    )
+    app.state.health_monitor = None
+    # Keep one event loop for the request so the abandoned worker thread does
+    # not get joined before we measure.
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        res = client.get("/api/v1/health/ready")
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.9
+    assert res.status_code == 503
+    assert res.json()["checks"] == {"db": "ok", "redis": "error"}
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+
+import pytest
+from app.core.config import Settings
+from app.core.logging import (
+    _AsyncQueueHandler,
+    configure_logging,
+    get_dropped_log_records,
+    reset_request_id,
+    set_request_id,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers, root.level = handlers, level
+
+
+@pytest.mark.unit
+def test_async_logging_writes_json_from_listener_thread(capsys) -> None:
+    configure_logging(Settings(LOG_ASYNC=True, LOG_BATCH_SIZE=8))
+    token = set_request_id("rid-123")
+    try:
+        logging.getLogger("app.test").info("hello %s", "world")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("app.test").exception("failed")
+    finally:
+        reset_request_id(token)
+        shutdown_logging()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    by_message = {line["message"]: line for line in lines}
+    assert by_message["hello world"]["request_id"] == "rid-123"
+    assert "ValueError: boom" in by_message["failed"]["exc_info"]
+    assert get_dropped_log_records() == 0
+
+
+@pytest.mark.unit
+def test_logging_after_shutdown_is_written_synchronously(capsys) -> None:
+    configure_logging(
+        Settings(LOG_ASYNC=True, LOG_QUEUE_SIZE=1, LOG_QUEUE_FULL_POLICY="block")
+    )
+    shutdown_logging()
+
+    assert not any(
+        isinstance(h, _AsyncQueueHandler) for h in logging.getLogger().handlers
+    )
+    # More than a queue's worth: with the queue still attached, "block" would hang.
+    token = set_request_id("rid-late")
+    try:
+        for i in range(3):
+            logging.getLogger("app.test").warning("after shutdown %d", i)
+    finally:
+        reset_request_id(token)
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    late = [line for line in lines if line["message"].startswith("after shutdown")]
+    assert [line["message"] for line in late] == [
+        f"after shutdown {i}" for i in range(3)
+    ]
+    assert late[0]["request_id"] == "rid-late"
+
+
+@pytest.mark.unit
+def test_async_queue_handler_drops_and_counts_when_full() -> None:
+    handler = _AsyncQueueHandler(queue.Queue(maxsize=1), policy="drop")
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "m", None, None)
+
+    for _ in range(3):
+        handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from app.core.health.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+def test_breaker_opens_after_threshold_and_rejects_instantly() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "redis", failure_threshold=2, reset_timeout_seconds=5, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(5.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+@pytest.mark.unit
+def test_breaker_half_open_allows_single_trial_then_closes_on_success() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "db", failure_threshold=1, reset_timeout_seconds=5, clock=clock
+    )
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # Only one trial in flight.
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+@pytest.mark.unit
+def test_breaker_half_open_failure_reopens() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "db", failure_threshold=3, reset_timeout_seconds=5, clock=clock
+    )
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now += 6
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from app.core.compression import CompressionMiddleware, negotiate
+from app.core.config import Settings
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+BIG = b'{"items":[' + b",".join(b'{"id":%d}' % i for i in range(400)) + b"]}"
+
+
+def _client(**overrides) -> tuple[TestClient, CompressionMiddleware]:
+    app = FastAPI()
+
+    @app.get("/big")
+    def big() -> Response:
+        return Response(BIG, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/other")
+    def other() -> Response:
+        # Same (version-style) tag as /big, different bytes.
+        return Response(
+            BIG.replace(b"id", b"ID"),
+            media_type="application/json",
+            headers={"ETag": '"v1"'},
+        )
+
+    @app.get("/small")
+    def small() -> Response:
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/png")
+    def png() -> Response:
+        return Response(BIG, media_type="image/png")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(
+            iter([BIG[:2000], BIG[2000:]]), media_type="application/json"
+        )
+
+    settings = Settings(COMPRESSION_ALGORITHMS=["gzip"], **overrides)
+    app.add_middleware(CompressionMiddleware, settings=settings)
+    client = TestClient(app)
+    # Build the middleware stack to get at the instance.
+    client.get("/small")
+    layer = app.middleware_stack
+    while not isinstance(layer, CompressionMiddleware):
+        layer = layer.app
+    return client, layer
+
+
+@pytest.mark.unit
+def test_negotiate_uses_q_values_then_server_order() -> None:
+    available = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, br", available) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert negotiate("br;q=0, *", available) == "zstd"
+    assert negotiate("identity", available) is None
+    assert negotiate("gzip;q=0", available) is None
+    assert negotiate(None, available) is None
+
+
+@pytest.mark.unit
+def test_gzip_compresses_large_bodies_and_weakens_etag() -> None:
+    client, _mw = _client()
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.headers["etag"] == 'W/"v1"'
+    assert int(r.headers["content-length"]) < len(BIG)
+    assert r.content == BIG  # the client decodes gzip transparently
+
+    identity = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == '"v1"'
+
+
+@pytest.mark.unit
+def test_small_binary_and_streaming_responses_pass_through() -> None:
+    client, _mw = _client()
+    for path in ("/small", "/png", "/stream"):
+        r = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers, path
+    assert client.get("/stream").content == BIG
+
+
+@pytest.mark.unit
+def test_streaming_compression_is_opt_in() -> None:
+    client, _mw = _client(COMPRESSION_STREAMING=True)
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+    assert r.headers["content-encoding"] == "gzip"
+    assert "content-length" not in r.headers
+    assert gzip.decompress(raw) == BIG
+
+
+@pytest.mark.unit
+def test_strong_etag_bodies_are_compressed_once(monkeypatch) -> None:
+    client, mw = _client()
+    calls = []
+    codec = mw.codecs["gzip"]
+    original = codec.compress
+    monkeypatch.setattr(
+        codec, "compress", lambda data: calls.append(1) or original(data)
+    )
+
+    first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert first.content == second.content == BIG
+    assert len(calls) == 1
+    assert len(mw.body_cache) == 1
+    assert zlib.decompress(mw.body_cache.get("GET /big", '"v1"', "gzip"), 31) == BIG
+
+    # Equal ETags on different resources never share an entry.
+    other = client.get("/other", headers={"Accept-Encoding": "gzip"})
+    assert other.content == BIG.replace(b"id", b"ID")
+    assert len(mw.body_cache) == 2
+
+
+@pytest.mark.unit
+def test_malformed_content_length_passes_through() -> None:
+    async def app(scope, receive, send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", b"not-a-number"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": BIG})
+
+    mw = CompressionMiddleware(app, settings=Settings(COMPRESSION_ALGORITHMS=["gzip"]))
+    sent = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(mw(scope, None, send))
+
+    assert (b"content-encoding", b"gzip") not in sent[0]["headers"]
+    assert sent[1]["body"] == BIG
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from app.core.metrics import DDSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.unit
+def test_quantiles_are_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3.0, 1.0) for _ in range(20000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = _exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+@pytest.mark.unit
+def test_merge_equals_single_sketch_and_memory_is_bounded() -> None:
+    rng = random.Random(3)
+    values = [rng.uniform(0.0, 1e9) for _ in range(5000)]
+    whole, a, b = DDSketch(), DDSketch(), DDSketch()
+    for i, v in enumerate(values):
+        whole.add(v)
+        (a if i % 2 else b).add(v)
+
+    a.merge(b)
+
+    assert a.bins == whole.bins
+    assert a.count == whole.count == 5000
+    assert len(whole.bins) <= whole.max_bins
+    assert DDSketch().quantile(0.5) is None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from app.core.errors import (
+    ErrorBody,
+    ErrorResponse,
+    error_body_renderer,
+    error_response,
+    render_error_body,
+)
+from fastapi.responses import JSONResponse
+
+
+def _reference(**kwargs) -> bytes:
+    # The previous implementation: models -> model_dump() -> JSONResponse.
+    return JSONResponse(
+        content=ErrorResponse(error=ErrorBody(**kwargs)).model_dump()
+    ).body
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"code": "not_found", "message": "not found", "request_id": "abc-123"},
+        {"code": "unauthorized", "message": "HTTP error", "request_id": None},
+        {"code": "conflict", "message": 'say "hi" \\ ünïcode ✓', "request_id": 'r"\n'},
+        {
+            "code": "validation_error",
+            "message": "Validation error",
+            "request_id": "r",
+            "details": [
+                {"loc": ["body", "email"], "msg": "Field required", "type": "missing"}
+            ],
+        },
+    ],
+)
+def test_fast_rendering_matches_model_based_bytes(kwargs) -> None:
+    assert render_error_body(**kwargs) == _reference(**kwargs)
+
+
+@pytest.mark.unit
+def test_envelope_key_order_and_response_metadata() -> None:
+    res = error_response(
+        code="forbidden",
+        message="Not enough permissions",
+        request_id="rid",
+        status_code=403,
+        headers={"X-Test": "1"},
+    )
+
+    assert res.status_code == 403
+    assert res.headers["content-type"] == "application/json"
+    assert res.headers["x-test"] == "1"
+    body = json.loads(res.body)
+    assert list(body) == ["error"]
+    assert list(body["error"]) == ["code", "message", "request_id", "details"]
+
+
+@pytest.mark.unit
+def test_precomputed_renderer_only_varies_request_id() -> None:
+    render = error_body_renderer("rate_limited", "Too many requests")
+
+    for rid in ("rid-1", None, 'we"ird'):
+        assert render(rid) == _reference(
+            code="rate_limited", message="Too many requests", request_id=rid
+        )
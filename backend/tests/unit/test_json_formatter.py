@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+
+import pytest
+from app.core.logging import JsonFormatter
+
+
+def _record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "app.telemetry", logging.INFO, __file__, 1, "metric.%s", ("counter",), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+def test_json_formatter_emits_core_and_telemetry_fields() -> None:
+    record = _record(
+        request_id="rid-1",
+        metric="http_requests_total",
+        value=1,
+        tags={"method": "GET"},
+    )
+    line = json.loads(JsonFormatter().format(record))
+
+    assert line["message"] == "metric.counter"
+    assert line["level"] == "INFO"
+    assert line["logger"] == "app.telemetry"
+    assert line["request_id"] == "rid-1"
+    assert line["metric"] == "http_requests_total"
+    assert line["value"] == 1
+    assert line["tags"] == {"method": "GET"}
+    assert datetime.fromisoformat(line["timestamp"]).timestamp() == pytest.approx(
+        record.created, abs=1e-5
+    )
+
+
+@pytest.mark.unit
+def test_json_formatter_respects_whitelist_and_static_fields() -> None:
+    formatter = JsonFormatter(extra_fields=("path",), static_fields={"service": "api"})
+    line = json.loads(formatter.format(_record(path="/x", secret="nope")))
+
+    assert line["path"] == "/x"
+    assert line["service"] == "api"
+    assert "secret" not in line
+    assert line["request_id"] is None
+
+
+@pytest.mark.unit
+def test_json_formatter_serializes_unknown_types_as_strings() -> None:
+    line = json.loads(JsonFormatter(extra_fields=("value",)).format(_record(value={1})))
+    assert line["value"] == "{1}"
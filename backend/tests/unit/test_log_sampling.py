@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from app.core.logging import LogSamplingFilter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(
+    name: str = "app.exceptions",
+    level: int = logging.WARNING,
+    **extra,
+) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "http exception", None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+def test_status_rate_wins_over_logger_rate_and_errors_always_pass() -> None:
+    sampler = LogSamplingFilter(
+        logger_rates={"app": 1.0, "app.exceptions": 1.0},
+        status_rates={"4xx": 0.0},
+        rand=lambda: 0.5,
+    )
+
+    assert not sampler.filter(_record(status_code=401))
+    assert sampler.filter(_record(status_code=500))
+    assert sampler.filter(_record(level=logging.ERROR, status_code=401))
+    assert sampler.filter(_record(status_code=200))
+
+
+@pytest.mark.unit
+def test_logger_rate_uses_longest_prefix_and_slow_requests_pass() -> None:
+    sampler = LogSamplingFilter(
+        logger_rates={"app": 1.0, "app.request": 0.1},
+        slow_request_ms=500,
+        rand=lambda: 0.5,
+    )
+
+    assert not sampler.filter(_record("app.request", logging.INFO, duration_ms=3))
+    assert sampler.filter(_record("app.request", logging.INFO, duration_ms=900))
+    assert sampler.filter(_record("app.requests", logging.INFO, duration_ms=3))
+
+
+@pytest.mark.unit
+def test_duplicate_suppression_reports_suppressed_count() -> None:
+    clock = _Clock()
+    sampler = LogSamplingFilter(dedup_burst=2, dedup_rate_per_second=1.0, clock=clock)
+
+    passed = [sampler.filter(_record(status_code=401, path="/x")) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    # A different path is a different message.
+    assert sampler.filter(_record(status_code=401, path="/y"))
+
+    clock.now += 1.0
+    record = _record(status_code=401, path="/x")
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+
+
+@pytest.mark.unit
+def test_storm_followed_by_silence_still_reports_its_count() -> None:
+    clock = _Clock()
+    summaries: list[logging.LogRecord] = []
+    sampler = LogSamplingFilter(
+        dedup_burst=1, dedup_rate_per_second=1.0, clock=clock, sink=summaries.append
+    )
+
+    passed = [sampler.filter(_record(status_code=401, path="/x")) for _ in range(5)]
+    assert passed == [True, False, False, False, False]
+
+    # Still inside the refill interval: nothing to report yet.
+    clock.now += 0.5
+    assert sampler.filter(_record(status_code=404, path="/other"))
+    assert summaries == []
+
+    # The storm's key has been quiet for a refill interval: any later record
+    # (here an unrelated one) triggers the summary.
+    clock.now += 1.0
+    assert sampler.filter(_record(status_code=404, path="/another"))
+    [summary] = summaries
+    assert summary.suppressed == 4
+    assert summary.path == "/x" and summary.status_code == 401
+    assert sampler.filter(summary)  # summaries are never sampled themselves
+
+    # Reported once; nothing pending afterwards.
+    clock.now += 5.0
+    sampler.filter(_record(status_code=404, path="/again"))
+    sampler.flush_suppressed()
+    assert len(summaries) == 1
+
+
+@pytest.mark.unit
+def test_pending_suppressed_counts_are_flushed_on_demand() -> None:
+    summaries: list[logging.LogRecord] = []
+    sampler = LogSamplingFilter(
+        dedup_burst=1, dedup_rate_per_second=0.0, clock=_Clock(), sink=summaries.append
+    )
+    for _ in range(3):
+        sampler.filter(_record(status_code=401, path="/x"))
+
+    sampler.flush_suppressed()  # e.g. shutdown_logging()
+    assert [s.suppressed for s in summaries] == [2]
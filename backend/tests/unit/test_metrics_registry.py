@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from app.core.metrics import OVERFLOW_LABELS, InMemoryMetrics
+
+
+@pytest.mark.unit
+def test_histogram_renders_cumulative_buckets_sum_and_count() -> None:
+    metrics = InMemoryMetrics(buckets=(10.0, 100.0))
+    tags = {"path": "/x", "method": "GET"}
+    for value in (5.0, 10.0, 50.0, 500.0):
+        metrics.observe_histogram("latency_ms", value, tags=tags)
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE latency_ms histogram" in text
+    assert 'latency_ms_bucket{method="GET",path="/x",le="10.0"} 2' in text
+    assert 'latency_ms_bucket{method="GET",path="/x",le="100.0"} 3' in text
+    assert 'latency_ms_bucket{method="GET",path="/x",le="+Inf"} 4' in text
+    assert 'latency_ms_sum{method="GET",path="/x"} 565' in text
+    assert 'latency_ms_count{method="GET",path="/x"} 4' in text
+
+
+@pytest.mark.unit
+def test_counter_series_are_keyed_by_tags_and_escaped() -> None:
+    metrics = InMemoryMetrics()
+    metrics.incr_counter("hits_total", tags={"b": "2", "a": "1"})
+    metrics.incr_counter("hits_total", 2, tags={"a": "1", "b": "2"})
+    metrics.incr_counter("hits_total", tags={"a": 'q"uote'})
+
+    text = metrics.render_prometheus()
+
+    assert text.count("# TYPE hits_total counter") == 1
+    assert 'hits_total{a="1",b="2"} 3' in text
+    assert 'hits_total{a="q\\"uote"} 1' in text
+
+
+@pytest.mark.unit
+def test_concurrent_increments_are_not_lost() -> None:
+    metrics = InMemoryMetrics()
+
+    def _work() -> None:
+        for _ in range(1000):
+            metrics.incr_counter("n_total", tags={"k": "v"})
+            metrics.observe_histogram("h_ms", 1.0, tags={"k": "v"})
+
+    threads = [threading.Thread(target=_work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = metrics.render_prometheus()
+    assert 'n_total{k="v"} 8000' in text
+    assert 'h_ms_count{k="v"} 8000' in text
+
+
+@pytest.mark.unit
+def test_series_beyond_the_cap_fold_into_overflow() -> None:
+    metrics = InMemoryMetrics(max_series=3)
+    for i in range(10):
+        metrics.incr_counter("hits_total", tags={"path": f"/p{i}"})
+    for i in range(10):
+        metrics.observe_histogram("latency_ms", 1.0, tags={"path": f"/p{i}"})
+
+    counters = {key: value for _, key, value in metrics.counters()}
+    histograms = [key for _, key, _, _, _ in metrics.histograms()]
+    assert counters == {
+        (("path", "/p0"),): 1,
+        (("path", "/p1"),): 1,
+        (("path", "/p2"),): 1,
+        OVERFLOW_LABELS: 7,
+    }
+    # The counters used up the budget; histograms only get the overflow series.
+    assert histograms == [OVERFLOW_LABELS]
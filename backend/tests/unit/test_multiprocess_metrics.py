@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import multiprocessing
+
+import pytest
+from app.core.metrics import MultiprocessMetrics
+from app.core.metrics.multiprocess import ARCHIVE_FILE
+
+
+def _observe_in_child(metrics: MultiprocessMetrics) -> None:
+    metrics.incr_counter("jobs_total", 2, tags={"q": "a"})
+    metrics.observe_histogram("job_ms", 50.0, tags={"q": "a"})
+
+
+@pytest.mark.unit
+def test_workers_are_merged_at_scrape_time_and_dead_files_folded(tmp_path) -> None:
+    metrics = MultiprocessMetrics(tmp_path, buckets=(10.0, 100.0))
+    metrics.incr_counter("jobs_total", tags={"q": "a"})
+    metrics.observe_histogram("job_ms", 5.0, tags={"q": "a"})
+
+    ctx = multiprocessing.get_context("fork")
+    for _ in range(2):
+        child = ctx.Process(target=_observe_in_child, args=(metrics,))
+        child.start()
+        child.join()
+        assert child.exitcode == 0
+
+    # Parent + two (now exited) forked workers each wrote their own file.
+    assert len(list(tmp_path.glob("metrics_[0-9]*.db"))) == 3
+
+    text = metrics.render_prometheus()
+
+    assert 'jobs_total{q="a"} 5' in text
+    assert 'job_ms_bucket{q="a",le="10.0"} 1' in text
+    assert 'job_ms_bucket{q="a",le="100.0"} 3' in text
+    assert 'job_ms_count{q="a"} 3' in text
+    assert 'job_ms_sum{q="a"} 105' in text
+
+    # Dead workers were folded into the archive; totals are unchanged.
+    assert len(list(tmp_path.glob("metrics_[0-9]*.db"))) == 1
+    assert (tmp_path / ARCHIVE_FILE).exists()
+    assert metrics.render_prometheus() == text
+
+    [(name, _labels, sketch)] = list(metrics.sketches())
+    assert name == "job_ms" and sketch.count == 3
+    assert sketch.quantile(1.0) == pytest.approx(50.0, rel=0.01)
+
+
+@pytest.mark.unit
+def test_file_grows_past_initial_size(tmp_path) -> None:
+    metrics = MultiprocessMetrics(tmp_path)
+    for i in range(3000):
+        metrics.incr_counter("wide_total", tags={"i": str(i)})
+
+    text = metrics.render_prometheus()
+    assert 'wide_total{i="0"} 1' in text
+    assert 'wide_total{i="2999"} 1' in text
+
+
+@pytest.mark.unit
+def test_series_beyond_the_cap_fold_into_overflow(tmp_path) -> None:
+    metrics = MultiprocessMetrics(tmp_path, max_series=2)
+    for i in range(5):
+        metrics.incr_counter("hits_total", tags={"path": f"/p{i}"})
+
+    text = metrics.render_prometheus()
+    assert 'hits_total{path="/p1"} 1' in text
+    assert "/p2" not in text
+    assert 'hits_total{overflow="true"} 3' in text
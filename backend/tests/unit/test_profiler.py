@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from app.core.profiler import ProfilerGate, sample_threads
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.unit
+def test_sampler_captures_busy_thread_in_both_formats() -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        profile = sample_threads(0.2, 200)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profile.sample_count > 0
+    collapsed = profile.collapsed()
+    busy = [line for line in collapsed.splitlines() if line.startswith("busy-worker;")]
+    assert busy and any("_spin (" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+
+    doc = profile.speedscope(name="t")
+    [thread] = [p for p in doc["profiles"] if p["name"] == "busy-worker"]
+    assert thread["type"] == "sampled"
+    assert len(thread["samples"]) == len(thread["weights"])
+    frame_names = {f["name"] for f in doc["shared"]["frames"]}
+    assert "_spin" in frame_names
+
+
+@pytest.mark.unit
+def test_gate_allows_one_session_then_cools_down() -> None:
+    gate = ProfilerGate(cooldown_seconds=30)
+
+    assert gate.try_acquire() is None
+    assert gate.try_acquire() is not None  # busy
+    gate.release()
+    wait = gate.try_acquire()
+    assert wait is not None and 0 < wait <= 30
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from app.api.v1.schemas.users import UserPublic
+from app.core.config import Settings
+from app.core.responses import ModelResponse, default_response_class, orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+
+@pytest.mark.unit
+def test_default_response_class_selection() -> None:
+    assert (
+        default_response_class(Settings(RESPONSE_JSON_RENDERER="json")) is JSONResponse
+    )
+    expected = ORJSONResponse if orjson is not None else JSONResponse
+    assert default_response_class(Settings(RESPONSE_JSON_RENDERER="auto")) is expected
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_orjson_renderer_accepts_non_string_keys() -> None:
+    # Plain `dict[int, ...]` bodies work with stdlib json; they must keep
+    # working when orjson is the default renderer.
+    response_class = default_response_class(Settings(RESPONSE_JSON_RENDERER="orjson"))
+    assert response_class({1: "a"}).body == JSONResponse({1: "a"}).body
+
+
+@pytest.mark.unit
+def test_fast_renderers_match_json_response_bytes() -> None:
+    user = UserPublic(id=uuid.uuid4(), email="ü@example.com", is_active=True)
+    reference = JSONResponse(user.model_dump(mode="json")).body
+
+    assert ModelResponse(user).body == reference
+    if orjson is not None:
+        assert ORJSONResponse(user.model_dump(mode="json")).body == reference
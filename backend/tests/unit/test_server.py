@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import multiprocessing
+
+import app.core.logging as app_logging
+import pytest
+from app.core.config import Settings
+from app.core.health.breaker import CLOSED, OPEN, get_breaker
+from app.core.logging import configure_logging, shutdown_logging
+from app.core.server import cgroup_cpu_quota, gunicorn_options, worker_count
+from app.db.session import _engine_for_url
+
+
+@pytest.mark.unit
+def test_cgroup_quota_v2_and_v1(tmp_path) -> None:
+    v2 = tmp_path / "v2"
+    v2.mkdir()
+    (v2 / "cpu.max").write_text("250000 100000\n")
+    assert cgroup_cpu_quota(v2) == 2.5
+    (v2 / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(v2) is None
+
+    v1 = tmp_path / "v1" / "cpu,cpuacct"
+    v1.mkdir(parents=True)
+    (v1 / "cpu.cfs_quota_us").write_text("150000\n")
+    (v1 / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(tmp_path / "v1") == 1.5
+    (v1 / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cgroup_cpu_quota(tmp_path / "v1") is None
+
+    assert cgroup_cpu_quota(tmp_path / "missing") is None
+
+
+@pytest.mark.unit
+def test_worker_count_follows_cpu_quota() -> None:
+    assert worker_count(Settings(), cpus=0.5) == 1
+    assert worker_count(Settings(), cpus=1.5) == 2
+    assert worker_count(Settings(SERVER_WORKERS_PER_CPU=2), cpus=4) == 8
+    assert worker_count(Settings(SERVER_MAX_WORKERS=4), cpus=32) == 4
+    assert worker_count(Settings(SERVER_WORKERS=3), cpus=32) == 3
+
+
+@pytest.mark.unit
+def test_gunicorn_options_only_jitter_when_recycling() -> None:
+    off = gunicorn_options(Settings(), cpus=2)
+    assert off["workers"] == 2
+    assert off["max_requests"] == 0 and off["max_requests_jitter"] == 0
+
+    on = gunicorn_options(
+        Settings(SERVER_MAX_REQUESTS=5000, SERVER_MAX_REQUESTS_JITTER=500), cpus=2
+    )
+    assert on["max_requests"] == 5000 and on["max_requests_jitter"] == 500
+    assert on["worker_class"] == "app.core.gunicorn_conf.UvicornWorker"
+
+
+def _check_forked_worker(parent_listener, engine) -> None:
+    # Async logging: a fresh listener thread serving a fresh queue.
+    listener = app_logging._listener
+    assert listener is not None and listener is not parent_listener
+    assert listener._thread is not None and listener._thread.is_alive()
+    assert app_logging._queue_handler.queue is listener.queue
+
+    # Breakers are reset in place (components keep their instance).
+    assert get_breaker("db").state == CLOSED
+
+    # Inherited DB connections were dropped; the pool starts empty.
+    assert engine.pool.checkedin() == 0
+
+
+@pytest.mark.unit
+def test_process_state_is_rebuilt_in_forked_workers(tmp_path) -> None:
+    configure_logging(Settings(LOG_ASYNC=True))
+    breaker = get_breaker("db")
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    engine = _engine_for_url(f"sqlite:///{tmp_path / 'fork.db'}")
+    with engine.connect():
+        pass
+    assert engine.pool.checkedin() == 1
+
+    try:
+        ctx = multiprocessing.get_context("fork")
+        child = ctx.Process(
+            target=_check_forked_worker, args=(app_logging._listener, engine)
+        )
+        child.start()
+        child.join()
+        assert child.exitcode == 0
+
+        # The parent keeps its own state.
+        assert breaker.state == OPEN
+        assert engine.pool.checkedin() == 1
+    finally:
+        engine.dispose()
+        shutdown_logging()
+
+
+@pytest.mark.unit
+def test_worker_recycles_on_started_requests() -> None:
+    pytest.importorskip("gunicorn")
+    from app.core.gunicorn_conf import _RecyclingServer
+    from uvicorn import Config
+
+    async def app(scope, receive, send) -> None:
+        return None
+
+    server = _RecyclingServer(Config(app), max_requests=2)
+    counted = server.counting(app)
+
+    async def _main() -> list[bool]:
+        await counted({"type": "lifespan"}, None, None)
+        await counted({"type": "http"}, None, None)
+        before = await server.on_tick(1)
+        await counted({"type": "http"}, None, None)
+        return [before, await server.on_tick(2)]
+
+    assert asyncio.run(_main()) == [False, True]
+
+
+@pytest.mark.unit
+def test_worker_overrides_match_upstream() -> None:
+    # `UvicornWorker._serve` and `Server.on_tick` are uvicorn internals; fail
+    # loudly on an upgrade that changes what the overrides rely on.
+    pytest.importorskip("gunicorn")
+    from app.core.gunicorn_conf import UvicornWorker, _RecyclingServer
+    from uvicorn import Config, Server
+    from uvicorn.workers import UvicornWorker as UpstreamWorker
+
+    for ours, upstream in (
+        (UvicornWorker._serve, UpstreamWorker._serve),
+        (_RecyclingServer.on_tick, Server.on_tick),
+    ):
+        assert inspect.iscoroutinefunction(upstream)
+        assert inspect.signature(ours) == inspect.signature(upstream)
+
+    serve = inspect.getsource(UpstreamWorker._serve)
+    for used in ("self.wsgi", "_install_sigquit_handler", "self.sockets"):
+        assert used in serve
+    assert "limit_max_requests" in inspect.signature(Config).parameters
+    assert hasattr(Server(Config(app=None)), "started")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+from app.core.tracing import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    Tracer,
+    format_traceparent,
+    parse_traceparent,
+)
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+_SPAN_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.unit
+def test_traceparent_round_trip_and_rejects_invalid_values() -> None:
+    ctx = parse_traceparent(f"00-{_TRACE_ID}-{_SPAN_ID}-01")
+    assert ctx is not None
+    assert (ctx.trace_id, ctx.span_id, ctx.sampled) == (_TRACE_ID, _SPAN_ID, True)
+    assert (
+        format_traceparent(_TRACE_ID, _SPAN_ID, True) == f"00-{_TRACE_ID}-{_SPAN_ID}-01"
+    )
+
+    assert parse_traceparent(f"00-{_TRACE_ID}-{_SPAN_ID}-00").sampled is False
+    for bad in (
+        None,
+        "",
+        "garbage",
+        f"ff-{_TRACE_ID}-{_SPAN_ID}-01",
+        f"00-{'0' * 32}-{_SPAN_ID}-01",
+        f"00-{_TRACE_ID}-{'0' * 16}-01",
+        f"00-{_TRACE_ID}-{_SPAN_ID}-01-extra",
+    ):
+        assert parse_traceparent(bad) is None
+
+
+def _tracer(**kwargs) -> tuple[Tracer, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    processor = BatchSpanProcessor(
+        exporter, max_batch_size=2, schedule_delay_seconds=0.05
+    )
+    return Tracer(processor, **kwargs), exporter
+
+
+@pytest.mark.unit
+def test_head_sampled_trace_exports_root_and_children() -> None:
+    tracer, exporter = _tracer(
+        sample_rate=0.0, tail_sampling=False, trust_parent_sampled=True
+    )
+
+    trace = tracer.start_trace(f"00-{_TRACE_ID}-{_SPAN_ID}-01")
+    trace.record("db", 1.5)
+    trace.record("cache", 0.2)
+    assert tracer.end_trace(trace, name="GET /x", status_code=200)
+    tracer.shutdown()
+
+    root, *children = exporter.spans
+    assert root.trace_id == _TRACE_ID and root.parent_span_id == _SPAN_ID
+    assert root.attributes["http.status_code"] == 200
+    assert [c.name for c in children] == ["db", "cache"]
+    assert all(c.parent_span_id == root.span_id for c in children)
+
+
+@pytest.mark.unit
+def test_untrusted_parent_cannot_force_sampling() -> None:
+    tracer, exporter = _tracer(sample_rate=0.0, tail_sampling=False)
+
+    traces = [tracer.start_trace(f"00-{_TRACE_ID}-{_SPAN_ID}-01") for _ in range(50)]
+
+    # The trace id is continued, but the sample rate still decides.
+    assert all(t.trace_id == _TRACE_ID for t in traces)
+    assert not any(t.head_sampled or t.recording for t in traces)
+    assert not any(tracer.end_trace(t, name="GET /x", status_code=200) for t in traces)
+    assert traces[0].traceparent.endswith("-00")
+    tracer.shutdown()
+    assert exporter.spans == []
+
+
+@pytest.mark.unit
+def test_tail_sampling_keeps_only_errors_and_slow_requests() -> None:
+    tracer, exporter = _tracer(sample_rate=0.0, tail_sampling=True, tail_latency_ms=1e9)
+
+    ok = tracer.start_trace()
+    assert ok.recording and not ok.head_sampled
+    assert not tracer.end_trace(ok, name="GET /ok", status_code=200)
+
+    failed = tracer.start_trace()
+    assert tracer.end_trace(failed, name="GET /boom", status_code=503)
+
+    unsampled_parent = tracer.start_trace(f"00-{_TRACE_ID}-{_SPAN_ID}-00")
+    assert not tracer.end_trace(unsampled_parent, name="GET /ok", status_code=200)
+
+    tracer.processor.force_flush()
+    assert [s.name for s in exporter.spans] == ["GET /boom"]
+    assert exporter.spans[0].status == "error"
+    tracer.shutdown()
+
+
+@pytest.mark.unit
+def test_without_tail_sampling_unsampled_traces_record_nothing() -> None:
+    tracer, _exporter = _tracer(sample_rate=0.0, tail_sampling=False)
+
+    trace = tracer.start_trace()
+    trace.record("db", 1.0)
+
+    assert not trace.recording
+    assert trace.children() == []
+    tracer.shutdown()
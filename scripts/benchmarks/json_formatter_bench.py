@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# Allow running from a checkout without `pip install -e .`.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.core.logging import JsonFormatter, orjson  # noqa: E402
+
+
+class LegacyJsonFormatter(logging.Formatter):
+    """
+    The formatter as it was before the fast path (kept here for comparison).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key in ("path", "method", "status_code", "duration_ms"):
+            if hasattr(record, key):
+                payload[key] = getattr(record, key)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _records() -> list[logging.LogRecord]:
+    request = logging.LogRecord(
+        "app.request", logging.INFO, __file__, 1, "request complete", None, None
+    )
+    request.__dict__.update(
+        request_id="4f1c2a9e-8d1b-4a51-9a55-9f5b1f0f2d11",
+        method="GET",
+        path="/api/v1/users/me",
+        status_code=200,
+        duration_ms=3.21,
+    )
+    metric = logging.LogRecord(
+        "app.telemetry", logging.INFO, __file__, 1, "metric.histogram", None, None
+    )
+    metric.__dict__.update(
+        request_id="4f1c2a9e-8d1b-4a51-9a55-9f5b1f0f2d11",
+        metric="http_request_duration_ms",
+        value=3.21,
+        tags={"method": "GET", "path": "/api/v1/users/me", "status_code": "200"},
+    )
+    return [request, metric]
+
+
+def _bench(formatter: logging.Formatter, records: list[logging.LogRecord], n: int):
+    for rec in records:
+        formatter.format(rec)  # warm caches
+    start = time.perf_counter()
+    for i in range(n):
+        formatter.format(records[i & 1])
+    elapsed = time.perf_counter() - start
+    return n / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare JsonFormatter records/sec with the legacy formatter."
+    )
+    parser.add_argument("-n", type=int, default=200_000, help="Records per run.")
+    parser.add_argument("--json", action="store_true", help="Print JSON results.")
+    args = parser.parse_args()
+
+    records = _records()
+    legacy = _bench(LegacyJsonFormatter(), records, args.n)
+    current = _bench(JsonFormatter(), records, args.n)
+
+    result = {
+        "records": args.n,
+        "encoder": "orjson" if orjson is not None else "json",
+        "legacy_records_per_sec": round(legacy),
+        "current_records_per_sec": round(current),
+        "speedup": round(current / legacy, 2),
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:>24}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+
+PASSWORD = "bench-pass-123"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One request shape. `env` only applies in-process (a running server keeps
+    its own configuration).
+    """
+
+    name: str
+    method: str
+    path: str  # `{user_id}` is filled in from the seeded user
+    auth: bool = False
+    form: bool = False
+    expected: frozenset[int] = frozenset({200})
+    env: dict[str, str] = field(default_factory=dict)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("live", "GET", "/api/v1/health/live"),
+        Scenario("login", "POST", "/api/v1/auth/login", form=True),
+        Scenario("me", "GET", "/api/v1/users/me", auth=True),
+        Scenario(
+            "get_user_cached",
+            "GET",
+            "/api/v1/users/{user_id}",
+            auth=True,
+            env={"CACHE_ENABLED": "true"},
+        ),
+        Scenario(
+            "get_user_uncached",
+            "GET",
+            "/api/v1/users/{user_id}",
+            auth=True,
+            env={"CACHE_ENABLED": "false"},
+        ),
+        # Mostly 429s: measures the cost of rejecting a flood.
+        Scenario(
+            "rate_limited",
+            "GET",
+            "/api/v1/users/me",
+            auth=True,
+            expected=frozenset({200, 429}),
+            env={
+                "RATE_LIMIT_ENABLED": "true",
+                "RATE_LIMIT_REQUESTS": "10",
+                "RATE_LIMIT_WINDOW_SECONDS": "60",
+            },
+        ),
+    )
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list (0 when empty).
+    """
+
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def parse_mix(spec: str) -> list[tuple[Scenario, float]]:
+    """
+    `"me=3,get_user_cached=1"` -> weighted scenarios (weight defaults to 1).
+    """
+
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in SCENARIOS:
+            known = ", ".join(SCENARIOS)
+            raise SystemExit(f"unknown scenario {name!r}; known: {known}")
+        mix.append((SCENARIOS[name], float(weight or 1)))
+    return mix
+
+
+# --- Targets ---
+
+
+def _inprocess_env(args: argparse.Namespace, overrides: dict[str, str]) -> None:
+    # Stand-ins: SQLite for Postgres, and (with APP_ENV=test and no REDIS_URL)
+    # the in-memory cache/rate limiter for Redis. Pass real URLs to use them.
+    os.environ.update(
+        {
+            "APP_ENV": "test",
+            "JWT_SECRET_KEY": "bench-secret",
+            "DATABASE_URL": args.database_url,
+            "REDIS_URL": args.redis_url,
+            "LOG_LEVEL": args.log_level,
+            "CACHE_ENABLED": "false",
+            "RATE_LIMIT_ENABLED": "false",
+            "HEALTH_MONITOR_ENABLED": "false",
+        }
+    )
+    os.environ.update(overrides)
+
+
+@asynccontextmanager
+async def inprocess_client(args: argparse.Namespace, overrides: dict[str, str]):
+    """
+    Fresh app (settings re-read) driven through `httpx.ASGITransport`.
+    """
+
+    _inprocess_env(args, overrides)
+    sys.path.insert(0, str(BACKEND))
+    import app.models  # noqa: F401  (register tables)
+    from app.core.config import get_settings
+    from app.db import Base
+    from app.db.session import get_engine
+    from app.main import create_app
+
+    get_settings.cache_clear()
+    Base.metadata.create_all(bind=get_engine())
+    application = create_app()
+    # App logs go to stdout; keep stdout for the report.
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(sys.stderr)
+    transport = httpx.ASGITransport(app=application)
+    async with application.router.lifespan_context(application):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            yield client
+
+
+@asynccontextmanager
+async def remote_client(args: argparse.Namespace, _overrides: dict[str, str]):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        yield client
+
+
+async def seed(client: httpx.AsyncClient) -> dict[str, str]:
+    """
+    Create a throwaway user and log in; returns request context.
+    """
+
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    res = await client.post(
+        "/api/v1/users", json={"email": email, "password": PASSWORD}
+    )
+    res.raise_for_status()
+    user_id = res.json()["id"]
+    res = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": PASSWORD}
+    )
+    res.raise_for_status()
+    return {
+        "email": email,
+        "user_id": user_id,
+        "token": res.json()["access_token"],
+    }
+
+
+# --- Load loop ---
+
+
+@dataclass
+class Result:
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+    errors: int = 0
+    unexpected: int = 0
+    elapsed_s: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        done = len(lat)
+        return {
+            "name": self.name,
+            "requests": done,
+            "errors": self.errors,
+            "unexpected_status": self.unexpected,
+            "status_counts": {str(k): v for k, v in sorted(self.statuses.items())},
+            "duration_s": round(self.elapsed_s, 3),
+            "rps": round(done / self.elapsed_s, 1) if self.elapsed_s else 0.0,
+            "latency_ms": {
+                "mean": round(sum(lat) / done, 3) if done else 0.0,
+                "p50": round(percentile(lat, 0.50), 3),
+                "p95": round(percentile(lat, 0.95), 3),
+                "p99": round(percentile(lat, 0.99), 3),
+                "max": round(lat[-1], 3) if lat else 0.0,
+            },
+        }
+
+
+def _build_request(scenario: Scenario, ctx: dict[str, str]) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "method": scenario.method,
+        "url": scenario.path.format(user_id=ctx["user_id"]),
+    }
+    if scenario.auth:
+        kwargs["headers"] = {"Authorization": f"Bearer {ctx['token']}"}
+    if scenario.form:
+        kwargs["data"] = {"username": ctx["email"], "password": PASSWORD}
+    return kwargs
+
+
+async def run_phase(
+    client: httpx.AsyncClient,
+    name: str,
+    mix: list[tuple[Scenario, float]],
+    ctx: dict[str, str],
+    *,
+    concurrency: int,
+    duration_s: float,
+    max_requests: int,
+    warmup_s: float,
+) -> Result:
+    scenarios = [s for s, _ in mix]
+    weights = [w for _, w in mix]
+    requests = {s.name: _build_request(s, ctx) for s in scenarios}
+    rng = random.Random(0)
+
+    async def _worker(
+        result: Result, deadline: float, budget: list[int] | None
+    ) -> None:
+        # `budget` is shared by the workers of one run; None means no limit.
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+            scenario = rng.choices(scenarios, weights)[0]
+            started = time.perf_counter()
+            try:
+                res = await client.request(**requests[scenario.name])
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            result.statuses[res.status_code] += 1
+            if res.status_code not in scenario.expected:
+                result.unexpected += 1
+
+    async def _run(seconds: float, limit: int) -> Result:
+        result = Result(name)
+        started = time.perf_counter()
+        deadline = started + seconds if seconds > 0 else float("inf")
+        budget = [limit] if limit else None
+        await asyncio.gather(
+            *(_worker(result, deadline, budget) for _ in range(max(1, concurrency)))
+        )
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    if warmup_s > 0:
+        await _run(warmup_s, 0)
+    return await _run(duration_s if not max_requests else 0, max_requests)
+
+
+async def bench(args: argparse.Namespace) -> dict[str, Any]:
+    if args.mix:
+        phases = [("mix", parse_mix(args.mix))]
+    else:
+        names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+        phases = [(n, parse_mix(n)) for n in names]
+
+    open_client = remote_client if args.base_url else inprocess_client
+    results = []
+    for name, mix in phases:
+        overrides: dict[str, str] = {}
+        for scenario, _w in mix:
+            overrides.update(scenario.env)
+        async with open_client(args, overrides) as client:
+            ctx = await seed(client)
+            result = await run_phase(
+                client,
+                name,
+                mix,
+                ctx,
+                concurrency=args.concurrency,
+                duration_s=args.duration,
+                max_requests=args.requests,
+                warmup_s=args.warmup,
+            )
+        results.append(result.summary())
+        if not args.json:
+            s = results[-1]
+            lat = s["latency_ms"]
+            print(
+                f"{name:>18}: {s['rps']:>9} rps  p50 {lat['p50']:.2f}ms  "
+                f"p95 {lat['p95']:.2f}ms  p99 {lat['p99']:.2f}ms  "
+                f"unexpected {s['unexpected_status']}  errors {s['errors']}",
+                file=sys.stderr,
+            )
+
+    return {
+        "target": args.base_url or "in-process",
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "scenarios": results,
+    }
+
+
+def check_gates(report: dict[str, Any], args: argparse.Namespace) -> list[str]:
+    failures = []
+    for s in report["scenarios"]:
+        if args.max_p99_ms and s["latency_ms"]["p99"] > args.max_p99_ms:
+            failures.append(f"{s['name']}: p99 {s['latency_ms']['p99']}ms")
+        if args.min_rps and s["rps"] < args.min_rps:
+            failures.append(f"{s['name']}: {s['rps']} rps")
+        if s["errors"] or s["unexpected_status"]:
+            failures.append(
+                f"{s['name']}: {s['errors']} errors, "
+                f"{s['unexpected_status']} unexpected statuses"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="HTTP load generator: RPS and latency percentiles per scenario."
+    )
+    parser.add_argument(
+        "--base-url",
+        default="",
+        help="Benchmark a running server (default: the app in-process via httpx).",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default="",
+        help=f"Comma-separated, run one by one (default: {','.join(SCENARIOS)}).",
+    )
+    parser.add_argument(
+        "--mix", default="", help="One weighted phase, e.g. 'me=3,get_user_cached=1'."
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds.")
+    parser.add_argument(
+        "-n", "--requests", type=int, default=0, help="Stop after N (overrides -d)."
+    )
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds.")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument(
+        "--database-url",
+        default="",
+        help="In-process DB (default: temporary SQLite standing in for Postgres).",
+    )
+    parser.add_argument(
+        "--redis-url",
+        default="",
+        help="In-process Redis (default: in-memory cache/rate limiter stand-ins).",
+    )
+    parser.add_argument("--log-level", default="WARNING", help="In-process LOG_LEVEL.")
+    parser.add_argument("--out", default="", help="Also write the JSON report here.")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report.")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="Gate (ms).")
+    parser.add_argument("--min-rps", type=float, default=0.0, help="Gate (req/s).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.base_url and not args.database_url:
+            args.database_url = f"sqlite:///{Path(tmp) / 'bench.sqlite'}"
+        report = asyncio.run(bench(args))
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    if args.json:
+        print(text)
+
+    failures = check_gates(report, args)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Allow running from a checkout without `pip install -e .`.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+
+# name -> setup(); setup returns the zero-argument operation to time.
+Setup = Callable[[], Callable[[], object]]
+BENCHMARKS: dict[str, Setup] = {}
+
+CARDINALITY = 100_000
+
+
+def bench(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+# --- Auth ---
+
+
+@bench("jwt.create_access_token")
+def _jwt_create():
+    from app.auth.jwt import create_access_token
+
+    sub = str(uuid.uuid4())
+    return lambda: create_access_token(sub, additional_claims={"roles": []})
+
+
+@bench("jwt.decode_token")
+def _jwt_decode():
+    from app.auth.jwt import create_access_token, decode_token
+
+    token = create_access_token(str(uuid.uuid4()))
+    return lambda: decode_token(token)
+
+
+# --- Logging / errors / serialization ---
+
+
+@bench("logging.JsonFormatter.format")
+def _json_formatter():
+    from app.core.logging import JsonFormatter
+
+    record = logging.LogRecord(
+        "app.request", logging.INFO, __file__, 1, "request complete", None, None
+    )
+    record.__dict__.update(
+        request_id="4f1c2a9e-8d1b-4a51-9a55-9f5b1f0f2d11",
+        method="GET",
+        path="/api/v1/users/me",
+        status_code=200,
+        duration_ms=3.21,
+        timings={"jwt": 0.05, "db": 1.2},
+    )
+    formatter = JsonFormatter()
+    return lambda: formatter.format(record)
+
+
+@bench("errors.error_response")
+def _error_response():
+    from app.core.errors import error_response
+
+    return lambda: error_response(
+        code="not_found",
+        message="Not Found",
+        request_id="4f1c2a9e-8d1b-4a51-9a55-9f5b1f0f2d11",
+        status_code=404,
+    )
+
+
+def _user():
+    from app.api.v1.schemas.users import UserPublic
+
+    return UserPublic(id=uuid.uuid4(), email="user@example.com", is_active=True)
+
+
+@bench("users.UserPublic.to_json")
+def _user_to_json():
+    from app.core.responses import ModelResponse
+
+    user = _user()
+    return lambda: ModelResponse(user)
+
+
+@bench("users.UserPublic.jsonable_encoder")
+def _user_jsonable():
+    # FastAPI's default path for `response_model` routes, for comparison.
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    user = _user()
+    return lambda: JSONResponse(jsonable_encoder(user))
+
+
+# --- Cache / rate limiter at high cardinality ---
+
+
+@bench("cache.InMemoryCache.get_hit")
+def _cache_hit():
+    from app.core.cache.in_memory import InMemoryCache
+
+    cache = InMemoryCache()
+    keys = [f"users:{i}" for i in range(CARDINALITY)]
+    for key in keys:
+        cache.set(key, '{"id":1}', ttl_seconds=3600)
+    it = iter(range(1 << 62))
+    return lambda: cache.get_bytes(keys[next(it) % CARDINALITY])
+
+
+@bench("cache.InMemoryCache.set")
+def _cache_set():
+    from app.core.cache.in_memory import InMemoryCache
+
+    cache = InMemoryCache()
+    keys = [f"users:{i}" for i in range(CARDINALITY)]
+    it = iter(range(1 << 62))
+    return lambda: cache.set(keys[next(it) % CARDINALITY], '{"id":1}', ttl_seconds=60)
+
+
+@bench("rate_limit.InMemoryRateLimiter.hit")
+def _rate_limit_hit():
+    from app.core.rate_limit.in_memory import InMemoryRateLimiter
+
+    limiter = InMemoryRateLimiter()
+    keys = [f"rl:ip:10.0.{i // 256}.{i % 256}" for i in range(CARDINALITY)]
+    it = iter(range(1 << 62))
+    return lambda: limiter.hit(keys[next(it) % CARDINALITY], 60, 60)
+
+
+# --- Middleware overhead (one middleware around a trivial route) ---
+
+
+class _DropExporter:
+    def export(self, spans) -> None:
+        return None
+
+    def shutdown(self) -> None:
+        return None
+
+
+def _middleware_app(middleware: str | None):
+    from app.core.compression import CompressionMiddleware
+    from app.core.config import Settings
+    from app.core.metrics import InMemoryMetrics
+    from app.core.middleware import RequestIdMiddleware, RequestLoggingMiddleware
+    from app.core.query_stats_middleware import QueryStatsMiddleware
+    from app.core.rate_limit.in_memory import InMemoryRateLimiter
+    from app.core.rate_limit.middleware import RateLimitMiddleware
+    from app.core.telemetry_middleware import TelemetryMiddleware
+    from app.core.tracing import BatchSpanProcessor, Tracer
+    from app.core.tracing.middleware import TracingMiddleware
+    from fastapi import FastAPI
+    from fastapi.responses import Response
+
+    settings = Settings(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_REQUESTS=10**9,
+        COMPRESSION_MIN_SIZE=0,
+    )
+    app = FastAPI()
+    app.state.telemetry = InMemoryMetrics()
+    app.state.rate_limiter = InMemoryRateLimiter()
+    app.state.tracer = Tracer(BatchSpanProcessor(_DropExporter()), sample_rate=0.1)
+
+    body = b'{"id":"4f1c2a9e-8d1b-4a51-9a55-9f5b1f0f2d11","ok":true}' * 4
+
+    # Sync like the real routes (so the threadpool hop is part of the baseline).
+    @app.get("/api/v1/bench")
+    def endpoint() -> Response:
+        return Response(body, media_type="application/json")
+
+    classes = {
+        "request_id": RequestIdMiddleware,
+        "request_logging": RequestLoggingMiddleware,
+        "telemetry": TelemetryMiddleware,
+        "rate_limit": RateLimitMiddleware,
+        "query_stats": QueryStatsMiddleware,
+        "tracing": TracingMiddleware,
+        "compression": CompressionMiddleware,
+    }
+    if middleware is not None:
+        cls = classes[middleware]
+        if cls is TracingMiddleware:
+            app.add_middleware(cls)
+        else:
+            app.add_middleware(cls, settings=settings)
+    return app
+
+
+def _asgi_call(app) -> Callable[[], object]:
+    loop = asyncio.new_event_loop()
+    template = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/bench",
+        "raw_path": b"/api/v1/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"gzip")],
+        "client": ("10.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    return lambda: loop.run_until_complete(app(dict(template), receive, send))
+
+
+for _name in (
+    None,
+    "request_id",
+    "request_logging",
+    "telemetry",
+    "rate_limit",
+    "query_stats",
+    "tracing",
+    "compression",
+):
+    bench(f"middleware.{_name or 'none'}")(
+        lambda _name=_name: _asgi_call(_middleware_app(_name))
+    )
+
+
+# --- Runner ---
+
+
+def measure(op: Callable[[], object], *, rounds: int, min_time: float) -> dict:
+    """
+    Calibrate iterations so each round takes ~`min_time / rounds`, then time
+    `rounds` rounds. Reports ns per operation.
+    """
+
+    op()  # warm up (imports, caches)
+    per_round = max(min_time / max(1, rounds), 1e-3)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - started
+        if elapsed >= per_round or number >= 1 << 24:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(per_round / elapsed) + 1))
+
+    samples = []
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        samples.append((time.perf_counter() - started) / number * 1e9)
+    return {
+        "median_ns": round(statistics.median(samples), 1),
+        "min_ns": round(min(samples), 1),
+        "max_ns": round(max(samples), 1),
+        "rounds": len(samples),
+        "iterations": number,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    # Request logs are measured by `logging.JsonFormatter.format`; keep them
+    # out of the middleware numbers (and off the terminal).
+    logging.getLogger().handlers = [logging.NullHandler()]
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if args.filter and not any(f in name for f in args.filter):
+            continue
+        results[name] = measure(setup(), rounds=args.rounds, min_time=args.min_time)
+        if not args.json:
+            r = results[name]
+            print(f"{name:<40} {r['median_ns'] / 1000:>10.2f} us/op", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "benchmarks": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], *, threshold: float
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Median-vs-median per benchmark; slower than `1 + threshold` is a regression.
+    """
+
+    rows, regressions = [], []
+    for name, cur in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            rows.append({"name": name, "status": "new"})
+            continue
+        ratio = cur["median_ns"] / base["median_ns"] if base["median_ns"] else 1.0
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "regression"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = "improved"
+        rows.append(
+            {
+                "name": name,
+                "baseline_ns": base["median_ns"],
+                "current_ns": cur["median_ns"],
+                "change_pct": round((ratio - 1) * 100, 1),
+                "status": status,
+            }
+        )
+    return rows, regressions
+
+
+def _print_comparison(rows: list[dict[str, Any]]) -> None:
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['name']:<40} {'(new)':>30}", file=sys.stderr)
+            continue
+        print(
+            f"{row['name']:<40} {row['baseline_ns'] / 1000:>9.2f} -> "
+            f"{row['current_ns'] / 1000:>9.2f} us  {row['change_pct']:>+7.1f}%  "
+            f"{row['status']}",
+            file=sys.stderr,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks for per-request hot paths, with baselines."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run benchmarks.")
+    p_run.add_argument(
+        "-k", dest="filter", action="append", help="Name substring (repeatable)."
+    )
+    p_run.add_argument("--rounds", type=int, default=5)
+    p_run.add_argument(
+        "--min-time", type=float, default=0.5, help="Seconds per benchmark."
+    )
+    p_run.add_argument("--save", default="", help="Write results (a baseline) here.")
+    p_run.add_argument("--compare", default="", help="Baseline JSON to compare to.")
+    p_run.add_argument("--json", action="store_true", help="Print results JSON.")
+
+    p_cmp = sub.add_parser("compare", help="Compare two saved result files.")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+
+    for p in (p_run, p_cmp):
+        p.add_argument(
+            "--threshold",
+            type=float,
+            default=0.10,
+            help="Allowed slowdown (0.10 = 10%%) before failing.",
+        )
+    p_run.add_argument("--list", action="store_true", help="List names and exit.")
+    args = parser.parse_args()
+
+    if args.command == "run" and args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    if args.command == "compare":
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    else:
+        current = run(args)
+        if args.save:
+            Path(args.save).write_text(json.dumps(current, indent=2) + "\n")
+        if args.json:
+            print(json.dumps(current, indent=2))
+        if not args.compare:
+            return 0
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+    rows, regressions = compare(baseline, current, threshold=args.threshold)
+    _print_comparison(rows)
+    for name in regressions:
+        print(f"FAIL {name}: slower than baseline by > {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+
+# `python -X importtime`: "import time:  self [us] | cumulative | imported package"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[dict[str, Any]]:
+    """
+    One row per imported module with its self and cumulative time in ms.
+    """
+
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORT_LINE.match(line)
+        if m is None:
+            continue
+        self_us, cumulative_us, _indent, module = m.groups()
+        rows.append(
+            {
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return rows
+
+
+def _app_created(output: str) -> dict[str, Any] | None:
+    # The JSON "app created" line from `create_app()` (LOG_JSON=true).
+    for line in output.splitlines():
+        if '"app created"' not in line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        return {
+            "duration_ms": record.get("duration_ms"),
+            "timings": record.get("timings") or {},
+        }
+    return None
+
+
+def profile_once(python: str) -> dict[str, Any]:
+    """
+    Import `app.main` (which builds the app) in a fresh interpreter.
+    """
+
+    env = {
+        **os.environ,
+        "APP_ENV": os.environ.get("APP_ENV", "test"),
+        "LOG_JSON": "true",
+        "LOG_ASYNC": "false",
+    }
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import app.main failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    app_main = next((r for r in rows if r["module"] == "app.main"), None)
+    packages: dict[str, float] = defaultdict(float)
+    for row in rows:
+        packages[row["module"].partition(".")[0]] += row["self_ms"]
+    return {
+        "import_ms": app_main["cumulative_ms"] if app_main else None,
+        "packages": dict(packages),
+        "modules": {r["module"]: r["self_ms"] for r in rows},
+        "app_created": _app_created(proc.stdout + proc.stderr),
+    }
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values), 2) if values else 0.0
+
+
+def summarize(runs: list[dict[str, Any]], *, top: int) -> dict[str, Any]:
+    """
+    Medians across runs: the first run also pays for a cold disk cache.
+    """
+
+    def medians(key: str) -> dict[str, float]:
+        values: dict[str, list[float]] = defaultdict(list)
+        for run in runs:
+            for name, ms in run[key].items():
+                values[name].append(ms)
+        ranked = sorted(
+            ((name, _median(v)) for name, v in values.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return dict(ranked[:top])
+
+    timings: dict[str, list[float]] = defaultdict(list)
+    created = [r["app_created"] for r in runs if r["app_created"]]
+    for entry in created:
+        for name, ms in entry["timings"].items():
+            timings[name].append(ms)
+    return {
+        "python": sys.version.split()[0],
+        "runs": len(runs),
+        "import_ms": _median([r["import_ms"] for r in runs if r["import_ms"]]),
+        "create_app_ms": _median([c["duration_ms"] for c in created]),
+        "create_app_timings": {n: _median(v) for n, v in timings.items()},
+        "packages": medians("packages"),
+        "modules": medians("modules"),
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(
+        f"import app.main: {report['import_ms']:.1f} ms "
+        f"(median of {report['runs']}; create_app {report['create_app_ms']:.1f} ms)",
+        file=sys.stderr,
+    )
+    for title, key in (
+        ("create_app()", "create_app_timings"),
+        ("top-level packages (self time)", "packages"),
+        ("modules (self time)", "modules"),
+    ):
+        print(f"\n{title}", file=sys.stderr)
+        for name, ms in report[key].items():
+            print(f"  {name:<50} {ms:>9.2f} ms", file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Cold-start profile: import time and create_app() steps."
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters.")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table.")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--json", action="store_true", help="Print report JSON.")
+    parser.add_argument("--out", default="", help="Also write the report here.")
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=0.0,
+        help="Fail (exit 1) when the median import exceeds this budget.",
+    )
+    args = parser.parse_args()
+
+    runs = [profile_once(args.python) for _ in range(max(1, args.runs))]
+    report = summarize(runs, top=args.top)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    if args.max_import_ms and report["import_ms"] > args.max_import_ms:
+        print(
+            f"import budget exceeded: {report['import_ms']:.1f} ms > "
+            f"{args.max_import_ms:.1f} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,536 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    import orjson
+except Exception:  # optional: `pip install -e ".[perf]"`
+    orjson = None
+
+REQUEST_MESSAGES = {"request complete", "request failed"}
+OTHER_ROUTE = "(other)"
+QUANTILES = (0.50, 0.90, 0.95, 0.99)
+
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_NUMBER = re.compile(r"/\d+(?=/|$)")
+_loads = orjson.loads if orjson is not None else json.loads
+_SNIFF_BYTES = 64 * 1024
+
+
+def route_template(path: str) -> str:
+    """
+    `/api/v1/users/<uuid>` -> `/api/v1/users/{id}` (for per-route stats).
+    """
+
+    return _NUMBER.sub("/{id}", _UUID.sub("{id}", path))
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram: quantiles within ~1% relative error in memory
+    bounded by the value range (a few hundred buckets), and mergeable across
+    workers. Exact count/sum/max are kept alongside.
+    """
+
+    GAMMA = 1.02
+    _LOG_GAMMA = math.log(GAMMA)
+    MIN_MS = 0.01  # anything faster lands in bucket 0
+
+    def __init__(self) -> None:
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float) -> None:
+        index = 0
+        if value_ms > self.MIN_MS:
+            index = 1 + math.ceil(math.log(value_ms / self.MIN_MS) / self._LOG_GAMMA)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: LatencyHistogram) -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def _value(self, index: int) -> float:
+        if index == 0:
+            return self.MIN_MS
+        # Midpoint of (MIN * g^(i-2), MIN * g^(i-1)].
+        upper = self.MIN_MS * self.GAMMA ** (index - 1)
+        return upper * 2 / (1 + self.GAMMA)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+
+@dataclass
+class RouteStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    def add(self, status: int, duration_ms: float) -> None:
+        self.latency.add(duration_ms)
+        self.statuses[status] += 1
+
+    def merge(self, other: RouteStats) -> None:
+        self.latency.merge(other.latency)
+        self.statuses.update(other.statuses)
+
+    def summary(self) -> dict[str, Any]:
+        n = self.latency.count
+        server = sum(c for s, c in self.statuses.items() if s >= 500)
+        client = sum(c for s, c in self.statuses.items() if 400 <= s < 500)
+        out: dict[str, Any] = {
+            "count": n,
+            "error_rate": round(server / n, 4) if n else 0.0,
+            "client_error_rate": round(client / n, 4) if n else 0.0,
+            "mean": round(self.latency.total / n, 3) if n else 0.0,
+        }
+        for q in QUANTILES:
+            out[f"p{round(q * 100)}"] = round(self.latency.quantile(q), 3)
+        out["max"] = round(self.latency.max, 3)
+        out["status"] = {str(s): c for s, c in sorted(self.statuses.items())}
+        return out
+
+
+class Aggregate:
+    """
+    Everything a pass over the logs produces. Memory is bounded: routes are
+    templated and capped at `max_routes` (the rest fold into `(other)`), and
+    only the `top` slowest requests are kept.
+    """
+
+    def __init__(self, *, max_routes: int, top: int) -> None:
+        self.max_routes = max_routes
+        self.top = top
+        self.lines = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.overall = RouteStats()
+        self.routes: dict[str, RouteStats] = {}
+        # Min-heap of (duration_ms, seq, record summary).
+        self.slowest: list[tuple[float, int, dict[str, Any]]] = []
+        self._seq = 0
+
+    def _route(self, key: str) -> RouteStats:
+        stats = self.routes.get(key)
+        if stats is None:
+            if len(self.routes) >= self.max_routes:
+                key = OTHER_ROUTE
+            stats = self.routes.setdefault(key, RouteStats())
+        return stats
+
+    def add_line(self, line: bytes) -> None:
+        self.lines += 1
+        # Cheap prefilter: request summaries are the only lines with a duration.
+        if b'"duration_ms"' not in line:
+            self.skipped += 1
+            return
+        start = line.find(b"{")
+        # Array exports put one record per line, each but the last followed
+        # by a comma, so they parse line by line too.
+        body = (line[start:] if start > 0 else line).rstrip()
+        if body.endswith(b","):
+            body = body[:-1]
+        try:
+            rec = _loads(body)
+        except ValueError:
+            self.invalid += 1
+            return
+        self._add_record(rec)
+
+    def add_document(self, doc: Any) -> None:
+        """
+        A whole JSON document: the exporter's `{"meta", "records"}` object or
+        a plain array of records (each counts as one line).
+        """
+
+        records = doc.get("records", []) if isinstance(doc, dict) else doc
+        if not isinstance(records, list):
+            self.invalid += 1
+            return
+        for rec in records:
+            self.lines += 1
+            self._add_record(rec)
+
+    def _add_record(self, rec: Any) -> None:
+        if not isinstance(rec, dict) or rec.get("message") not in REQUEST_MESSAGES:
+            self.skipped += 1
+            return
+        try:
+            method = str(rec["method"])
+            path = str(rec["path"])
+            status = int(rec["status_code"])
+            duration = float(rec["duration_ms"])
+        except (KeyError, TypeError, ValueError):
+            self.invalid += 1
+            return
+
+        route = f"{method} {route_template(path)}"
+        self.overall.add(status, duration)
+        self._route(route).add(status, duration)
+        self._offer_slow(
+            duration,
+            {
+                "duration_ms": duration,
+                "request_id": rec.get("request_id"),
+                "method": method,
+                "path": path,
+                "status_code": status,
+                "timestamp": rec.get("timestamp"),
+            },
+        )
+
+    def _offer_slow(self, duration: float, item: dict[str, Any]) -> None:
+        if self.top <= 0:
+            return
+        self._seq += 1
+        entry = (duration, self._seq, item)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def merge(self, other: Aggregate) -> None:
+        self.lines += other.lines
+        self.skipped += other.skipped
+        self.invalid += other.invalid
+        self.overall.merge(other.overall)
+        for key, stats in other.routes.items():
+            self._route(key).merge(stats)
+        for duration, _, item in other.slowest:
+            self._offer_slow(duration, item)
+
+    def report(self, *, sort: str, limit: int) -> dict[str, Any]:
+        routes = [{"route": key, **s.summary()} for key, s in self.routes.items()]
+        sort_key = {
+            "count": lambda r: r["count"],
+            "p99": lambda r: r["p99"],
+            "errors": lambda r: (r["error_rate"], r["count"]),
+            "total": lambda r: r["mean"] * r["count"],
+        }[sort]
+        routes.sort(key=sort_key, reverse=True)
+        if limit > 0:
+            routes = routes[:limit]
+        return {
+            "lines": self.lines,
+            "requests": self.overall.latency.count,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+            "overall": self.overall.summary(),
+            "routes": routes,
+            "slowest": [
+                item for _, _, item in sorted(self.slowest, key=lambda e: -e[0])
+            ],
+        }
+
+
+# --- Input ---
+
+
+def _open_binary(path: str) -> IO[bytes]:
+    if path == "-":
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _sniff(f: IO[bytes]) -> tuple[list[bytes], bool]:
+    """
+    Read the first lines of `f` and tell whether it holds one multi-line JSON
+    document (e.g. a pretty-printed array) rather than one record per line.
+    Returns the lines read, so streams can be replayed without seeking.
+    """
+
+    head: list[bytes] = []
+    size = 0
+    while size < _SNIFF_BYTES:
+        line = f.readline()
+        if not line:
+            break
+        head.append(line)
+        size += len(line)
+    first = next((line.strip() for line in head if line.strip()), b"")
+    if not first.startswith((b"{", b"[")) or _parses(first):
+        return head, False  # NDJSON (or non-JSON noise)
+    # The exporter's array layout still has one record per line after the
+    # opening `{"meta": ...` line; anything else is parsed as a document.
+    for line in head[1:]:
+        body = line.strip()
+        if body.startswith(b"{") and _parses(
+            body[:-1] if body.endswith(b",") else body
+        ):
+            return head, False
+    return head, True
+
+
+def _parses(body: bytes) -> bool:
+    try:
+        _loads(body)
+    except ValueError:
+        return False
+    return True
+
+
+def _analyze_stream(f: IO[bytes], *, max_routes: int, top: int) -> Aggregate:
+    head, is_document = _sniff(f)
+    if not is_document:
+        return _analyze_lines(itertools.chain(head, f), max_routes=max_routes, top=top)
+    agg = Aggregate(max_routes=max_routes, top=top)
+    try:
+        doc = _loads(b"".join(head) + f.read())
+    except ValueError:
+        agg.lines += 1
+        agg.invalid += 1
+        return agg
+    agg.add_document(doc)
+    return agg
+
+
+def _byte_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    size = os.path.getsize(path)
+    step = max(1, math.ceil(size / parts))
+    return [(start, min(size, start + step)) for start in range(0, size, step)]
+
+
+def _iter_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """
+    Lines that *start* inside [start, end): a line straddling a boundary
+    belongs to the range it starts in, so every line is read exactly once.
+    """
+
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            # Finish the line in progress (just the newline if `start` is a
+            # line start).
+            start += len(f.readline()) - 1
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line
+
+
+def _analyze_lines(lines: Iterable[bytes], *, max_routes: int, top: int) -> Aggregate:
+    agg = Aggregate(max_routes=max_routes, top=top)
+    add = agg.add_line
+    for line in lines:
+        add(line)
+    return agg
+
+
+def _analyze_range(
+    path: str, start: int, end: int, max_routes: int, top: int
+) -> Aggregate:
+    return _analyze_lines(_iter_range(path, start, end), max_routes=max_routes, top=top)
+
+
+def analyze(
+    paths: list[str], *, jobs: int, max_routes: int, top: int, chunk_bytes: int
+) -> Aggregate:
+    """
+    Plain line-per-record files are split into byte ranges and parsed by
+    `jobs` processes; gzip, stdin and multi-line JSON documents are read in a
+    single pass.
+    """
+
+    total = Aggregate(max_routes=max_routes, top=top)
+    tasks: list[tuple[str, int, int]] = []
+    for path in paths:
+        sequential = path == "-" or path.endswith(".gz") or jobs <= 1
+        if not sequential:
+            with open(path, "rb") as f:
+                sequential = _sniff(f)[1]
+        if sequential:
+            with _open_binary(path) as f:
+                total.merge(_analyze_stream(f, max_routes=max_routes, top=top))
+            continue
+        parts = max(jobs, math.ceil(os.path.getsize(path) / chunk_bytes))
+        tasks += [(path, s, e) for s, e in _byte_ranges(path, parts)]
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_analyze_range, p, s, e, max_routes, top)
+                for p, s, e in tasks
+            ]
+            for future in futures:
+                total.merge(future.result())
+    return total
+
+
+# --- Output ---
+
+
+def render_table(report: dict[str, Any], out: IO[str]) -> None:
+    overall = report["overall"]
+    out.write(
+        f"{report['requests']} requests ({report['lines']} lines, "
+        f"{report['skipped']} skipped, {report['invalid']} invalid)\n"
+        f"overall: p50={overall['p50']}ms p95={overall['p95']}ms "
+        f"p99={overall['p99']}ms max={overall['max']}ms "
+        f"5xx={overall['error_rate']:.2%} 4xx={overall['client_error_rate']:.2%}\n"
+        f"status: {', '.join(f'{s}={c}' for s, c in overall['status'].items())}\n\n"
+    )
+
+    headers = ("route", "count", "5xx%", "4xx%", "p50", "p95", "p99", "max")
+    rows = [
+        (
+            r["route"],
+            str(r["count"]),
+            f"{r['error_rate'] * 100:.2f}",
+            f"{r['client_error_rate'] * 100:.2f}",
+            f"{r['p50']:.1f}",
+            f"{r['p95']:.1f}",
+            f"{r['p99']:.1f}",
+            f"{r['max']:.1f}",
+        )
+        for r in report["routes"]
+    ]
+    widths = [
+        max([len(h)] + [len(row[i]) for row in rows]) for i, h in enumerate(headers)
+    ]
+    fmt = "  ".join(
+        f"{{:<{w}}}" if i == 0 else f"{{:>{w}}}" for i, w in enumerate(widths)
+    )
+    out.write(fmt.format(*headers) + "\n")
+    for row in rows:
+        out.write(fmt.format(*row) + "\n")
+
+    if report["slowest"]:
+        out.write("\nslowest requests (ms):\n")
+        for item in report["slowest"]:
+            out.write(
+                f"  {item['duration_ms']:>10.1f}  {item['status_code']}  "
+                f"{item['method']} {item['path']}  "
+                f"request_id={item['request_id']}  {item['timestamp']}\n"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Per-route latency/error summary from exported request logs "
+            "(NDJSON or array exports, .gz, or - for stdin)."
+        )
+    )
+    parser.add_argument("inputs", nargs="+", help="Log exports to analyze.")
+    parser.add_argument(
+        "--format", choices=("table", "json"), default="table", help="Output format."
+    )
+    parser.add_argument(
+        "--sort",
+        choices=("count", "p99", "errors", "total"),
+        default="total",
+        help="Route order (total = count x mean, i.e. where time goes).",
+    )
+    parser.add_argument("--limit", type=int, default=30, help="Routes shown (0 = all).")
+    parser.add_argument("--top", type=int, default=10, help="Slowest requests kept.")
+    parser.add_argument(
+        "--max-routes",
+        type=int,
+        default=1000,
+        help="Distinct routes tracked before the rest fold into (other).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="Parser processes for plain files (default 0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=64,
+        help="Byte-range size per parallel task (MB).",
+    )
+    parser.add_argument("--out", default="", help="Also write the JSON report here.")
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if path != "-" and not Path(path).is_file():
+            parser.error(f"no such file: {path}")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    agg = analyze(
+        args.inputs,
+        jobs=jobs,
+        max_routes=max(1, args.max_routes),
+        top=args.top,
+        chunk_bytes=max(1, args.chunk_mb) * 1024 * 1024,
+    )
+    report = {
+        "meta": {
+            "sources": args.inputs,
+            "jobs": jobs,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        },
+        **agg.report(sort=args.sort, limit=args.limit),
+    }
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    try:
+        if args.format == "json":
+            print(json.dumps(report, indent=2))
+        else:
+            render_table(report, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`): not an error. Point stdout at
+        # devnull so the interpreter's final flush doesn't raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    print(
+        f"analyzed {report['lines']} lines in {report['meta']['elapsed_s']}s",
+        file=sys.stderr,
+    )
+    if not report["requests"] and report["invalid"]:
+        print(
+            f"error: no request records parsed ({report['invalid']} invalid lines); "
+            "is the input NDJSON or a JSON log export?",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
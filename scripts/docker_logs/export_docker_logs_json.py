@@ -1,36 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
 import subprocess
-from datetime import datetime
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
 
 
 def _default_dropped_path(out_path: str) -> str:
+    if out_path.endswith(".gz"):
+        out_path = out_path[:-3]
     if out_path.endswith(".json"):
         return out_path[:-5] + ".dropped.txt"
     if out_path.endswith(".ndjson"):
-        return out_path[:-6] + ".dropped.txt"
+        return out_path[:-7] + ".dropped.txt"
     return out_path + ".dropped.txt"
 
 
-def _run(cmd: list[str]) -> str:
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(
-            "command failed:\n"
-            f"  cmd: {' '.join(cmd)}\n"
-            f"  exit: {proc.returncode}\n"
-            f"  stderr: {proc.stderr.strip()}"
-        )
-    return proc.stdout
-
-
 def _extract_json_payload(line: str) -> str | None:
     """
     Docker compose logs often prefixes like:
@@ -42,7 +34,7 @@ def _extract_json_payload(line: str) -> str | None:
     if not s:
         return None
 
-    if "|" in s:
+    if "|" in s and not s.startswith("{"):
         # Keep everything after the first pipe.
         s = s.split("|", 1)[1].strip()
 
@@ -52,6 +44,194 @@ def _extract_json_payload(line: str) -> str | None:
     return s
 
 
+def _open_text(path: Path, *, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+class RecordWriter:
+    """
+    Incremental writer for one output file; memory stays flat however many
+    records pass through.
+
+    - ndjson: `{"meta": ...}`, one record per line, then `{"summary": ...}`.
+    - array: `{"meta": ..., "records": [...], "summary": ...}`, written as a
+      stream (records are never collected into a list).
+    """
+
+    def __init__(
+        self, path: Path, *, fmt: str, meta: dict[str, Any], compress: bool
+    ) -> None:
+        self.path = path
+        self.fmt = fmt
+        self.records = 0
+        self.dropped = 0
+        self.size = 0
+        self.opened_at = time.monotonic()
+        self._f = _open_text(path, compress=compress)
+        if fmt == "array":
+            self._f.write('{"meta": ' + json.dumps(meta, ensure_ascii=False))
+            self._f.write(',\n"records": [')
+        else:
+            self._f.write(json.dumps({"meta": meta}, ensure_ascii=False) + "\n")
+
+    def write(self, payload: str) -> None:
+        # `payload` is a validated JSON object; written as-is (no re-encoding).
+        if self.fmt == "array":
+            chunk = ("\n  " if self.records == 0 else ",\n  ") + payload
+        else:
+            chunk = payload + "\n"
+        self._f.write(chunk)
+        self.size += len(chunk)  # uncompressed characters; drives rotation
+        self.records += 1
+
+    def close(self) -> None:
+        summary = {
+            "parsed": self.records,
+            "dropped": self.dropped,
+            "closed_at": _utcnow(),
+        }
+        if self.fmt == "array":
+            self._f.write(("\n" if self.records else "") + "],\n")
+            self._f.write('"summary": ' + json.dumps(summary) + "}\n")
+        else:
+            self._f.write(json.dumps({"summary": summary}) + "\n")
+        self._f.close()
+
+
+class RotatingOutput:
+    """
+    Opens a new output file when the current one exceeds `rotate_bytes`
+    (uncompressed) or is older than `rotate_seconds`. Rotation happens on
+    writes: an idle stream leaves the current file open until the next record.
+    Without rotation there is exactly one file, at `--out`.
+    """
+
+    def __init__(
+        self,
+        out: str,
+        *,
+        fmt: str,
+        meta: dict[str, Any],
+        compress: bool,
+        rotate_bytes: int,
+        rotate_seconds: float,
+    ) -> None:
+        self._out = out
+        self._fmt = fmt
+        self._meta = meta
+        self._compress = compress
+        self._rotate_bytes = max(0, rotate_bytes)
+        self._rotate_seconds = max(0.0, rotate_seconds)
+        self._part = 0
+        self.paths: list[Path] = []
+        self.records = 0
+        self.dropped = 0
+        self.current = self._open()
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self._rotate_bytes or self._rotate_seconds)
+
+    def _path(self) -> Path:
+        path = Path(self._out)
+        if self.rotating:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            suffix = "".join(s for s in path.suffixes if s != ".gz")
+            stem = path.name[: len(path.name) - len("".join(path.suffixes))]
+            path = path.with_name(f"{stem}.{stamp}.{self._part:04d}{suffix}")
+        if self._compress and path.suffix != ".gz":
+            path = path.with_name(path.name + ".gz")
+        return path
+
+    def _open(self) -> RecordWriter:
+        path = self._path()
+        self._part += 1
+        self.paths.append(path)
+        return RecordWriter(
+            path,
+            fmt=self._fmt,
+            meta={**self._meta, "part": self._part},
+            compress=self._compress,
+        )
+
+    def _rotate(self) -> None:
+        self.current.close()
+        self.current = self._open()
+
+    def write(self, payload: str) -> None:
+        # Age is checked before writing, so a record that arrives after a quiet
+        # spell starts a new file instead of landing in the stale one.
+        w = self.current
+        if self._rotate_seconds:
+            now = time.monotonic()
+            if now - w.opened_at >= self._rotate_seconds:
+                if w.records:
+                    self._rotate()
+                else:
+                    w.opened_at = now  # nothing written yet: restart the window
+        self.current.write(payload)
+        self.records += 1
+        if self._rotate_bytes and self.current.size >= self._rotate_bytes:
+            self._rotate()
+
+    def record_dropped(self) -> None:
+        self.current.dropped += 1
+        self.dropped += 1
+
+    def close(self) -> None:
+        self.current.close()
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class DroppedLines:
+    """
+    Non-JSON lines, written as they come; the file is only created if needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._f: IO[str] | None = None
+
+    def write(self, line: str) -> None:
+        if self._f is None:
+            self._f = open(self.path, "w", encoding="utf-8")
+        self._f.write(line.rstrip("\n") + "\n")
+
+    @property
+    def used(self) -> bool:
+        return self._f is not None
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+
+
+def export_lines(
+    lines: Iterable[str], output: RotatingOutput, dropped: DroppedLines
+) -> None:
+    """
+    Route every line to the output (valid JSON objects) or the dropped file.
+    """
+
+    for line in lines:
+        payload = _extract_json_payload(line)
+        if payload is not None:
+            try:
+                json.loads(payload)
+            except json.JSONDecodeError:
+                payload = None
+        if payload is None:
+            output.record_dropped()
+            dropped.write(line)
+            continue
+        output.write(payload)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description=(
@@ -64,7 +244,9 @@ def main() -> int:
         help='Compose command to use, e.g. "docker compose" or "docker-compose".',
     )
     parser.add_argument("--service", default="app", help="Service name (default: app).")
-    parser.add_argument("--tail", type=int, default=200, help="How many lines to tail.")
+    parser.add_argument(
+        "--tail", default="200", help='How many lines to tail ("all" for everything).'
+    )
     parser.add_argument(
         "--out",
         default="app-logs.json",
@@ -86,72 +268,104 @@ def main() -> int:
             "dropped lines."
         ),
     )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep streaming new lines (Ctrl-C to stop; files are closed cleanly).",
+    )
+    parser.add_argument(
+        "--rotate-bytes",
+        type=int,
+        default=0,
+        help="Start a new output file after about this many uncompressed bytes.",
+    )
+    parser.add_argument(
+        "--rotate-seconds",
+        type=float,
+        default=0.0,
+        help="Start a new output file after this many seconds (checked on writes).",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true", help="Gzip output files (adds .gz)."
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read log lines from stdin instead of running the compose command.",
+    )
 
     args = parser.parse_args()
 
-    compose_parts = args.compose_cmd.split()
-    cmd = compose_parts + [
-        "logs",
-        "--tail",
-        str(args.tail),
-        "--no-log-prefix",
-        args.service,
-    ]
-
-    raw = _run(cmd)
-    records: list[dict] = []
-    dropped = 0
-    dropped_lines: list[str] = []
-
-    for line in raw.splitlines():
-        payload = _extract_json_payload(line)
-        if payload is None:
-            dropped += 1
-            dropped_lines.append(line)
-            continue
-        try:
-            records.append(json.loads(payload))
-        except json.JSONDecodeError:
-            dropped += 1
-            dropped_lines.append(line)
-
     meta = {
-        "exported_at": datetime.utcnow().isoformat() + "Z",
+        "exported_at": _utcnow(),
         "service": args.service,
         "tail": args.tail,
         "format": args.format,
-        "parsed": len(records),
-        "dropped": dropped,
+        "follow": args.follow,
         "compose_cmd": args.compose_cmd,
     }
+    output = RotatingOutput(
+        args.out,
+        fmt=args.format,
+        meta=meta,
+        compress=args.gzip,
+        rotate_bytes=args.rotate_bytes,
+        rotate_seconds=args.rotate_seconds,
+    )
 
-    if args.format == "array":
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(
-                {"meta": meta, "records": records},
-                f,
-                ensure_ascii=False,
-                indent=2,
+    cmd = args.compose_cmd.split() + ["logs", "--tail", str(args.tail)]
+    if args.follow:
+        cmd.append("--follow")
+    cmd += ["--no-log-prefix", args.service]
+
+    dropped = DroppedLines(args.dropped_out.strip() or _default_dropped_path(args.out))
+    proc: subprocess.Popen[str] | None = None
+    # stderr goes to a temp file: an unread pipe could fill up and stall.
+    stderr = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+    interrupted = False
+    try:
+        if args.stdin:
+            lines: Iterable[str] = sys.stdin
+        else:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
             )
-            f.write("\n")
-    else:
-        # NDJSON: first line is meta, then each record as a JSON line.
-        with open(args.out, "w", encoding="utf-8") as f:
-            f.write(json.dumps({"meta": meta}, ensure_ascii=False) + "\n")
-            for rec in records:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-
-    dropped_out = args.dropped_out.strip()
-    if dropped_lines:
-        if not dropped_out:
-            dropped_out = _default_dropped_path(args.out)
-        with open(dropped_out, "w", encoding="utf-8") as f:
-            for line in dropped_lines:
-                f.write(line.rstrip("\n") + "\n")
-
-    msg = f"Wrote {len(records)} JSON log records to {args.out} (dropped {dropped})"
-    if dropped_lines:
-        msg += f"; dropped lines saved to {dropped_out}"
+            assert proc.stdout is not None
+            lines = proc.stdout
+        export_lines(lines, output, dropped)
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        output.close()
+        dropped.close()
+        if proc is not None:
+            if proc.poll() is None:
+                proc.terminate()
+            proc.wait()
+        stderr.seek(0)
+        err = stderr.read().strip()
+        stderr.close()
+
+    if proc is not None and proc.returncode != 0 and not interrupted:
+        raise RuntimeError(
+            "command failed:\n"
+            f"  cmd: {' '.join(cmd)}\n"
+            f"  exit: {proc.returncode}\n"
+            f"  stderr: {err}"
+        )
+
+    files = ", ".join(str(p) for p in output.paths)
+    msg = (
+        f"Wrote {output.records} JSON log records to {files} (dropped {output.dropped})"
+    )
+    if dropped.used:
+        msg += f"; dropped lines saved to {dropped.path}"
     print(msg)
     return 0
 
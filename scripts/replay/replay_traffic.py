@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import platform
+import re
+import sys
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+PASSWORD = "replay-pass-123"
+REQUEST_MESSAGES = {"request complete", "request failed"}
+# Without bodies in the logs, only these writes can be replayed (synthesized).
+SYNTHESIZED_WRITES = {
+    ("POST", "/api/v1/users"),
+    ("POST", "/api/v1/auth/login"),
+    ("POST", "/api/v1/users:batchGet"),
+}
+
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_NUMBER = re.compile(r"/\d+(?=/|$)")
+
+
+def route_template(path: str) -> str:
+    """
+    `/api/v1/users/<uuid>` -> `/api/v1/users/{id}` (for per-route stats).
+    """
+
+    return _NUMBER.sub("/{id}", _UUID.sub("{id}", path))
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def latency_stats(values: Iterable[float]) -> dict[str, float]:
+    lat = sorted(values)
+    n = len(lat)
+    return {
+        "count": n,
+        "mean": round(sum(lat) / n, 3) if n else 0.0,
+        "p50": round(percentile(lat, 0.50), 3),
+        "p90": round(percentile(lat, 0.90), 3),
+        "p95": round(percentile(lat, 0.95), 3),
+        "p99": round(percentile(lat, 0.99), 3),
+        "max": round(lat[-1], 3) if lat else 0.0,
+    }
+
+
+# --- build: request logs -> workload ---
+
+
+def iter_log_records(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Records from exported logs: NDJSON (meta/summary lines skipped), the
+    exporter's `{"meta", "records"}` document, or a JSON array; `.gz` too.
+    """
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        first = f.readline().strip()
+        f.seek(0)
+        try:
+            json.loads(first)
+        except json.JSONDecodeError:
+            if first.startswith(("{", "[")):  # multi-line document
+                doc = json.load(f)
+                records = doc.get("records", []) if isinstance(doc, dict) else doc
+                yield from (r for r in records if isinstance(r, dict))
+                return
+        for line in f:
+            line = line.strip()
+            if not line.startswith(("{", "[")):
+                continue  # non-JSON noise (e.g. docker prefixes)
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for r in rec if isinstance(rec, list) else [rec]:
+                if isinstance(r, dict) and not ({"meta", "summary"} & r.keys()):
+                    yield r
+
+
+def _start_time(rec: dict[str, Any]) -> float | None:
+    try:
+        ended = datetime.fromisoformat(str(rec["timestamp"]).replace("Z", "+00:00"))
+    except (KeyError, ValueError):
+        return None
+    # Logged when the response completed; arrival = end - duration.
+    return ended.timestamp() - float(rec.get("duration_ms") or 0.0) / 1000.0
+
+
+def build_workload(
+    paths: list[Path], *, include_prefix: str, exclude: list[str]
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    items: list[dict[str, Any]] = []
+    skipped: Counter[str] = Counter()
+    for path in paths:
+        for rec in iter_log_records(path):
+            if rec.get("message") not in REQUEST_MESSAGES:
+                continue
+            method = str(rec.get("method") or "").upper()
+            url_path = str(rec.get("path") or "")
+            started = _start_time(rec)
+            if not method or not url_path or started is None:
+                skipped["incomplete"] += 1
+                continue
+            if not url_path.startswith(include_prefix) or any(
+                url_path.startswith(p) for p in exclude
+            ):
+                skipped["filtered"] += 1
+                continue
+            template = route_template(url_path)
+            if (
+                method not in {"GET", "HEAD"}
+                and (method, template) not in SYNTHESIZED_WRITES
+            ):
+                skipped["unreplayable_write"] += 1
+                continue
+            items.append(
+                {
+                    "start": started,
+                    "method": method,
+                    "path": url_path,
+                    "status": rec.get("status_code"),
+                    "duration_ms": rec.get("duration_ms"),
+                }
+            )
+
+    items.sort(key=lambda i: i["start"])
+    origin = items[0]["start"] if items else 0.0
+    for item in items:
+        item["t"] = round(item.pop("start") - origin, 6)
+    meta = {
+        "type": "workload",
+        "sources": [str(p) for p in paths],
+        "requests": len(items),
+        "duration_s": items[-1]["t"] if items else 0.0,
+        "skipped": dict(skipped),
+    }
+    return meta, items
+
+
+def write_workload(path: Path, meta: dict[str, Any], items: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"meta": meta}) + "\n")
+        for item in items:
+            f.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+
+def read_workload(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    meta: dict[str, Any] = {}
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if "meta" in rec:
+                meta = rec["meta"]
+            else:
+                items.append(rec)
+    return meta, items
+
+
+# --- replay ---
+
+
+@dataclass
+class Identity:
+    email: str
+    password: str
+    user_id: str
+    token: str
+
+
+async def _identity(client: httpx.AsyncClient, args: argparse.Namespace) -> Identity:
+    email, password = args.email, args.password
+    if not email:
+        email, password = f"replay-{uuid.uuid4().hex[:12]}@example.com", PASSWORD
+        res = await client.post(
+            "/api/v1/users", json={"email": email, "password": password}
+        )
+        res.raise_for_status()
+    res = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    res.raise_for_status()
+    token = res.json()["access_token"]
+    me = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    me.raise_for_status()
+    return Identity(email, password, me.json()["id"], token)
+
+
+def _request_kwargs(
+    item: dict[str, Any], ident: Identity, *, rewrite_ids: bool
+) -> dict[str, Any]:
+    method, path = item["method"], item["path"]
+    template = route_template(path)
+    if rewrite_ids:
+        # Recorded ids don't exist on the target; point them at our user.
+        path = _UUID.sub(ident.user_id, path)
+    kwargs: dict[str, Any] = {
+        "method": method,
+        "url": path,
+        "headers": {"Authorization": f"Bearer {ident.token}"},
+    }
+    if (method, template) == ("POST", "/api/v1/users"):
+        email = f"replay-{uuid.uuid4().hex}@example.com"
+        kwargs["json"] = {"email": email, "password": PASSWORD}
+    elif (method, template) == ("POST", "/api/v1/auth/login"):
+        kwargs["data"] = {"username": ident.email, "password": ident.password}
+    elif (method, template) == ("POST", "/api/v1/users:batchGet"):
+        kwargs["json"] = {"ids": [ident.user_id]}
+    return kwargs
+
+
+def schedule(items: list[dict[str, Any]], *, speed: float, multiply: int) -> list:
+    """
+    `(offset seconds, item)` pairs: timing divided by `speed`, and `multiply`
+    interleaved copies of the workload for scaled-up arrival rates.
+    """
+
+    if not items:
+        return []
+    duration = items[-1]["t"] or 1.0
+    gap = duration / len(items)
+    out = []
+    for copy in range(max(1, multiply)):
+        shift = gap * copy / max(1, multiply)
+        out.extend(((item["t"] + shift) / speed, item) for item in items)
+    out.sort(key=lambda pair: pair[0])
+    return out
+
+
+async def replay(args: argparse.Namespace) -> dict[str, Any]:
+    meta, items = read_workload(Path(args.workload))
+    plan = schedule(items, speed=args.speed, multiply=args.multiply)
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+
+    latencies: dict[str, list[float]] = {}
+    statuses: Counter[int] = Counter()
+    errors = dropped = 0
+    max_lag_ms = 0.0
+    in_flight: set[asyncio.Task] = set()
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ident = await _identity(client, args)
+        requests = [
+            (
+                offset,
+                route_template(item["path"]),
+                _request_kwargs(item, ident, rewrite_ids=not args.keep_ids),
+            )
+            for offset, item in plan
+        ]
+
+        async def fire(due: float, template: str, kwargs: dict[str, Any]) -> None:
+            nonlocal errors
+            try:
+                res = await client.request(**kwargs)
+            except httpx.HTTPError:
+                errors += 1
+                return
+            # Measured from the intended send time: open-loop latency includes
+            # any queueing the target caused (no coordinated omission).
+            latencies.setdefault(template, []).append((time.monotonic() - due) * 1000)
+            statuses[res.status_code] += 1
+
+        started = time.monotonic()
+        for offset, template, kwargs in requests:
+            due = started + offset
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            max_lag_ms = max(max_lag_ms, (time.monotonic() - due) * 1000)
+            if len(in_flight) >= args.max_in_flight:
+                dropped += 1
+                continue
+            task = asyncio.create_task(fire(due, template, kwargs))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        elapsed = time.monotonic() - started
+
+    recorded: dict[str, list[float]] = {}
+    for item in items:
+        if item.get("duration_ms") is not None:
+            recorded.setdefault(route_template(item["path"]), []).append(
+                float(item["duration_ms"])
+            )
+
+    sent = sum(len(v) for v in latencies.values())
+    return {
+        "meta": {
+            "type": "replay",
+            "target": args.base_url,
+            "workload": args.workload,
+            "workload_requests": meta.get("requests", len(items)),
+            "speed": args.speed,
+            "multiply": args.multiply,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "duration_s": round(elapsed, 3),
+        "rps": round(sent / elapsed, 1) if elapsed else 0.0,
+        "errors": errors,
+        "dropped": dropped,
+        "max_schedule_lag_ms": round(max_lag_ms, 3),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "overall": latency_stats(v for vals in latencies.values() for v in vals),
+        "routes": {t: latency_stats(v) for t, v in sorted(latencies.items())},
+        # Server-side durations from the original logs, for reference.
+        "recorded_routes": {t: latency_stats(v) for t, v in sorted(recorded.items())},
+    }
+
+
+# --- compare ---
+
+
+def compare_runs(
+    baseline: dict[str, Any], current: dict[str, Any], *, threshold: float
+) -> tuple[list[dict[str, Any]], list[str]]:
+    rows, regressions = [], []
+    series = {"(overall)": (baseline["overall"], current["overall"])}
+    for template, cur in current["routes"].items():
+        base = baseline["routes"].get(template)
+        if base is not None:
+            series[template] = (base, cur)
+    for name, (base, cur) in series.items():
+        for q in ("p50", "p95", "p99"):
+            ratio = cur[q] / base[q] if base[q] else 1.0
+            regressed = ratio > 1 + threshold
+            rows.append(
+                {
+                    "series": name,
+                    "quantile": q,
+                    "baseline_ms": base[q],
+                    "current_ms": cur[q],
+                    "change_pct": round((ratio - 1) * 100, 1),
+                    "regression": regressed,
+                }
+            )
+            if regressed:
+                regressions.append(f"{name} {q}")
+    return rows, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Turn request logs into a workload, replay it, compare runs."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Request logs (NDJSON/JSON) -> workload.")
+    p_build.add_argument("logs", nargs="+")
+    p_build.add_argument("--out", required=True)
+    p_build.add_argument("--include-prefix", default="/api/")
+    p_build.add_argument(
+        "--exclude",
+        action="append",
+        default=["/api/v1/health", "/api/v1/admin"],
+        help="Path prefix to drop (repeatable).",
+    )
+
+    p_replay = sub.add_parser("replay", help="Replay a workload (open loop).")
+    p_replay.add_argument("workload")
+    p_replay.add_argument("--base-url", default="http://localhost:8000")
+    p_replay.add_argument("--speed", type=float, default=1.0, help="2 = twice as fast.")
+    p_replay.add_argument(
+        "--multiply", type=int, default=1, help="Interleaved copies (N x traffic)."
+    )
+    p_replay.add_argument("--max-in-flight", type=int, default=512)
+    p_replay.add_argument("--timeout", type=float, default=10.0)
+    p_replay.add_argument(
+        "--email", default="", help="Existing account (default: create one)."
+    )
+    p_replay.add_argument("--password", default="")
+    p_replay.add_argument(
+        "--keep-ids", action="store_true", help="Don't rewrite ids in paths."
+    )
+    p_replay.add_argument("--out", default="", help="Write the JSON report here.")
+
+    p_cmp = sub.add_parser("compare", help="Compare two replay reports.")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.20)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        meta, items = build_workload(
+            [Path(p) for p in args.logs],
+            include_prefix=args.include_prefix,
+            exclude=args.exclude,
+        )
+        write_workload(Path(args.out), meta, items)
+        print(json.dumps(meta), file=sys.stderr)
+        return 0
+
+    if args.command == "replay":
+        if args.speed <= 0:
+            parser.error("--speed must be > 0")
+        report = asyncio.run(replay(args))
+        text = json.dumps(report, indent=2)
+        if args.out:
+            Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print(text)
+        return 1 if report["errors"] else 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    rows, regressions = compare_runs(baseline, current, threshold=args.threshold)
+    for row in rows:
+        print(
+            f"{row['series']:<36} {row['quantile']}  {row['baseline_ms']:>9.2f} -> "
+            f"{row['current_ms']:>9.2f} ms  {row['change_pct']:>+7.1f}%"
+            + ("  REGRESSION" if row["regression"] else "")
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())